@@ -0,0 +1,367 @@
+"""
+OCR Benchmark
+Times OCRProcessor on a synthetic corpus of question papers so throughput
+can be compared between releases
+
+Usage:
+    python benchmarks/ocr_benchmark.py --pages 4 --workers 4 --repeat 3
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+try:
+    import numpy as np
+    from PIL import Image, ImageDraw, ImageFont
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+except ImportError as e:
+    print(f"Import error: {e}")
+    print("Please install: pip install numpy Pillow reportlab")
+
+# Allow running as a script from the project root
+sys.path.append(str(Path(__file__).parent.parent))
+
+from modules.ocr_processor import OCRProcessor
+
+
+VARIANTS = ('typed', 'rasterized', 'noisy', 'rotated')
+MODES = ('sequential', 'parallel', 'cached', 'preprocessed')
+
+TOPICS = [
+    "binary search trees", "process scheduling", "normalization", "TCP congestion control",
+    "dynamic programming", "virtual memory", "deadlock avoidance", "hash tables",
+    "graph traversal", "relational algebra", "pipelining", "cache coherence",
+    "public key cryptography", "finite automata", "sorting algorithms", "B+ tree indexing",
+]
+QUESTION_TEMPLATES = [
+    "Define {topic} and state its key properties.",
+    "Explain {topic} with a suitable example.",
+    "Compare {topic} with {other} in terms of performance.",
+    "Apply {topic} to solve the given problem and justify each step.",
+    "Analyze the time complexity of {topic}.",
+    "Evaluate the advantages and limitations of {topic}.",
+    "Design a solution using {topic} for a real-world application.",
+]
+
+# Raster pages are drawn at this resolution and embedded in the PDF at the same DPI
+SCAN_DPI = 200
+
+
+def build_paper(page_count: int, seed: int = 0) -> List[List[str]]:
+    """
+    Build deterministic question paper text
+    
+    Args:
+        page_count: Number of pages
+        seed: Random seed
+    
+    Returns:
+        List of pages, each a list of lines
+    """
+    rng = random.Random(seed)
+    pages = []
+    question = 1
+    
+    for page_number in range(1, page_count + 1):
+        lines = ["University Examinations - Computer Science", "Course Code: CS301    Max Marks: 100", ""]
+        if page_number == 1:
+            lines += ["Instructions: Answer all questions. Figures to the right indicate marks.", ""]
+        
+        for _ in range(6):
+            topic, other = rng.sample(TOPICS, 2)
+            text = rng.choice(QUESTION_TEMPLATES).format(topic=topic, other=other)
+            lines.append(f"Q{question}. {text} ({rng.choice([2, 5, 10])} marks)")
+            question += 1
+        
+        lines += ["", f"Page {page_number} of {page_count}"]
+        pages.append(lines)
+    
+    return pages
+
+
+def write_typed_pdf(pages: List[List[str]], path: Path):
+    """Write pages as a digitally typed PDF (real text layer)"""
+    pdf = canvas.Canvas(str(path), pagesize=A4)
+    _, height = A4
+    for lines in pages:
+        text = pdf.beginText(60, height - 72)
+        text.setFont("Helvetica", 11)
+        text.setLeading(18)
+        for line in lines:
+            text.textLine(line)
+        pdf.drawText(text)
+        pdf.showPage()
+    pdf.save()
+
+
+def _load_font(size: int):
+    """Load a TrueType font, falling back to Pillow's built-in font"""
+    for name in ("DejaVuSans.ttf", "Arial.ttf", "LiberationSans-Regular.ttf"):
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def render_page(lines: List[str], dpi: int = SCAN_DPI) -> "Image.Image":
+    """Render one page of text as a white A4 grayscale scan"""
+    width, height = int(8.27 * dpi), int(11.69 * dpi)
+    image = Image.new('L', (width, height), color=255)
+    draw = ImageDraw.Draw(image)
+    font = _load_font(int(dpi * 0.15))
+    
+    x, y = int(dpi * 0.8), int(dpi * 1.0)
+    line_height = int(dpi * 0.25)
+    for line in lines:
+        draw.text((x, y), line, fill=0, font=font)
+        y += line_height
+    return image
+
+
+def add_scan_noise(image: "Image.Image", seed: int = 0) -> "Image.Image":
+    """Add sensor noise, speckles and a gray background like a cheap scanner"""
+    rng = np.random.default_rng(seed)
+    pixels = np.asarray(image, dtype=np.float32)
+    pixels = pixels * 0.85 + 20 + rng.normal(0, 18, pixels.shape)
+    
+    speckles = rng.random(pixels.shape) < 0.002
+    pixels[speckles] = 0
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+
+
+def rotate_scan(image: "Image.Image", seed: int = 0) -> "Image.Image":
+    """Rotate by a small random skew, as from a misaligned page on the scanner"""
+    angle = random.Random(seed).uniform(1.5, 3.5) * random.Random(seed + 1).choice([-1, 1])
+    return image.rotate(angle, resample=Image.BICUBIC, expand=False, fillcolor=255)
+
+
+def write_image_pdf(images: List["Image.Image"], path: Path, dpi: int = SCAN_DPI):
+    """Write page images as an image-only PDF (no text layer)"""
+    images[0].save(path, save_all=True, append_images=images[1:], resolution=dpi)
+
+
+def generate_corpus(
+    output_dir: Path,
+    page_count: int = 4,
+    variants: Optional[List[str]] = None,
+    seed: int = 0
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Generate the synthetic benchmark corpus
+    
+    Args:
+        output_dir: Directory the PDFs are written to
+        page_count: Pages per document
+        variants: Variants to generate (default: all)
+        seed: Random seed for content and noise
+    
+    Returns:
+        Dictionary mapping variant name to {'path', 'pages', 'words'}
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    pages = build_paper(page_count, seed=seed)
+    words = sorted({word.lower() for lines in pages for line in lines for word in re.findall(r'[A-Za-z]{3,}', line)})
+    
+    corpus = {}
+    for variant in variants or VARIANTS:
+        path = output_dir / f"paper_{variant}.pdf"
+        if variant == 'typed':
+            write_typed_pdf(pages, path)
+        else:
+            images = [render_page(lines) for lines in pages]
+            if variant == 'noisy':
+                images = [add_scan_noise(image, seed + i) for i, image in enumerate(images)]
+            elif variant == 'rotated':
+                images = [rotate_scan(image, seed + i) for i, image in enumerate(images)]
+            elif variant != 'rasterized':
+                raise ValueError(f"Unknown variant: {variant}")
+            write_image_pdf(images, path)
+        corpus[variant] = {'path': path, 'pages': page_count, 'words': words}
+    
+    return corpus
+
+
+def _mode_config(mode: str, workers: int, cache_dir: str) -> Dict[str, Any]:
+    """OCRProcessor configuration for a benchmark mode"""
+    config = {'workers': 1, 'cache_enabled': False}
+    if mode == 'parallel':
+        config['workers'] = workers
+    elif mode == 'cached':
+        config.update({'workers': workers, 'cache_enabled': True, 'cache_dir': cache_dir})
+    elif mode == 'preprocessed':
+        config.update({'workers': workers, 'preprocess': True})
+    elif mode != 'sequential':
+        raise ValueError(f"Unknown mode: {mode}")
+    return config
+
+
+def _word_recall(text: str, words: List[str]) -> float:
+    """Fraction of ground-truth words found in the OCR output"""
+    if not words:
+        return 0.0
+    found = set(re.findall(r'[a-z]{3,}', text.lower()))
+    return sum(1 for word in words if word in found) / len(words)
+
+
+def run_case(
+    document: Dict[str, Any],
+    mode: str,
+    workers: int,
+    repeat: int,
+    base_config: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Time extract_text for one document in one mode
+    
+    Args:
+        document: Corpus entry from generate_corpus()
+        mode: Benchmark mode
+        workers: Worker count for the parallel modes
+        repeat: Number of timed runs
+        base_config: OCR settings shared by all modes (e.g. from config.yaml)
+    
+    Returns:
+        Result dictionary with per-document and per-page timings
+    """
+    with tempfile.TemporaryDirectory(prefix="ocr_bench_cache_") as cache_dir:
+        config = {**(base_config or {}), **_mode_config(mode, workers, cache_dir)}
+        
+        with OCRProcessor(engine='tesseract', config=config) as processor:
+            if mode == 'cached':
+                # Populate the cache; only the warm runs are timed
+                processor.extract_text(document['path'])
+            
+            timings = []
+            text = ""
+            run_stats: Dict[str, Any] = {}
+            for _ in range(repeat):
+                start = time.perf_counter()
+                text = processor.extract_text(document['path'])
+                timings.append(time.perf_counter() - start)
+                run_stats = dict(processor.last_run_stats)
+    
+    pages = document['pages']
+    median = statistics.median(timings)
+    return {
+        'mode': mode,
+        'workers': config['workers'],
+        'pages': pages,
+        'runs': repeat,
+        'seconds_per_document': {
+            'median': round(median, 4),
+            'min': round(min(timings), 4),
+            'max': round(max(timings), 4),
+            'all': [round(t, 4) for t in timings]
+        },
+        'seconds_per_page': round(median / pages, 4),
+        'pages_per_sec': round(pages / median, 2) if median > 0 else 0.0,
+        'text_chars': len(text),
+        'word_recall': round(_word_recall(text, document['words']), 3),
+        'ocr_stats': {
+            key: value for key, value in run_stats.items()
+            if key in ('pages', 'text_layer_pages', 'cached_pages', 'cache_hit',
+                       'preprocess_seconds', 'preprocess_timings')
+        }
+    }
+
+
+def _environment() -> Dict[str, Any]:
+    """Describe the machine and versions the benchmark ran with"""
+    environment = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+    try:
+        output = subprocess.run(['tesseract', '--version'], capture_output=True, text=True, timeout=10)
+        environment['tesseract'] = (output.stdout or output.stderr).splitlines()[0]
+    except (OSError, IndexError, subprocess.SubprocessError):
+        environment['tesseract'] = None
+    try:
+        output = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=10)
+        environment['git_commit'] = output.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        environment['git_commit'] = None
+    return environment
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark OCR throughput on synthetic question papers")
+    parser.add_argument('--pages', type=int, default=4, help="Pages per synthetic document")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Workers for the parallel, cached and preprocessed modes")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per case")
+    parser.add_argument('--variants', nargs='+', choices=VARIANTS, default=list(VARIANTS))
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--corpus-dir', default=None,
+                        help="Keep the generated PDFs here (default: temporary directory)")
+    parser.add_argument('--config', default=None,
+                        help="Apply OCR settings from this config file (default: built-in defaults)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None,
+                        help="Results file (default: ./data/benchmarks/ocr_<timestamp>.json)")
+    args = parser.parse_args(argv)
+    
+    base_config = {}
+    if args.config:
+        from modules.ocr_processor import load_ocr_config
+        base_config = load_ocr_config(args.config)
+    
+    output = Path(args.output or f"./data/benchmarks/ocr_{datetime.now():%Y%m%d_%H%M%S}.json")
+    results = []
+    
+    with tempfile.TemporaryDirectory(prefix="ocr_bench_corpus_") as temp_dir:
+        corpus_dir = Path(args.corpus_dir or temp_dir)
+        corpus = generate_corpus(corpus_dir, args.pages, args.variants, seed=args.seed)
+        
+        for variant, document in corpus.items():
+            for mode in args.modes:
+                result = run_case(document, mode, args.workers, max(1, args.repeat), base_config)
+                result['variant'] = variant
+                results.append(result)
+                print(f"{variant:<11} {mode:<13} {result['seconds_per_document']['median']:8.3f}s/doc "
+                      f"{result['seconds_per_page']:7.3f}s/page {result['pages_per_sec']:7.2f} pages/sec "
+                      f"recall {result['word_recall']:.2f}")
+    
+    report = {
+        'benchmark': 'ocr',
+        'created_at': datetime.now().isoformat(),
+        'environment': _environment(),
+        'parameters': {
+            'pages': args.pages,
+            'workers': args.workers,
+            'repeat': args.repeat,
+            'seed': args.seed,
+            'scan_dpi': SCAN_DPI,
+            'config': args.config
+        },
+        'results': results
+    }
+    
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,328 @@
+"""
+Batch Ingestor Module
+Headless bulk ingestion of syllabi and past papers into the knowledge base
+
+Usage:
+    python -m modules.batch_ingestor --workers 4
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+# Allow running as a script from the project root
+sys.path.append(str(Path(__file__).parent.parent))
+
+from modules.ocr_processor import OCRProcessor, load_ocr_config
+from modules.priority_calculator import PriorityCalculator
+
+
+SUPPORTED_EXTENSIONS = {'.pdf', '.png', '.jpg', '.jpeg', '.tiff', '.tif', '.bmp'}
+
+
+def _file_sha256(path: Path) -> str:
+    """Hash a file in chunks without loading it fully into memory"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# OCR processor of this worker process, created once by _init_worker()
+_worker_processor: Optional[OCRProcessor] = None
+
+
+def _init_worker(ocr_config: Dict[str, Any]):
+    """
+    Pool initializer: build the worker's OCR processor once
+    
+    Creating a processor opens (and scans) the OCR cache directory, which
+    is too slow to repeat for every file of a large batch. The processor
+    OCRs pages sequentially (workers=1), so it has no page pool to close.
+    """
+    global _worker_processor
+    _worker_processor = OCRProcessor(engine=ocr_config.get('engine', 'tesseract'), config=ocr_config)
+
+
+def _process_file(path: str, kind: str) -> Dict[str, Any]:
+    """
+    OCR, clean and analyze a single file inside a worker process
+    
+    Args:
+        path: File path
+        kind: 'syllabus' or 'past_paper'
+    
+    Returns:
+        Result dictionary with cleaned text, topics and timing information
+    """
+    start = time.perf_counter()
+    file_path = Path(path)
+    
+    raw_text = _worker_processor.extract_text(file_path)
+    cleaned_text = _worker_processor.preprocess_text(raw_text)
+    run_stats = dict(_worker_processor.last_run_stats)
+    
+    topics = PriorityCalculator().calculate_priorities(cleaned_text) if cleaned_text else []
+    
+    return {
+        'path': path,
+        'kind': kind,
+        'text': cleaned_text,
+        'topics': topics,
+        'pages': (run_stats.get('pages', 0) + run_stats.get('cached_pages', 0)
+                  + run_stats.get('text_layer_pages', 0)),
+        # A whole-document cache hit reports no page counts
+        'cache_hit': bool(run_stats.get('cache_hit')),
+        'bytes': file_path.stat().st_size,
+        'seconds': time.perf_counter() - start
+    }
+
+
+class BatchIngestor:
+    """
+    Ingest directories of syllabi and past papers in parallel
+    
+    Files are processed by a pool of worker processes (OCR, text cleaning
+    and priority calculation) while the parent process writes results to
+    ChromaDB. Progress is recorded per file hash so interrupted runs resume
+    where they stopped.
+    """
+    
+    def __init__(
+        self,
+        workers: int = 4,
+        progress_file: str = "./data/ingest_progress.json",
+        ocr_config: Optional[Dict[str, Any]] = None,
+        db_handler=None
+    ):
+        """
+        Initialize Batch Ingestor
+        
+        Args:
+            workers: Number of files processed in parallel
+            progress_file: JSON file recording already ingested files
+            ocr_config: OCRProcessor configuration for the workers
+            db_handler: ChromaDBHandler to store results in (None to skip storage)
+        """
+        self.workers = max(1, workers)
+        self.progress_file = Path(progress_file)
+        # Parallelism is across files, so each worker OCRs its pages sequentially
+        self.ocr_config = {**(ocr_config or {}), 'workers': 1}
+        self.db_handler = db_handler
+        self.progress = self._load_progress()
+    
+    def _load_progress(self) -> Dict[str, Any]:
+        """Load the progress file, if any"""
+        if self.progress_file.exists():
+            with open(self.progress_file, 'r') as f:
+                return json.load(f)
+        return {}
+    
+    def _save_progress(self):
+        """Atomically write the progress file"""
+        self.progress_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.progress_file.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.progress, f, indent=2)
+        os.replace(tmp_path, self.progress_file)
+    
+    def discover(self, directory: str, kind: str) -> List[Tuple[Path, str, str]]:
+        """
+        Find supported files under a directory that have not been ingested yet
+        
+        Args:
+            directory: Directory to walk recursively
+            kind: 'syllabus' or 'past_paper'
+        
+        Returns:
+            List of (path, kind, file hash) tuples
+        """
+        root = Path(directory)
+        if not root.exists():
+            return []
+        
+        pending = []
+        for path in sorted(root.rglob('*')):
+            if not path.is_file() or path.suffix.lower() not in SUPPORTED_EXTENSIONS:
+                continue
+            file_hash = _file_sha256(path)
+            if file_hash in self.progress:
+                continue
+            pending.append((path, kind, file_hash))
+        return pending
+    
+    def ingest(self, files: List[Tuple[Path, str, str]]) -> Dict[str, Any]:
+        """
+        Process and store a list of files
+        
+        Args:
+            files: List of (path, kind, file hash) tuples from discover()
+        
+        Returns:
+            Throughput summary
+        """
+        start = time.perf_counter()
+        summary = {
+            'files': 0,
+            'failed': 0,
+            'pages': 0,
+            'megabytes': 0.0,
+            'topics': 0,
+            'errors': []
+        }
+        
+        with ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker, initargs=(self.ocr_config,)
+        ) as executor:
+            futures = {
+                executor.submit(_process_file, str(path), kind): (path, kind, file_hash)
+                for path, kind, file_hash in files
+            }
+            
+            for done, future in enumerate(as_completed(futures), start=1):
+                path, kind, file_hash = futures[future]
+                try:
+                    result = future.result()
+                    self._check_result(result)
+                    doc_id = self._store(result, file_hash)
+                    if self.db_handler is not None and doc_id is None:
+                        raise RuntimeError("document was not stored")
+                except Exception as e:
+                    summary['failed'] += 1
+                    summary['errors'].append(f"{path}: {e}")
+                    print(f"[{done}/{len(files)}] FAILED {path}: {e}")
+                    continue
+                
+                # Dry runs (no storage) must not mark files as ingested
+                if self.db_handler is not None:
+                    self.progress[file_hash] = {
+                        'path': str(path),
+                        'kind': kind,
+                        'doc_id': doc_id,
+                        'pages': result['pages'],
+                        'topics': len(result['topics']),
+                        'ingested_at': datetime.now().isoformat()
+                    }
+                    self._save_progress()
+                
+                summary['files'] += 1
+                summary['pages'] += result['pages']
+                summary['megabytes'] += result['bytes'] / (1024 * 1024)
+                summary['topics'] += len(result['topics'])
+                print(f"[{done}/{len(files)}] {path} ({result['pages']} pages, "
+                      f"{len(result['topics'])} topics, {result['seconds']:.1f}s)")
+        
+        elapsed = time.perf_counter() - start
+        summary['seconds'] = round(elapsed, 2)
+        summary['megabytes'] = round(summary['megabytes'], 2)
+        summary['files_per_min'] = round(summary['files'] / elapsed * 60, 2) if elapsed > 0 else 0.0
+        summary['pages_per_sec'] = round(summary['pages'] / elapsed, 2) if elapsed > 0 else 0.0
+        return summary
+    
+    @staticmethod
+    def _check_result(result: Dict[str, Any]):
+        """
+        Reject files the OCR step produced nothing for
+        
+        The OCR processor logs extraction errors and returns empty text
+        rather than raising, so these must not be recorded as ingested.
+        """
+        if not result['text'].strip():
+            raise ValueError("no text extracted")
+        if not result['pages'] and not result['cache_hit']:
+            raise ValueError("no pages processed")
+    
+    def _store(self, result: Dict[str, Any], file_hash: str) -> Optional[str]:
+        """Store a processed file in ChromaDB; returns the document ID"""
+        if self.db_handler is None or not result['text']:
+            return None
+        
+        top_topics = [topic['name'] for topic in result['topics'][:10]]
+        metadata = {
+            'filename': Path(result['path']).name,
+            'source_path': result['path'],
+            'file_hash': file_hash,
+            'upload_date': datetime.now().isoformat(),
+            'file_size': result['bytes'],
+            'pages': result['pages'],
+            'top_topics': ", ".join(top_topics)
+        }
+        
+        if result['kind'] == 'syllabus':
+            return self.db_handler.store_syllabus(result['text'], metadata=metadata)
+        return self.db_handler.store_past_paper(result['text'], metadata=metadata)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(
+        description="Bulk-ingest syllabi and past papers into the knowledge base"
+    )
+    parser.add_argument('--syllabi-dir', default=os.getenv('SYLLABI_PATH', './data/syllabi'))
+    parser.add_argument('--past-papers-dir', default=os.getenv('PAST_PAPERS_PATH', './data/past_papers'))
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Number of files processed in parallel")
+    parser.add_argument('--progress-file', default='./data/ingest_progress.json',
+                        help="Progress file used to resume interrupted runs")
+    parser.add_argument('--config', default='config.yaml', help="Configuration file")
+    parser.add_argument('--engine', default=None, help="OCR engine (defaults to config.yaml)")
+    parser.add_argument('--no-store', action='store_true',
+                        help="Process files without writing to ChromaDB")
+    parser.add_argument('--restart', action='store_true',
+                        help="Ignore existing progress and ingest everything again")
+    args = parser.parse_args(argv)
+    
+    from dotenv import load_dotenv
+    load_dotenv()
+    
+    ocr_config = load_ocr_config(args.config)
+    if args.engine:
+        ocr_config['engine'] = args.engine
+    
+    db_handler = None
+    if not args.no_store:
+        from utils.chromadb_handler import ChromaDBHandler
+        db_handler = ChromaDBHandler()
+    
+    ingestor = BatchIngestor(
+        workers=args.workers,
+        progress_file=args.progress_file,
+        ocr_config=ocr_config,
+        db_handler=db_handler
+    )
+    if args.restart:
+        ingestor.progress = {}
+    
+    files = (
+        ingestor.discover(args.syllabi_dir, 'syllabus')
+        + ingestor.discover(args.past_papers_dir, 'past_paper')
+    )
+    skipped = len(ingestor.progress)
+    print(f"Found {len(files)} file(s) to ingest ({skipped} already ingested)")
+    if not files:
+        return 0
+    
+    summary = ingestor.ingest(files)
+    
+    print("\nIngestion summary")
+    print(f"  Files ingested: {summary['files']} ({summary['failed']} failed)")
+    print(f"  Pages:          {summary['pages']}")
+    print(f"  Data:           {summary['megabytes']:.2f} MB")
+    print(f"  Topics found:   {summary['topics']}")
+    print(f"  Elapsed:        {summary['seconds']:.1f}s")
+    print(f"  Throughput:     {summary['files_per_min']:.2f} files/min, "
+          f"{summary['pages_per_sec']:.2f} pages/sec")
+    
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+Document Source Module
+Single in-memory view of an input document shared by the PDF reader,
+the rasterizer and the cache hasher
+"""
+
+import hashlib
+import io
+import mmap
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Union
+
+
+class DocumentSource:
+    """
+    Zero-copy access to an uploaded file or a file on disk
+    
+    Files on disk are memory-mapped. Uploads backed by a BytesIO (such as
+    Streamlit's UploadedFile) are exposed through getbuffer(), which shares
+    the upload's memory instead of copying it. Tools that need a real path
+    (pdftoppm via pdf2image) get one: the original file, or a single
+    temporary copy spooled on first request and removed on close().
+    """
+    
+    def __init__(
+        self,
+        buffer: Union[memoryview, bytes],
+        path: Optional[Path] = None,
+        name: Optional[str] = None,
+        suffix: str = ""
+    ):
+        """
+        Initialize Document Source
+        
+        Args:
+            buffer: Read-only view of the document content
+            path: Backing file on disk, if any
+            name: Display name of the document
+            suffix: File extension used for the spooled temp file
+        """
+        self.buffer = memoryview(buffer)
+        self.name = name or (path.name if path else 'document')
+        self.suffix = suffix
+        self._path = path
+        self._temp_path: Optional[Path] = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._sha256: Optional[str] = None
+    
+    @classmethod
+    def from_path(cls, path: Union[str, Path]) -> "DocumentSource":
+        """Memory-map a file on disk"""
+        path = Path(path)
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return cls(b"", path=path, suffix=path.suffix)
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        source = cls(mapped, path=path, suffix=path.suffix)
+        source._mmap = mapped
+        return source
+    
+    @classmethod
+    def from_upload(cls, file) -> "DocumentSource":
+        """Wrap an uploaded file object, sharing its buffer when possible"""
+        name = getattr(file, 'name', None)
+        suffix = Path(name).suffix if name else ""
+        
+        if hasattr(file, 'getbuffer'):
+            return cls(file.getbuffer(), name=name, suffix=suffix)
+        # Generic file-like object: one read is unavoidable
+        return cls(file.read(), name=name, suffix=suffix)
+    
+    def __len__(self) -> int:
+        return self.buffer.nbytes
+    
+    def sha256(self) -> str:
+        """Content hash, computed once directly over the shared buffer"""
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(self.buffer).hexdigest()
+        return self._sha256
+    
+    def stream(self) -> io.BufferedIOBase:
+        """
+        Seekable read-only stream over the document
+        
+        Reads come from the page cache (files on disk) or the shared buffer;
+        the document is not duplicated in memory.
+        """
+        if self._path is not None:
+            return open(self._path, 'rb')
+        return _MemoryViewReader(self.buffer)
+    
+    @property
+    def path(self) -> Path:
+        """Filesystem path for tools that only accept paths"""
+        if self._path is not None:
+            return self._path
+        
+        if self._temp_path is None:
+            fd, temp_name = tempfile.mkstemp(suffix=self.suffix or ".bin")
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self.buffer)
+            self._temp_path = Path(temp_name)
+        return self._temp_path
+    
+    def close(self):
+        """Release the memory map and remove any spooled temp file"""
+        self.buffer.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._temp_path is not None:
+            try:
+                self._temp_path.unlink()
+            except FileNotFoundError:
+                pass
+            self._temp_path = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class _MemoryViewReader(io.RawIOBase):
+    """Seekable reader over a memoryview that never copies the whole buffer"""
+    
+    def __init__(self, buffer: memoryview):
+        self._buffer = buffer
+        self._position = 0
+    
+    def readable(self) -> bool:
+        return True
+    
+    def seekable(self) -> bool:
+        return True
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self._buffer.nbytes + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        self._position = max(0, position)
+        return self._position
+    
+    def readinto(self, target) -> int:
+        chunk = self._buffer[self._position:self._position + len(target)]
+        size = chunk.nbytes
+        target[:size] = chunk
+        self._position += size
+        return size
+    
+    def read(self, size: int = -1) -> bytes:
+        end = self._buffer.nbytes if size is None or size < 0 else self._position + size
+        data = self._buffer[self._position:end].tobytes()
+        self._position += len(data)
+        return data
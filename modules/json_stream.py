@@ -0,0 +1,204 @@
+"""
+JSON Stream Module
+Incremental parsing of JSON produced token by token by a language model
+"""
+
+import json
+from typing import List, Any, Optional, Tuple
+
+
+class JsonArrayStream:
+    """
+    Incremental parser for a JSON array of objects
+    
+    Text is fed in arbitrary pieces (e.g. streamed model tokens). Each
+    object or nested array element of the first top-level array is returned
+    by feed() as soon as its closing bracket arrives. Anything before the
+    array (prose, a ```json fence) and after it is ignored.
+    """
+    
+    def __init__(self):
+        self.text = ""
+        self.done = False
+        self.errors = 0
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._element_start: Optional[int] = None
+    
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Add text and collect the elements it completes
+        
+        Args:
+            chunk: Next piece of the response
+        
+        Returns:
+            Parsed elements completed by this chunk, in order
+        """
+        self.text += chunk
+        elements = []
+        text = self.text
+        
+        while self._pos < len(text) and not self.done:
+            char = text[self._pos]
+            
+            if self._depth == 0:
+                if char == '[':
+                    self._depth = 1
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in '{[':
+                if self._depth == 1:
+                    self._element_start = self._pos
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 1 and self._element_start is not None:
+                    try:
+                        elements.append(json.loads(text[self._element_start:self._pos + 1]))
+                    except json.JSONDecodeError:
+                        self.errors += 1
+                    self._element_start = None
+                elif self._depth == 0:
+                    self.done = True
+            
+            self._pos += 1
+        
+        return elements
+
+
+CLOSERS = {'{': '}', '[': ']'}
+# Candidate start positions tried before giving up on a response
+MAX_CANDIDATES = 8
+
+
+def _scan(text: str, start: int):
+    """
+    Scan a JSON value starting at an opening bracket
+    
+    Returns:
+        (end, stack, in_string, cuts): end is the index after the balanced
+        value or None if the text ends first; stack holds the brackets still
+        open at the end; cuts lists (index, open brackets) positions where
+        the text can be cut and closed without splitting a value
+    """
+    stack = []
+    cuts = []
+    in_string = False
+    escape = False
+    
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif char == '\\':
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in CLOSERS:
+            stack.append(char)
+            cuts.append((i + 1, list(stack)))
+        elif char in '}]':
+            if not stack or CLOSERS[stack[-1]] != char:
+                return None, None, False, []
+            stack.pop()
+            if not stack:
+                return i + 1, [], False, cuts
+        elif char == ',':
+            cuts.append((i, list(stack)))
+    
+    return None, stack, in_string, cuts
+
+
+def _repair(text: str, start: int, stack: List[str], in_string: bool, cuts) -> Optional[str]:
+    """
+    Close a truncated JSON value
+    
+    The text is first closed as-is (completing an unterminated string).
+    Failing that, it is cut back to the last point between complete values
+    and closed there. For a top-level array only cuts between its own
+    elements are used, so a half-written element is dropped rather than
+    returned with missing fields.
+    """
+    body = text[start:]
+    closing = "".join(CLOSERS[bracket] for bracket in reversed(stack))
+    if text[start] != '[':
+        candidate = body.rstrip().rstrip(',') + ('"' if in_string else '') + closing
+        try:
+            json.loads(candidate)
+            return candidate
+        except json.JSONDecodeError:
+            pass
+    
+    for index, open_brackets in reversed(cuts):
+        if text[start] == '[' and len(open_brackets) != 1:
+            continue
+        candidate = text[start:index].rstrip().rstrip(',') + "".join(
+            CLOSERS[bracket] for bracket in reversed(open_brackets)
+        )
+        try:
+            json.loads(candidate)
+            return candidate
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
+def extract_json(text: str, repair: bool = True) -> Tuple[Optional[str], bool]:
+    """
+    Find the first complete JSON object or array in model output
+    
+    Brackets are balanced (ignoring those inside strings), so nested
+    objects and arrays are returned whole. Prose and code fences around
+    the value are skipped.
+    
+    Args:
+        text: Model response
+        repair: Close a value that was cut off at the end of the text
+    
+    Returns:
+        (json_text, repaired): the JSON text, or None if none was found,
+        and whether it had to be repaired
+    """
+    truncated = None
+    candidates = 0
+    # End of the last balanced but invalid value; values nested in it are
+    # fragments of that value (e.g. one question of a broken array), not answers
+    skip_until = 0
+    for start, char in enumerate(text):
+        if char not in CLOSERS or start < skip_until:
+            continue
+        candidates += 1
+        if candidates > MAX_CANDIDATES:
+            break
+        
+        end, stack, in_string, cuts = _scan(text, start)
+        if end is not None:
+            try:
+                json.loads(text[start:end])
+                return text[start:end], False
+            except json.JSONDecodeError:
+                skip_until = end
+                continue
+        if stack:
+            # The text ends inside this value, so every later candidate is part of it
+            truncated = (start, stack, in_string, cuts)
+            break
+    
+    if repair and truncated is not None:
+        repaired = _repair(text, *truncated)
+        if repaired is not None:
+            return repaired, True
+    return None, False
@@ -3,13 +3,21 @@ LLM Engine Module
 Handles dual LLM architecture for question generation
 """
 
+import asyncio
+import contextlib
+import contextvars
 import os
-from typing import List, Dict, Any, Optional
-from tenacity import retry, stop_after_attempt, wait_exponential
+import re
+import threading
+import time
+import uuid
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Callable, Iterator
 import json
 
 try:
-    from groq import Groq
+    from groq import AsyncGroq, Groq
     from langchain_groq import ChatGroq
     from langchain.prompts import ChatPromptTemplate
     from langchain.schema import HumanMessage, SystemMessage
@@ -17,6 +25,31 @@ except ImportError as e:
     print(f"Import error: {e}")
     print("Please install: pip install groq langchain langchain-groq")
 
+from modules.bloom_classifier import BloomClassifier
+from modules.json_stream import JsonArrayStream, extract_json
+from modules.rate_limiter import get_rate_limiter
+from modules.retry_policy import RetryPolicy, RetryBudget, RetryBudgetExceeded
+from modules.syllabus_index import SyllabusIndex, UNIT_HEADING
+from utils.disk_cache import DiskCache
+
+
+WHITESPACE = re.compile(r'\s+')
+
+# Prompt budget of the parser model and a rough characters-per-token ratio
+# used to size batches and rate-limit reservations without a tokenizer
+PARSER_CONTEXT_TOKENS = 8192
+CHARS_PER_TOKEN = 4
+# Output tokens reserved per scored question ({"id": 12, "score": 7.5},)
+SCORE_OUTPUT_TOKENS = 16
+# Syllabus text per chunk in chunked parsing; small enough that the
+# parser's 1024-token output can hold every unit of the chunk
+PARSE_CHUNK_CHARS = 3000
+# Course header (title, code, objectives) repeated in every chunk's prompt
+PARSE_HEADER_CHARS = 500
+
+# Models bound to the running event loop's HTTP clients by DualLLMEngine._async_models()
+_ASYNC_MODELS: contextvars.ContextVar[Dict[int, Any]] = contextvars.ContextVar('async_models', default={})
+
 
 class DualLLMEngine:
     """
@@ -29,7 +62,23 @@ class DualLLMEngine:
         parser_model: str = "llama-3.1-8b-instant",
         generator_model: str = "llama-3.3-70b-versatile",
         temperature: float = 0.7,
-        max_tokens: int = 2048
+        max_tokens: int = 2048,
+        max_concurrency: int = 4,
+        cache_enabled: bool = True,
+        cache_dir: Optional[str] = None,
+        cache_ttl_hours: Optional[float] = 168,
+        cache_max_size_mb: float = 64,
+        rate_limits: Optional[Dict[str, Dict[str, int]]] = None,
+        session_id: Optional[str] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        allow_placeholders: bool = False,
+        base_url: Optional[str] = None,
+        context_token_budget: int = 600,
+        cascade: bool = False,
+        cascade_levels: Optional[List[str]] = None,
+        cascade_min_quality: float = 6.0,
+        parser_temperature: float = 0.3,
+        parser_max_tokens: int = 1024
     ):
         """
         Initialize Dual LLM Engine
@@ -39,45 +88,536 @@ class DualLLMEngine:
             generator_model: Model for question generation
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
+            max_concurrency: Maximum concurrent requests in the async API
+            cache_enabled: Cache responses on disk, keyed by model settings and prompt
+            cache_dir: Response cache directory (defaults to LLM_CACHE_PATH)
+            cache_ttl_hours: Age after which cached responses expire (None = never)
+            cache_max_size_mb: Size budget of the response cache
+            rate_limits: Per-model {'rpm': ..., 'tpm': ...} overrides for the shared scheduler
+            session_id: Identity used to queue this engine's requests fairly against other sessions
+            retry_policy: Retry/deadline budget applied to each generation job
+            allow_placeholders: Return placeholder questions for levels that fail
+                instead of raising
+            base_url: Groq-compatible API base URL (defaults to GROQ_BASE_URL,
+                e.g. a local utils.mock_groq_server)
+            context_token_budget: Approximate tokens of syllabus context per
+                generation prompt, chosen from the chunks most relevant to its topics
+            cascade: Draft cascade_levels with the parser model and send only
+                rejected drafts to the generator model
+            cascade_levels: Bloom's levels drafted by the parser model
+                (default: remember, understand)
+            cascade_min_quality: Minimum quality score (0-10) for a draft to be kept
+            parser_temperature: Sampling temperature of the parser model
+            parser_max_tokens: Maximum tokens the parser model generates
+        
+        load_llm_config() turns the `llm` section of config.yaml into these arguments.
         """
         self.parser_model = parser_model
         self.generator_model = generator_model
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.max_concurrency = max(1, max_concurrency)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.allow_placeholders = allow_placeholders
+        self.context_token_budget = max(50, context_token_budget)
+        self._syllabus_index: Optional[SyllabusIndex] = None
+        self._syllabus_index_key: Optional[str] = None
+        self.cascade = cascade
+        self.cascade_levels = {level.lower() for level in (cascade_levels or ['remember', 'understand'])}
+        self.cascade_min_quality = cascade_min_quality
+        self.cascade_stats: Dict[str, Dict[str, int]] = {}
+        self.bloom_classifier = BloomClassifier() if cascade else None
+        self.last_generation_stats: Dict[str, Any] = {}
         
         # Initialize Groq client
+        self.base_url = base_url or os.getenv('GROQ_BASE_URL') or None
         api_key = os.getenv('GROQ_API_KEY')
+        if not api_key and self.base_url:
+            # A local stand-in server does not check credentials
+            api_key = "local-mock-key"
         if not api_key:
             raise ValueError("GROQ_API_KEY not found in environment variables")
         
-        self.client = Groq(api_key=api_key)
+        self.client = Groq(api_key=api_key, base_url=self.base_url)
         
-        # Initialize LangChain models
+        # Requests from every engine in the process share one RPM/TPM scheduler
+        self.rate_limiter = get_rate_limiter()
+        for model, limits in (rate_limits or {}).items():
+            self.rate_limiter.configure(model, limits.get('rpm'), limits.get('tpm'))
+        
+        # Initialize LangChain models; close() releases their HTTP clients
+        self._http_clients: List[Any] = []
         self.parser_llm = ChatGroq(
             groq_api_key=api_key,
+            groq_api_base=self.base_url,
             model_name=parser_model,
-            temperature=0.3,  # Lower temperature for parsing
-            max_tokens=1024
+            temperature=parser_temperature,  # Lower temperature for parsing
+            max_tokens=parser_max_tokens,
+            # Retries are owned by the retry policy, not repeated inside the SDK
+            max_retries=0,
+            request_timeout=self.retry_policy.call_timeout_seconds,
+            **self._header_observing_clients(parser_model)
         )
         
         self.generator_llm = ChatGroq(
             groq_api_key=api_key,
+            groq_api_base=self.base_url,
             model_name=generator_model,
             temperature=temperature,
-            max_tokens=max_tokens
+            max_tokens=max_tokens,
+            max_retries=0,
+            request_timeout=self.retry_policy.call_timeout_seconds,
+            **self._header_observing_clients(generator_model)
         )
+        
+        # Persistent prompt/response cache shared by all model calls
+        self.response_cache = None
+        if cache_enabled:
+            try:
+                self.response_cache = DiskCache(
+                    cache_dir or os.getenv('LLM_CACHE_PATH', './data/llm_cache'),
+                    cache_max_size_mb,
+                    ttl_seconds=cache_ttl_hours * 3600 if cache_ttl_hours else None
+                )
+            except OSError as e:
+                print(f"Warning: LLM response cache disabled: {e}")
+        
+        self.session_id = session_id or uuid.uuid4().hex
+        
+        # Per-model counts of parsed, repaired and unparseable responses
+        self.parse_stats: Dict[str, Dict[str, int]] = {}
+        self._parse_stats_lock = threading.Lock()
+        self._parse_state = threading.local()
+    
+    def _header_observing_clients(self, model: str) -> Dict[str, Any]:
+        """
+        HTTP client that passes rate-limit headers of successful responses to the scheduler
+        
+        Groq reports x-ratelimit-remaining-* on every response, so the local
+        budgets tighten before the server starts answering 429 (errors are
+        handled by observe_error()). Async clients belong to an event loop
+        and are made per call by _async_models().
+        
+        Args:
+            model: Model the client is used for
+        
+        Returns:
+            ChatGroq keyword arguments (empty if httpx is unavailable)
+        """
+        try:
+            import httpx
+        except ImportError:
+            return {}
+        
+        client = httpx.Client(event_hooks={'response': [self._header_observer(model)]})
+        self._http_clients.append(client)
+        return {'http_client': client}
+    
+    def close(self):
+        """Close the engine's HTTP clients and their pooled connections"""
+        self.client.close()
+        for client in self._http_clients:
+            client.close()
+        self._http_clients = []
+    
+    def __enter__(self):
+        return self
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-    def parse_syllabus(self, syllabus_text: str) -> Dict[str, Any]:
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _header_observer(self, model: str) -> Callable[[Any], None]:
+        """httpx response hook feeding rate-limit headers of `model` to the scheduler"""
+        rate_limiter = self.rate_limiter
+        
+        def observe(response):
+            if response.status_code < 400:
+                rate_limiter.observe_headers(model, response.headers)
+        
+        return observe
+    
+    @contextlib.asynccontextmanager
+    async def _async_models(self):
+        """
+        Bind the models to async HTTP clients of the running event loop
+        
+        Pooled connections cannot outlive their event loop, so each
+        agenerate_questions()/aparse_syllabus() call (typically its own
+        asyncio.run()) gets fresh clients and closes them on exit; _acall()
+        uses the bound copies.
+        """
+        try:
+            import httpx
+        except ImportError:
+            yield
+            return
+        
+        clients = []
+        models = {}
+        for llm in (self.parser_llm, self.generator_llm):
+            observe = self._header_observer(llm.model_name)
+            
+            async def aobserve(response, observe=observe):
+                observe(response)
+            
+            client = httpx.AsyncClient(event_hooks={'response': [aobserve]})
+            clients.append(client)
+            async_client = AsyncGroq(
+                api_key=llm.groq_api_key.get_secret_value() if llm.groq_api_key else None,
+                base_url=llm.groq_api_base,
+                timeout=llm.request_timeout,
+                max_retries=llm.max_retries,
+                http_client=client
+            ).chat.completions
+            # construct() skips the validator that would build a client of its own
+            models[id(llm)] = type(llm).construct(**{**llm.__dict__, 'async_client': async_client})
+        
+        token = _ASYNC_MODELS.set(models)
+        try:
+            yield
+        finally:
+            _ASYNC_MODELS.reset(token)
+            for client in clients:
+                await client.aclose()
+    
+    def _response_cache_key(self, llm, messages: List[Any]) -> str:
+        """Key a request by model, sampling settings and whitespace-normalized prompt"""
+        prompt = "\n".join(
+            f"{type(message).__name__}: {WHITESPACE.sub(' ', message.content).strip()}"
+            for message in messages
+        )
+        return DiskCache.make_key(
+            'llm', getattr(llm, 'model_name', None), getattr(llm, 'temperature', None),
+            getattr(llm, 'max_tokens', None), prompt
+        )
+    
+    def _cacheable(self, llm, fresh: bool) -> bool:
+        """Fresh samples bypass the cache unless the model is deterministic (temperature 0)"""
+        if self.response_cache is None:
+            return False
+        # ChatGroq sends a requested temperature of 0 as 1e-8
+        return not (fresh and (getattr(llm, 'temperature', 0) or 0) > 1e-6)
+    
+    def _call(self, llm, messages: List[Any], timeout: Optional[float] = None) -> str:
+        """Send one request once the rate limiter admits it"""
+        model = getattr(llm, 'model_name', 'unknown')
+        reserved_tokens = self._estimate_tokens(llm, messages)
+        self.rate_limiter.acquire(model, reserved_tokens, self.session_id)
+        
+        try:
+            if timeout is not None:
+                response = llm.invoke(messages, timeout=timeout)
+            else:
+                response = llm.invoke(messages)
+        except Exception as e:
+            # 429s and rate-limit headers pause the model for every session
+            self.rate_limiter.observe_error(model, e)
+            raise
+        
+        self.rate_limiter.record_usage(model, reserved_tokens, self._used_tokens(response))
+        return response.content
+    
+    async def _acall(self, llm, messages: List[Any]) -> str:
+        """Async variant of _call()"""
+        llm = _ASYNC_MODELS.get().get(id(llm), llm)
+        model = getattr(llm, 'model_name', 'unknown')
+        reserved_tokens = self._estimate_tokens(llm, messages)
+        await self.rate_limiter.aacquire(model, reserved_tokens, self.session_id)
+        
+        try:
+            response = await llm.ainvoke(messages)
+        except Exception as e:
+            self.rate_limiter.observe_error(model, e)
+            raise
+        
+        self.rate_limiter.record_usage(model, reserved_tokens, self._used_tokens(response))
+        return response.content
+    
+    def _stream(self, llm, messages: List[Any], timeout: Optional[float] = None) -> Iterator[str]:
+        """Variant of _call() that yields the response text as it is generated"""
+        model = getattr(llm, 'model_name', 'unknown')
+        reserved_tokens = self._estimate_tokens(llm, messages)
+        self.rate_limiter.acquire(model, reserved_tokens, self.session_id)
+        
+        used_tokens = None
+        try:
+            chunks = llm.stream(messages, timeout=timeout) if timeout is not None else llm.stream(messages)
+            for chunk in chunks:
+                # Usage is reported on the final chunk
+                used_tokens = self._used_tokens(chunk) or used_tokens
+                if chunk.content:
+                    yield chunk.content
+        except Exception as e:
+            self.rate_limiter.observe_error(model, e)
+            raise
+        finally:
+            self.rate_limiter.record_usage(model, reserved_tokens, used_tokens)
+    
+    @staticmethod
+    def _estimate_tokens(llm, messages: List[Any]) -> int:
+        """Tokens to reserve: approximate prompt size plus the completion limit"""
+        prompt_chars = sum(len(message.content) for message in messages)
+        return prompt_chars // CHARS_PER_TOKEN + (getattr(llm, 'max_tokens', None) or 0)
+    
+    @staticmethod
+    def _used_tokens(response) -> Optional[int]:
+        """Total tokens reported for a response, if available"""
+        usage = getattr(response, 'usage_metadata', None) or {}
+        if 'total_tokens' in usage:
+            return usage['total_tokens']
+        token_usage = (getattr(response, 'response_metadata', None) or {}).get('token_usage') or {}
+        return token_usage.get('total_tokens')
+    
+    def _invoke(
+        self,
+        llm,
+        messages: List[Any],
+        parse: Callable[[str], Any],
+        fresh: bool = False,
+        budget: Optional[RetryBudget] = None,
+        retry_malformed: bool = True
+    ) -> Any:
+        """
+        Call a model and parse its response, serving repeated prompts from the cache
+        
+        Only responses that parse successfully are cached, so a malformed
+        reply is never replayed. Failed calls and unparseable responses are
+        retried within the job's retry budget.
+        
+        Args:
+            llm: parser_llm or generator_llm
+            messages: Chat messages
+            parse: Converts the response text into the result (raises on bad output)
+            fresh: Request a new sample even if this prompt was answered before
+            budget: Retry budget of the surrounding job (a new one if None)
+            retry_malformed: Re-sample when parse fails; when False the parse
+                error is raised at once for the caller to handle
+        
+        Returns:
+            Parsed result
+        """
+        cache_key = self._response_cache_key(llm, messages) if self._cacheable(llm, fresh) else None
+        if cache_key is not None:
+            cached_content = self.response_cache.get(cache_key)
+            if cached_content is not None:
+                try:
+                    return parse(cached_content)
+                except Exception:
+                    pass
+        
+        def attempt(timeout: float):
+            content = self._call(llm, messages, timeout)
+            return content, self._parse_response(llm, content, parse)
+        
+        budget = budget or self.retry_policy.start()
+        content, result = budget.run(
+            attempt, label=getattr(llm, 'model_name', 'LLM'), retry_malformed=retry_malformed
+        )
+        if cache_key is not None:
+            self.response_cache.set(cache_key, content)
+        return result
+    
+    async def _ainvoke(
+        self,
+        llm,
+        messages: List[Any],
+        parse: Callable[[str], Any],
+        fresh: bool = False,
+        budget: Optional[RetryBudget] = None,
+        retry_malformed: bool = True
+    ) -> Any:
+        """Async variant of _invoke()"""
+        cache_key = self._response_cache_key(llm, messages) if self._cacheable(llm, fresh) else None
+        if cache_key is not None:
+            cached_content = self.response_cache.get(cache_key)
+            if cached_content is not None:
+                try:
+                    return parse(cached_content)
+                except Exception:
+                    pass
+        
+        async def attempt(timeout: float):
+            content = await self._acall(llm, messages)
+            return content, self._parse_response(llm, content, parse)
+        
+        budget = budget or self.retry_policy.start()
+        content, result = await budget.arun(
+            attempt, label=getattr(llm, 'model_name', 'LLM'), retry_malformed=retry_malformed
+        )
+        if cache_key is not None:
+            self.response_cache.set(cache_key, content)
+        return result
+    
+    def _parse_response(self, llm, content: str, parse: Callable[[str], Any]) -> Any:
+        """Parse a live response, counting failures and repaired truncations per model"""
+        model = getattr(llm, 'model_name', 'unknown')
+        self._parse_state.repaired = False
+        try:
+            result = parse(content)
+        except Exception:
+            self._count_parse(model, 'failures')
+            raise
+        self._count_parse(model, 'repaired' if self._parse_state.repaired else 'parsed')
+        return result
+    
+    def _count_parse(self, model: str, outcome: str):
+        with self._parse_stats_lock:
+            stats = self.parse_stats.setdefault(model, {'parsed': 0, 'repaired': 0, 'failures': 0})
+            stats[outcome] += 1
+    
+    def get_parse_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get response parsing counters
+        
+        Returns:
+            Dictionary of model name to parsed, repaired and failed response
+            counts and the failure rate
+        """
+        with self._parse_stats_lock:
+            statistics = {}
+            for model, stats in self.parse_stats.items():
+                total = sum(stats.values())
+                statistics[model] = {**stats, 'failure_rate': stats['failures'] / total if total else 0.0}
+            return statistics
+    
+    def parse_syllabus(
+        self,
+        syllabus_text: str,
+        chunked: Optional[bool] = None,
+        chunk_chars: int = PARSE_CHUNK_CHARS
+    ) -> Dict[str, Any]:
         """
         Parse syllabus to extract topics, units, and structure
         
+        Long syllabi are split on unit/module boundaries and the chunks are
+        parsed concurrently (up to max_concurrency at a time), then merged.
+        Wall-clock time grows with chunks / max_concurrency instead of the
+        syllabus length, and no single request is truncated.
+        
         Args:
             syllabus_text: Raw syllabus text
+            chunked: Force (True) or disable (False) chunked parsing; by
+                default it is used when the syllabus splits into several chunks
+            chunk_chars: Target syllabus characters per chunk
         
         Returns:
             Structured syllabus data
         """
+        header, chunks = self._split_syllabus(syllabus_text, chunk_chars)
+        if chunked is False or (chunked is None and len(chunks) < 2):
+            try:
+                return self._invoke(
+                    self.parser_llm, self._syllabus_parse_messages(syllabus_text), parse=self._parse_syllabus_json
+                )
+            except Exception as e:
+                print(f"Error parsing syllabus: {e}")
+                return {"course_name": "Unknown", "units": []}
+        
+        # All chunks of one syllabus share a retry budget
+        budget = self.retry_policy.start()
+        
+        def parse_chunk(chunk: str) -> Optional[Dict[str, Any]]:
+            try:
+                return self._invoke(
+                    self.parser_llm, self._syllabus_parse_messages(chunk, header),
+                    parse=self._parse_syllabus_json, budget=budget
+                )
+            except Exception as e:
+                print(f"Error parsing syllabus chunk: {e}")
+                return None
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(chunks))) as executor:
+            parts = list(executor.map(parse_chunk, chunks))
+        return self._merge_syllabus_parts(parts)
+    
+    async def aparse_syllabus(
+        self,
+        syllabus_text: str,
+        chunked: Optional[bool] = None,
+        chunk_chars: int = PARSE_CHUNK_CHARS
+    ) -> Dict[str, Any]:
+        """Async variant of parse_syllabus()"""
+        header, chunks = self._split_syllabus(syllabus_text, chunk_chars)
+        if chunked is False or (chunked is None and len(chunks) < 2):
+            header, chunks = "", [syllabus_text]
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        budget = self.retry_policy.start()
+        
+        async def parse_chunk(chunk: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    return await self._ainvoke(
+                        self.parser_llm, self._syllabus_parse_messages(chunk, header),
+                        parse=self._parse_syllabus_json, budget=budget
+                    )
+                except Exception as e:
+                    print(f"Error parsing syllabus chunk: {e}")
+                    return None
+        
+        async with self._async_models():
+            parts = await asyncio.gather(*(parse_chunk(chunk) for chunk in chunks))
+        return self._merge_syllabus_parts(parts)
+    
+    @staticmethod
+    def _split_syllabus(syllabus_text: str, chunk_chars: int = PARSE_CHUNK_CHARS):
+        """
+        Split a syllabus into whole units, grouped up to chunk_chars
+        
+        A unit longer than chunk_chars is split at line boundaries. Text
+        without unit/module headings is split by size alone.
+        
+        Args:
+            syllabus_text: Raw syllabus text
+            chunk_chars: Target characters per chunk
+        
+        Returns:
+            (header, chunks): the text before the first unit heading
+            (truncated to PARSE_HEADER_CHARS) and the list of chunks
+        """
+        lines = syllabus_text.splitlines()
+        starts = [i for i, line in enumerate(lines) if UNIT_HEADING.match(line)]
+        if starts:
+            header = "\n".join(lines[:starts[0]]).strip()[:PARSE_HEADER_CHARS]
+            sections = [lines[start:end] for start, end in zip(starts, starts[1:] + [len(lines)])]
+        else:
+            header = ""
+            sections = [lines]
+        
+        chunks = []
+        current: List[str] = []
+        current_len = 0
+        for section in sections:
+            section_len = sum(len(line) + 1 for line in section)
+            if current and current_len + section_len > chunk_chars:
+                chunks.append("\n".join(current))
+                current, current_len = [], 0
+            if section_len <= chunk_chars:
+                current.extend(section)
+                current_len += section_len
+                continue
+            # Oversized unit: split at lines, keeping its heading on each piece
+            heading = section[0] if starts else None
+            for line in section:
+                if current and current_len + len(line) + 1 > chunk_chars:
+                    chunks.append("\n".join(current))
+                    current = [f"{heading} (continued)"] if heading and line is not heading else []
+                    current_len = sum(len(text) + 1 for text in current)
+                current.append(line)
+                current_len += len(line) + 1
+        if current:
+            chunks.append("\n".join(current))
+        
+        return header, [chunk for chunk in chunks if chunk.strip()]
+    
+    def _syllabus_parse_messages(self, syllabus_text: str, header: str = "") -> List[Any]:
+        """Build the parser prompt for a syllabus or one chunk of it"""
+        context = ""
+        if header:
+            context = f"""This is part of a longer syllabus. Course header:
+{header}
+
+"""
         prompt = f"""You are a syllabus parser. Extract and structure the following syllabus into JSON format.
 
 Extract:
@@ -86,7 +626,7 @@ Extract:
 3. Learning objectives
 4. Suggested weightage (if mentioned)
 
-Syllabus:
+{context}Syllabus:
 {syllabus_text}
 
 Return ONLY a valid JSON object with this structure:
@@ -102,31 +642,84 @@ Return ONLY a valid JSON object with this structure:
     ]
 }}"""
         
-        messages = [
+        return [
             SystemMessage(content="You are an expert syllabus analyzer. Always respond with valid JSON."),
             HumanMessage(content=prompt)
         ]
+    
+    def _parse_syllabus_json(self, content: str) -> Dict[str, Any]:
+        """Parse a syllabus response, rejecting anything that is not a JSON object"""
+        parsed = json.loads(self._extract_json(content))
+        if not isinstance(parsed, dict):
+            raise ValueError("Syllabus response is not a JSON object")
+        return parsed
+    
+    @staticmethod
+    def _merge_syllabus_parts(parts: List[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Merge per-chunk parse results into one syllabus structure
         
-        try:
-            response = self.parser_llm.invoke(messages)
-            content = response.content
-            
-            # Extract JSON from response
-            json_str = self._extract_json(content)
-            parsed_data = json.loads(json_str)
-            
-            return parsed_data
-        except Exception as e:
-            print(f"Error parsing syllabus: {e}")
+        Units with the same number (or name) are combined, topics are
+        de-duplicated case-insensitively keeping first-seen order, and the
+        most common course name wins.
+        
+        Args:
+            parts: Parsed chunks in syllabus order (None for failed chunks)
+        
+        Returns:
+            Structured syllabus data
+        """
+        parts = [part for part in parts if part]
+        if not parts:
             return {"course_name": "Unknown", "units": []}
+        
+        names = [
+            str(part.get('course_name')).strip() for part in parts
+            if part.get('course_name') and str(part.get('course_name')).strip().lower() != 'unknown'
+        ]
+        merged: Dict[str, Any] = {
+            'course_name': max(names, key=names.count) if names else "Unknown",
+            'units': []
+        }
+        
+        units_by_key: Dict[str, Dict[str, Any]] = {}
+        seen_topics: Dict[str, set] = {}
+        for part in parts:
+            for key, value in part.items():
+                # Other list fields (e.g. learning objectives) are concatenated
+                if key not in ('course_name', 'units') and isinstance(value, list):
+                    merged.setdefault(key, [])
+                    merged[key].extend(item for item in value if item not in merged[key])
+            
+            for unit in part.get('units') or []:
+                if not isinstance(unit, dict):
+                    continue
+                key = WHITESPACE.sub(' ', str(unit.get('unit_number') or unit.get('unit_name') or '')).strip().lower()
+                if not key:
+                    key = f"unit-{len(units_by_key)}"
+                if key not in units_by_key:
+                    units_by_key[key] = {**unit, 'topics': []}
+                    seen_topics[key] = set()
+                    merged['units'].append(units_by_key[key])
+                target = units_by_key[key]
+                for field, value in unit.items():
+                    if field != 'topics' and not target.get(field) and value:
+                        target[field] = value
+                for topic in unit.get('topics') or []:
+                    normalized = WHITESPACE.sub(' ', str(topic)).strip().lower()
+                    if normalized and normalized not in seen_topics[key]:
+                        seen_topics[key].add(normalized)
+                        target['topics'].append(topic)
+        
+        return merged
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def generate_questions(
         self,
         syllabus: str,
         topics: List[Dict[str, Any]],
         bloom_distribution: Dict[str, int],
-        total_marks: int
+        total_marks: int,
+        fresh: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Generate questions based on syllabus and parameters
@@ -136,9 +729,14 @@ Return ONLY a valid JSON object with this structure:
             topics: List of topics with priorities
             bloom_distribution: Bloom's taxonomy distribution
             total_marks: Total marks for the paper
+            fresh: Sample new questions instead of reusing cached responses
         
         Returns:
             List of generated questions
+        
+        Raises:
+            RuntimeError: A level could not be generated within the retry
+                budget (unless allow_placeholders is set)
         """
         # Calculate number of questions per Bloom's level
         questions_per_level = self._calculate_questions_per_level(
@@ -147,26 +745,254 @@ Return ONLY a valid JSON object with this structure:
         
         all_questions = []
         question_number = 1
+        # One retry/deadline budget for the whole paper
+        budget = self.retry_policy.start()
         
-        # Generate questions for each Bloom's level
-        for level, count_data in questions_per_level.items():
-            if count_data['count'] == 0:
-                continue
-            
-            level_questions = self._generate_questions_for_level(
-                level=level,
-                count=count_data['count'],
-                marks_per_question=count_data['marks_per_question'],
-                topics=topics,
-                syllabus=syllabus,
-                start_number=question_number
-            )
-            
-            all_questions.extend(level_questions)
-            question_number += len(level_questions)
+        try:
+            # Generate questions for each Bloom's level
+            for level, count_data in questions_per_level.items():
+                if count_data['count'] == 0:
+                    continue
+                
+                level_questions = self._generate_questions_for_level(
+                    level=level,
+                    count=count_data['count'],
+                    marks_per_question=count_data['marks_per_question'],
+                    topics=topics,
+                    syllabus=syllabus,
+                    start_number=question_number,
+                    fresh=fresh,
+                    budget=budget
+                )
+                
+                all_questions.extend(level_questions)
+                question_number += len(level_questions)
+        finally:
+            self.last_generation_stats = budget.summary()
         
         return all_questions
     
+    async def agenerate_questions(
+        self,
+        syllabus: str,
+        topics: List[Dict[str, Any]],
+        bloom_distribution: Dict[str, int],
+        total_marks: int,
+        max_concurrency: Optional[int] = None,
+        fresh: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate questions for all Bloom's levels concurrently
+        
+        Levels are requested in parallel (at most `max_concurrency` at a time),
+        so wall-clock time is close to that of the slowest level. Results are
+        merged in Bloom's level order and numbered from 1, exactly as
+        generate_questions() would number them.
+        
+        Args:
+            syllabus: Syllabus text
+            topics: List of topics with priorities
+            bloom_distribution: Bloom's taxonomy distribution
+            total_marks: Total marks for the paper
+            max_concurrency: Override the engine's concurrency cap
+            fresh: Sample new questions instead of reusing cached responses
+        
+        Returns:
+            List of generated questions
+        
+        Raises:
+            RuntimeError: A level could not be generated within the retry
+                budget (unless allow_placeholders is set)
+        """
+        questions_per_level = self._calculate_questions_per_level(
+            bloom_distribution, total_marks
+        )
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or self.max_concurrency))
+        # Concurrent levels draw from one retry/deadline budget
+        budget = self.retry_policy.start()
+        
+        async def generate_level(level: str, count_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self._agenerate_questions_for_level(
+                    level=level,
+                    count=count_data['count'],
+                    marks_per_question=count_data['marks_per_question'],
+                    topics=topics,
+                    syllabus=syllabus,
+                    fresh=fresh,
+                    budget=budget
+                )
+        
+        levels = [
+            (level, count_data) for level, count_data in questions_per_level.items()
+            if count_data['count'] > 0
+        ]
+        async with self._async_models():
+            tasks = [asyncio.ensure_future(generate_level(level, data)) for level, data in levels]
+            try:
+                # gather() returns results in submission order regardless of completion order
+                results = await asyncio.gather(*tasks)
+            except BaseException:
+                # A failed level fails the paper; stop spending quota on the others
+                for task in tasks:
+                    task.cancel()
+                raise
+            finally:
+                self.last_generation_stats = budget.summary()
+        
+        all_questions = [question for level_questions in results for question in level_questions]
+        return self._renumber_questions(all_questions)
+    
+    def stream_questions(
+        self,
+        syllabus: str,
+        topics: List[Dict[str, Any]],
+        bloom_distribution: Dict[str, int],
+        total_marks: int,
+        fresh: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Generate questions, yielding each one as soon as the model finishes it
+        
+        Levels are generated in Bloom's level order from a streamed response,
+        so the first question is available after a fraction of the total
+        time. Questions are numbered as generate_questions() would number them.
+        
+        Args:
+            syllabus: Syllabus text
+            topics: List of topics with priorities
+            bloom_distribution: Bloom's taxonomy distribution
+            total_marks: Total marks for the paper
+            fresh: Sample new questions instead of reusing cached responses
+        
+        Yields:
+            Question dictionaries
+        
+        Raises:
+            RuntimeError: A level could not be generated within the retry
+                budget (unless allow_placeholders is set)
+        """
+        questions_per_level = self._calculate_questions_per_level(
+            bloom_distribution, total_marks
+        )
+        budget = self.retry_policy.start()
+        question_number = 1
+        
+        try:
+            for level, count_data in questions_per_level.items():
+                if count_data['count'] <= 0:
+                    continue
+                for question in self._stream_questions_for_level(
+                    level=level,
+                    count=count_data['count'],
+                    marks_per_question=count_data['marks_per_question'],
+                    topics=topics,
+                    syllabus=syllabus,
+                    start_number=question_number,
+                    fresh=fresh,
+                    budget=budget
+                ):
+                    question_number = question['number'] + 1
+                    yield question
+        finally:
+            self.last_generation_stats = budget.summary()
+    
+    def _stream_questions_for_level(
+        self,
+        level: str,
+        count: int,
+        marks_per_question: int,
+        topics: List[Dict[str, Any]],
+        syllabus: str,
+        start_number: int,
+        fresh: bool,
+        budget: RetryBudget
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream one level's questions
+        
+        If the stream fails after some questions were yielded, the retry
+        asks only for the questions still missing.
+        """
+        if self._cascades(level):
+            # Drafts must be reviewed as a set before any of them is shown
+            yield from self._generate_cascaded(
+                level, count, marks_per_question, topics, syllabus, start_number, fresh, budget
+            )
+            return
+        
+        label = getattr(self.generator_llm, 'model_name', 'LLM')
+        yielded = 0
+        attempt = 0
+        last_error = None
+        read_cache = True
+        
+        while yielded < count:
+            remaining = count - yielded
+            messages = self._level_messages(level, remaining, marks_per_question, topics, syllabus)
+            cache_key = (
+                self._response_cache_key(self.generator_llm, messages)
+                if self._cacheable(self.generator_llm, fresh) else None
+            )
+            cached_content = (
+                self.response_cache.get(cache_key) if cache_key is not None and read_cache else None
+            )
+            
+            try:
+                if cached_content is not None:
+                    chunks = iter([cached_content])
+                else:
+                    budget.start_attempt(attempt, last_error)
+                    chunks = self._stream(self.generator_llm, messages, budget.call_timeout())
+            except RetryBudgetExceeded as e:
+                yield from self._level_failed(level, remaining, marks_per_question, start_number + yielded, e)
+                return
+            
+            parser = JsonArrayStream()
+            received = 0
+            try:
+                for chunk in chunks:
+                    for question in parser.feed(chunk):
+                        if not isinstance(question, dict) or received >= remaining:
+                            continue
+                        received += 1
+                        question['number'] = start_number + yielded
+                        yielded += 1
+                        yield question
+                if received == 0:
+                    raise ValueError("No questions in the streamed response")
+            except Exception as e:
+                if cached_content is None and received == 0:
+                    self._count_parse(label, 'failures')
+                if cached_content is not None:
+                    # Unusable cache entry; make a live request, whose response replaces it
+                    read_cache = False
+                    continue
+                last_error = e
+                try:
+                    time.sleep(budget.record_failure(e, attempt, label))
+                except Exception as final_error:
+                    yield from self._level_failed(
+                        level, count - yielded, marks_per_question, start_number + yielded, final_error
+                    )
+                    return
+                attempt += 1
+                continue
+            
+            if cached_content is None:
+                self._count_parse(label, 'parsed')
+            if cache_key is not None and cached_content is None and received == remaining:
+                self.response_cache.set(cache_key, parser.text)
+            # A short but well-formed response is accepted, as in generate_questions()
+            return
+    
+    @staticmethod
+    def _renumber_questions(questions: List[Dict[str, Any]], start_number: int = 1) -> List[Dict[str, Any]]:
+        """Assign consecutive question numbers in list order"""
+        for i, question in enumerate(questions):
+            question['number'] = start_number + i
+        return questions
+    
     def _calculate_questions_per_level(
         self, bloom_distribution: Dict[str, int], total_marks: int
     ) -> Dict[str, Dict[str, Any]]:
@@ -197,7 +1023,6 @@ Return ONLY a valid JSON object with this structure:
         
         return questions_distribution
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def _generate_questions_for_level(
         self,
         level: str,
@@ -205,13 +1030,219 @@ Return ONLY a valid JSON object with this structure:
         marks_per_question: int,
         topics: List[Dict[str, Any]],
         syllabus: str,
-        start_number: int = 1
+        start_number: int = 1,
+        fresh: bool = True,
+        budget: Optional[RetryBudget] = None,
+        use_cascade: bool = True
     ) -> List[Dict[str, Any]]:
         """Generate questions for a specific Bloom's level"""
+        if use_cascade and self._cascades(level):
+            return self._generate_cascaded(
+                level, count, marks_per_question, topics, syllabus, start_number, fresh, budget
+            )
+        messages = self._level_messages(level, count, marks_per_question, topics, syllabus)
+        
+        try:
+            return self._invoke(
+                self.generator_llm,
+                messages,
+                parse=lambda content: self._parse_level_questions(content, start_number),
+                fresh=fresh,
+                budget=budget
+            )
+        except Exception as e:
+            return self._level_failed(level, count, marks_per_question, start_number, e)
+    
+    async def _agenerate_questions_for_level(
+        self,
+        level: str,
+        count: int,
+        marks_per_question: int,
+        topics: List[Dict[str, Any]],
+        syllabus: str,
+        start_number: int = 1,
+        fresh: bool = True,
+        budget: Optional[RetryBudget] = None,
+        use_cascade: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Generate questions for a specific Bloom's level without blocking the event loop"""
+        if use_cascade and self._cascades(level):
+            return await self._agenerate_cascaded(
+                level, count, marks_per_question, topics, syllabus, start_number, fresh, budget
+            )
+        messages = self._level_messages(level, count, marks_per_question, topics, syllabus)
         
+        try:
+            return await self._ainvoke(
+                self.generator_llm,
+                messages,
+                parse=lambda content: self._parse_level_questions(content, start_number),
+                fresh=fresh,
+                budget=budget
+            )
+        except Exception as e:
+            return self._level_failed(level, count, marks_per_question, start_number, e)
+    
+    def _cascades(self, level: str) -> bool:
+        """Whether a level is drafted by the parser model"""
+        return self.cascade and level.lower() in self.cascade_levels
+    
+    def _generate_cascaded(
+        self,
+        level: str,
+        count: int,
+        marks_per_question: int,
+        topics: List[Dict[str, Any]],
+        syllabus: str,
+        start_number: int,
+        fresh: bool,
+        budget: Optional[RetryBudget]
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate a level in cascade mode
+        
+        The parser model drafts the questions; drafts that pass review are
+        kept and only the shortfall is generated by the generator model.
+        """
+        messages = self._level_messages(level, count, marks_per_question, topics, syllabus)
+        try:
+            drafts = self._invoke(
+                self.parser_llm,
+                messages,
+                parse=lambda content: self._parse_level_questions(content, start_number),
+                fresh=fresh,
+                budget=budget
+            )
+        except Exception as e:
+            print(f"Cascade draft for {level} failed, using {self.generator_model}: {e}")
+            drafts = []
+        
+        accepted = self._review_drafts(level, drafts[:count], budget)
+        escalated = []
+        if len(accepted) < count:
+            escalated = self._generate_questions_for_level(
+                level, count - len(accepted), marks_per_question, topics, syllabus,
+                start_number + len(accepted), fresh, budget, use_cascade=False
+            )
+        return self._cascade_result(level, drafts[:count], accepted, escalated, start_number)
+    
+    async def _agenerate_cascaded(
+        self,
+        level: str,
+        count: int,
+        marks_per_question: int,
+        topics: List[Dict[str, Any]],
+        syllabus: str,
+        start_number: int,
+        fresh: bool,
+        budget: Optional[RetryBudget]
+    ) -> List[Dict[str, Any]]:
+        """Async variant of _generate_cascaded()"""
+        messages = self._level_messages(level, count, marks_per_question, topics, syllabus)
+        try:
+            drafts = await self._ainvoke(
+                self.parser_llm,
+                messages,
+                parse=lambda content: self._parse_level_questions(content, start_number),
+                fresh=fresh,
+                budget=budget
+            )
+        except Exception as e:
+            print(f"Cascade draft for {level} failed, using {self.generator_model}: {e}")
+            drafts = []
+        
+        # Quality scoring uses the blocking API; keep it off the event loop
+        accepted = await asyncio.to_thread(self._review_drafts, level, drafts[:count], budget)
+        escalated = []
+        if len(accepted) < count:
+            escalated = await self._agenerate_questions_for_level(
+                level, count - len(accepted), marks_per_question, topics, syllabus,
+                start_number + len(accepted), fresh, budget, use_cascade=False
+            )
+        return self._cascade_result(level, drafts[:count], accepted, escalated, start_number)
+    
+    def _review_drafts(
+        self, level: str, drafts: List[Dict[str, Any]], budget: Optional[RetryBudget] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Keep drafts that are at the requested Bloom's level and of sufficient quality
+        
+        A draft that could not be scored is rejected, so an evaluator outage
+        escalates drafts to the generator instead of passing them unchecked.
+        
+        Args:
+            level: Requested Bloom's level
+            drafts: Questions drafted by the parser model
+            budget: Retry budget of the generation job
+        
+        Returns:
+            Accepted drafts, in order
+        """
+        on_level = [
+            draft for draft in drafts
+            if isinstance(draft, dict) and draft.get('question')
+            and self.bloom_classifier.classify_question(str(draft['question'])) == level.lower()
+        ]
+        if not on_level:
+            return []
+        
+        # One batched request scores every draft
+        scores = self.evaluate_questions(on_level, budget=budget, default_score=None)
+        return [
+            draft for draft, score in zip(on_level, scores)
+            if score is not None and score >= self.cascade_min_quality
+        ]
+    
+    def _cascade_result(
+        self,
+        level: str,
+        drafts: List[Dict[str, Any]],
+        accepted: List[Dict[str, Any]],
+        escalated: List[Dict[str, Any]],
+        start_number: int
+    ) -> List[Dict[str, Any]]:
+        """Record cascade counters and number the merged questions"""
+        stats = self.cascade_stats.setdefault(level, {'drafted': 0, 'accepted': 0, 'escalated': 0})
+        stats['drafted'] += len(drafts)
+        stats['accepted'] += len(accepted)
+        stats['escalated'] += len(escalated)
+        return self._renumber_questions(accepted + escalated, start_number)
+    
+    def _syllabus_context(self, syllabus: str, topic_names: List[str]) -> str:
+        """
+        Select syllabus context for a prompt
+        
+        The chunk index is built once per syllabus and reused by every level.
+        
+        Args:
+            syllabus: Syllabus text
+            topic_names: Topics the prompt asks about
+        
+        Returns:
+            Context text within context_token_budget
+        """
+        key = DiskCache.make_key('syllabus', syllabus)
+        if self._syllabus_index is None or self._syllabus_index_key != key:
+            self._syllabus_index = SyllabusIndex(syllabus)
+            self._syllabus_index_key = key
+        return self._syllabus_index.select_context(topic_names, self.context_token_budget)
+    
+    def _level_messages(
+        self,
+        level: str,
+        count: int,
+        marks_per_question: int,
+        topics: List[Dict[str, Any]],
+        syllabus: str
+    ) -> List[Any]:
+        """Build the generator prompt for a Bloom's level"""
         # Select top topics by priority
         selected_topics = sorted(topics, key=lambda x: x.get('priority', 0), reverse=True)[:5]
-        topics_str = ", ".join([t.get('name', t.get('topic', 'Unknown')) for t in selected_topics])
+        topic_names = [t.get('name', t.get('topic', 'Unknown')) for t in selected_topics]
+        topics_str = ", ".join(topic_names)
+        
+        # Syllabus passages most relevant to those topics, within the context budget
+        context = self._syllabus_context(syllabus, topic_names)
         
         # Create prompt for question generation
         prompt = f"""Generate {count} examination questions at the "{level}" level of Bloom's Taxonomy.
@@ -221,7 +1252,7 @@ Each question should be worth {marks_per_question} marks.
 Topics to cover: {topics_str}
 
 Syllabus context:
-{syllabus[:1000]}...
+{context}
 
 Requirements:
 1. Questions must be at the "{level}" cognitive level
@@ -254,24 +1285,31 @@ Return ONLY valid JSON array."""
             SystemMessage(content="You are an expert question paper setter with deep knowledge of Bloom's Taxonomy."),
             HumanMessage(content=prompt)
         ]
+        return messages
+    
+    def _parse_level_questions(self, content: str, start_number: int) -> List[Dict[str, Any]]:
+        """Parse the generator's JSON array and number the questions"""
+        # Extract JSON from response
+        json_str = self._extract_json(content)
+        questions = json.loads(json_str)
+        if not isinstance(questions, list):
+            raise ValueError("Generator response is not a JSON array")
+        # Stray strings or numbers in the array are dropped, as stream_questions() does
+        questions = [question for question in questions if isinstance(question, dict)]
+        if not questions:
+            raise ValueError("Generator response contains no questions")
         
-        try:
-            response = self.generator_llm.invoke(messages)
-            content = response.content
-            
-            # Extract JSON from response
-            json_str = self._extract_json(content)
-            questions = json.loads(json_str)
-            
-            # Add question numbers
-            for i, q in enumerate(questions):
-                q['number'] = start_number + i
-            
-            return questions
-        except Exception as e:
-            print(f"Error generating questions for {level}: {e}")
-            # Return fallback questions
-            return self._generate_fallback_questions(level, count, marks_per_question, start_number)
+        # Add question numbers
+        return self._renumber_questions(questions, start_number)
+    
+    def _level_failed(
+        self, level: str, count: int, marks: int, start_number: int, error: Exception
+    ) -> List[Dict[str, Any]]:
+        """Surface a level that failed for good, or substitute placeholders if allowed"""
+        if self.allow_placeholders:
+            print(f"Warning: using placeholder questions for {level}: {error}")
+            return self._generate_fallback_questions(level, count, marks, start_number)
+        raise RuntimeError(f"Failed to generate {level} questions: {error}") from error
     
     def _generate_fallback_questions(
         self, level: str, count: int, marks: int, start_number: int
@@ -290,31 +1328,32 @@ Return ONLY valid JSON array."""
         return fallback
     
     def _extract_json(self, text: str) -> str:
-        """Extract JSON from LLM response"""
-        # Try to find JSON in code blocks
-        import re
-        
-        # Look for JSON in code blocks
-        json_pattern = r'```(?:json)?\s*(\{.*?\}|\[.*?\])\s*```'
-        match = re.search(json_pattern, text, re.DOTALL)
-        if match:
-            return match.group(1)
-        
-        # Look for JSON object/array directly
-        json_pattern = r'(\{.*?\}|\[.*?\])'
-        match = re.search(json_pattern, text, re.DOTALL)
-        if match:
-            return match.group(1)
+        """
+        Extract JSON from LLM response
         
-        return text
+        Nested objects and arrays are kept whole, and output cut off by the
+        token limit is closed after its last complete value.
+        """
+        json_text, repaired = extract_json(text)
+        if json_text is None:
+            return text
+        if repaired:
+            self._parse_state.repaired = True
+        return json_text
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-    def evaluate_question_quality(self, question: Dict[str, Any]) -> float:
+    def evaluate_question_quality(
+        self,
+        question: Dict[str, Any],
+        budget: Optional[RetryBudget] = None,
+        default_score: Optional[float] = 7.0
+    ) -> Optional[float]:
         """
         Evaluate quality of a generated question
         
         Args:
             question: Question dictionary
+            budget: Retry budget of the surrounding job (a new one if None)
+            default_score: Returned when the question cannot be scored
         
         Returns:
             Quality score (0-10)
@@ -340,20 +1379,142 @@ Return ONLY a number between 0 and 10."""
         ]
         
         try:
-            response = self.parser_llm.invoke(messages)
-            score_str = response.content.strip()
-            
-            # Extract number from response
-            import re
-            match = re.search(r'(\d+(?:\.\d+)?)', score_str)
-            if match:
-                score = float(match.group(1))
-                return min(10.0, max(0.0, score))
-            
-            return 7.0  # Default score
+            # A reply without a score is not worth another request
+            return self._invoke(
+                self.parser_llm, messages, parse=self._parse_score, budget=budget, retry_malformed=False
+            )
+        except ValueError:
+            return default_score
         except Exception as e:
             print(f"Error evaluating question: {e}")
-            return 7.0
+            return default_score
+    
+    @staticmethod
+    def _parse_score(content: str) -> float:
+        """Extract a 0-10 score from the evaluator's response"""
+        match = re.search(r'(\d+(?:\.\d+)?)', content.strip())
+        if not match:
+            raise ValueError(f"No score in response: {content[:50]!r}")
+        return min(10.0, max(0.0, float(match.group(1))))
+    
+    def evaluate_questions(
+        self,
+        questions: List[Dict[str, Any]],
+        max_batch_size: int = 25,
+        budget: Optional[RetryBudget] = None,
+        default_score: Optional[float] = 7.0
+    ) -> List[Optional[float]]:
+        """
+        Evaluate the quality of many questions with as few requests as possible
+        
+        Questions are scored in batches by one parser-model request each,
+        sized to fit the model's context and output limits. Questions whose
+        score is missing or malformed in a batch response are re-scored
+        individually with evaluate_question_quality().
+        
+        Args:
+            questions: Question dictionaries
+            max_batch_size: Maximum questions per request
+            budget: Retry budget shared by all scoring requests (a new one if None)
+            default_score: Score for questions that cannot be scored
+        
+        Returns:
+            Quality scores (0-10), in the same order as the questions
+        """
+        budget = budget or self.retry_policy.start()
+        scores: List[Optional[float]] = [None] * len(questions)
+        
+        for batch in self._evaluation_batches(questions, max_batch_size):
+            try:
+                batch_scores = self._invoke(
+                    self.parser_llm,
+                    self._evaluation_batch_messages(questions, batch),
+                    parse=self._parse_batch_scores,
+                    budget=budget,
+                    # Unparseable batches fall back to per-question scoring below
+                    retry_malformed=False
+                )
+            except Exception as e:
+                print(f"Error evaluating question batch: {e}")
+                batch_scores = {}
+            
+            for index in batch:
+                scores[index] = batch_scores.get(index + 1)
+        
+        # Only items that failed to parse fall back to one request each
+        for index, score in enumerate(scores):
+            if score is None:
+                scores[index] = self.evaluate_question_quality(questions[index], budget, default_score)
+        
+        return scores
+    
+    def _evaluation_batches(self, questions: List[Dict[str, Any]], max_batch_size: int) -> List[List[int]]:
+        """Group question indices into batches that fit the parser model's budget"""
+        output_budget = getattr(self.parser_llm, 'max_tokens', None) or 1024
+        max_items = max(1, min(max_batch_size, output_budget // SCORE_OUTPUT_TOKENS))
+        # Leave room for the instructions and the reserved output
+        input_budget = PARSER_CONTEXT_TOKENS - output_budget - 400
+        
+        batches = []
+        batch: List[int] = []
+        batch_tokens = 0
+        for index, question in enumerate(questions):
+            item_tokens = len(self._evaluation_item(index + 1, question)) // CHARS_PER_TOKEN + 1
+            if batch and (len(batch) >= max_items or batch_tokens + item_tokens > input_budget):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append(index)
+            batch_tokens += item_tokens
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    @staticmethod
+    def _evaluation_item(item_id: int, question: Dict[str, Any]) -> str:
+        """Format one question for the batch evaluation prompt"""
+        return (
+            f"ID {item_id}\n"
+            f"Question: {question.get('question', '')}\n"
+            f"Marks: {question.get('marks', 0)}\n"
+            f"Bloom's Level: {question.get('bloom_level', '')}\n"
+            f"Topic: {question.get('topic', '')}\n"
+        )
+    
+    def _evaluation_batch_messages(self, questions: List[Dict[str, Any]], batch: List[int]) -> List[Any]:
+        """Build the batch evaluation prompt"""
+        items = "\n".join(self._evaluation_item(index + 1, questions[index]) for index in batch)
+        prompt = f"""Evaluate the quality of each examination question below on a scale of 0-10.
+
+Evaluation criteria:
+1. Clarity and unambiguity (0-3)
+2. Appropriate for Bloom's level (0-3)
+3. Exam suitability (0-2)
+4. Scope matches marks (0-2)
+
+{items}
+Return ONLY a JSON array with one entry per question, using the IDs above:
+[
+    {{"id": 1, "score": 7.5}}
+]"""
+        
+        return [
+            SystemMessage(content="You are an exam quality evaluator. Always respond with valid JSON."),
+            HumanMessage(content=prompt)
+        ]
+    
+    def _parse_batch_scores(self, content: str) -> Dict[int, float]:
+        """Parse a batch evaluation response into {id: score}, skipping malformed entries"""
+        items = json.loads(self._extract_json(content))
+        if not isinstance(items, list):
+            raise ValueError("Batch evaluation response is not a JSON array")
+        
+        scores = {}
+        for item in items:
+            try:
+                scores[int(item['id'])] = min(10.0, max(0.0, float(item['score'])))
+            except (KeyError, TypeError, ValueError):
+                continue
+        return scores
     
     def refine_question(self, question: Dict[str, Any], feedback: str) -> Dict[str, Any]:
         """
@@ -378,10 +1539,87 @@ Provide an improved version of the question that addresses the feedback.
 Return ONLY the improved question text, nothing else."""
         
         try:
-            response = self.generator_llm.invoke([HumanMessage(content=prompt)])
             improved_question = question.copy()
-            improved_question['question'] = response.content.strip()
+            improved_question['question'] = self._invoke(
+                self.generator_llm, [HumanMessage(content=prompt)], parse=str.strip, fresh=True
+            )
             return improved_question
         except Exception as e:
             print(f"Error refining question: {e}")
             return question
+
+
+def load_llm_config(config_path: str = "config.yaml") -> Dict[str, Any]:
+    """
+    Build DualLLMEngine arguments from the `llm` section of config.yaml
+    
+    Usage: DualLLMEngine(**load_llm_config())
+    
+    Args:
+        config_path: Path to the YAML configuration file
+    
+    Returns:
+        Keyword arguments accepted by DualLLMEngine
+    """
+    path = Path(config_path)
+    if not path.exists():
+        return {}
+    
+    import yaml
+    with open(path, 'r') as f:
+        llm_section = (yaml.safe_load(f) or {}).get('llm', {}) or {}
+    
+    parser_section = llm_section.get('parser', {}) or {}
+    generator_section = llm_section.get('generator', {}) or {}
+    retry_section = dict(llm_section.get('retry', {}) or {})
+    cache_section = llm_section.get('cache', {}) or {}
+    cascade_section = llm_section.get('cascade', {}) or {}
+    
+    config: Dict[str, Any] = {}
+    if 'model' in parser_section:
+        config['parser_model'] = parser_section['model']
+    if 'temperature' in parser_section:
+        config['parser_temperature'] = parser_section['temperature']
+    if 'max_tokens' in parser_section:
+        config['parser_max_tokens'] = parser_section['max_tokens']
+    if 'model' in generator_section:
+        config['generator_model'] = generator_section['model']
+    for key in ('temperature', 'max_tokens', 'context_token_budget', 'max_concurrency'):
+        if key in generator_section:
+            config[key] = generator_section[key]
+    
+    # Older configs give attempts per call and a fixed delay
+    if 'max_attempts' in retry_section and 'max_retries' not in retry_section:
+        retry_section['max_retries'] = max(0, int(retry_section['max_attempts']) - 1)
+    if 'delay_seconds' in retry_section and 'backoff_base_seconds' not in retry_section:
+        retry_section['backoff_base_seconds'] = retry_section['delay_seconds']
+    if retry_section:
+        config['retry_policy'] = RetryPolicy.from_config(retry_section)
+    if 'allow_placeholders' in retry_section:
+        config['allow_placeholders'] = retry_section['allow_placeholders']
+    
+    if 'enabled' in cache_section:
+        config['cache_enabled'] = cache_section['enabled']
+    if 'directory' in cache_section:
+        config['cache_dir'] = cache_section['directory']
+    if 'ttl_hours' in cache_section:
+        config['cache_ttl_hours'] = cache_section['ttl_hours']
+    if 'max_size_mb' in cache_section:
+        config['cache_max_size_mb'] = cache_section['max_size_mb']
+    
+    if llm_section.get('rate_limits'):
+        config['rate_limits'] = {
+            model: dict(limits or {}) for model, limits in llm_section['rate_limits'].items()
+        }
+    
+    if 'enabled' in cascade_section:
+        config['cascade'] = cascade_section['enabled']
+    if 'levels' in cascade_section:
+        config['cascade_levels'] = list(cascade_section['levels'])
+    if 'min_quality' in cascade_section:
+        config['cascade_min_quality'] = cascade_section['min_quality']
+    
+    if llm_section.get('base_url'):
+        config['base_url'] = llm_section['base_url']
+    
+    return config
@@ -0,0 +1,208 @@
+"""
+OCR Layout Module
+Structured OCR output (words, lines, blocks, boxes, confidences) from Tesseract TSV
+"""
+
+from typing import List, Dict, Any, Optional
+
+try:
+    import numpy as np
+except ImportError as e:
+    print(f"Import error: {e}")
+    print("Please install: pip install numpy")
+
+
+# Tesseract TSV element levels
+LEVEL_PAGE = 1
+LEVEL_BLOCK = 2
+LEVEL_PARAGRAPH = 3
+LEVEL_LINE = 4
+LEVEL_WORD = 5
+
+
+class OCRLayout:
+    """
+    Word-level OCR layout of one page stored as column arrays
+    
+    Only word rows are kept. Each attribute is a NumPy array with one entry
+    per word, and word texts are packed into a single string addressed by
+    offsets, so a page costs a handful of arrays instead of one dict per word.
+    """
+    
+    def __init__(
+        self,
+        page_number: int,
+        block: "np.ndarray",
+        paragraph: "np.ndarray",
+        line: "np.ndarray",
+        boxes: "np.ndarray",
+        confidence: "np.ndarray",
+        text_buffer: str,
+        text_offsets: "np.ndarray"
+    ):
+        """
+        Initialize OCR Layout
+        
+        Args:
+            page_number: 1-based page number
+            block: Block index per word (int32)
+            paragraph: Paragraph index per word (int32)
+            line: Line index within the paragraph per word (int32)
+            boxes: (N, 4) left, top, width, height per word (int32)
+            confidence: Tesseract confidence per word, 0-100 (float32)
+            text_buffer: All word texts concatenated
+            text_offsets: (N + 1) start offsets of each word in text_buffer (int32)
+        """
+        self.page_number = page_number
+        self.block = block
+        self.paragraph = paragraph
+        self.line = line
+        self.boxes = boxes
+        self.confidence = confidence
+        self.text_buffer = text_buffer
+        self.text_offsets = text_offsets
+    
+    @classmethod
+    def from_tsv(cls, tsv: str, page_number: int = 1) -> "OCRLayout":
+        """
+        Build a layout from Tesseract TSV output
+        
+        Args:
+            tsv: TSV text from image_to_data / GetTSVText
+            page_number: Page number to record on the layout
+        
+        Returns:
+            OCRLayout with one entry per recognized word
+        """
+        numbers = []
+        words = []
+        
+        for row in tsv.splitlines():
+            fields = row.split('\t')
+            if len(fields) < 12 or fields[0] == 'level':
+                continue
+            if int(fields[0]) != LEVEL_WORD or not fields[11].strip():
+                continue
+            # block, paragraph, line, left, top, width, height, conf
+            numbers.append((
+                int(fields[2]), int(fields[3]), int(fields[4]),
+                int(fields[6]), int(fields[7]), int(fields[8]), int(fields[9]),
+                float(fields[10])
+            ))
+            words.append(fields[11])
+        
+        table = np.array(numbers, dtype=np.float64).reshape(-1, 8)
+        lengths = np.fromiter((len(word) for word in words), dtype=np.int32, count=len(words))
+        offsets = np.zeros(len(words) + 1, dtype=np.int32)
+        np.cumsum(lengths, out=offsets[1:])
+        
+        return cls(
+            page_number=page_number,
+            block=table[:, 0].astype(np.int32),
+            paragraph=table[:, 1].astype(np.int32),
+            line=table[:, 2].astype(np.int32),
+            boxes=table[:, 3:7].astype(np.int32),
+            confidence=table[:, 7].astype(np.float32),
+            text_buffer="".join(words),
+            text_offsets=offsets
+        )
+    
+    def __len__(self) -> int:
+        return len(self.confidence)
+    
+    def word(self, index: int) -> str:
+        """Get the text of a single word"""
+        return self.text_buffer[self.text_offsets[index]:self.text_offsets[index + 1]]
+    
+    def words(self, min_conf: Optional[float] = None) -> List[str]:
+        """
+        Get word texts in reading order
+        
+        Args:
+            min_conf: Drop words below this confidence (0-100)
+        
+        Returns:
+            List of words
+        """
+        indices = range(len(self)) if min_conf is None else np.flatnonzero(self.confidence >= min_conf)
+        return [self.word(i) for i in indices]
+    
+    def low_confidence_mask(self, threshold: float = 60.0) -> "np.ndarray":
+        """Boolean mask of words whose confidence is below the threshold"""
+        return self.confidence < threshold
+    
+    def mean_confidence(self) -> float:
+        """Average word confidence for the page (0-100)"""
+        return float(self.confidence.mean()) if len(self) else 0.0
+    
+    def _group_bounds(self, by_line: bool) -> "np.ndarray":
+        """Start offsets of each group (line or block), plus the end offset"""
+        if len(self) == 0:
+            return np.zeros(1, dtype=np.int64)
+        keys = (
+            np.stack([self.block, self.paragraph, self.line], axis=1)
+            if by_line else self.block[:, None]
+        )
+        # Words arrive in reading order, so a group starts wherever the key changes
+        changes = np.flatnonzero(np.any(keys[1:] != keys[:-1], axis=1)) + 1
+        return np.concatenate([[0], changes, [len(self)]])
+    
+    def _groups(self, by_line: bool, min_conf: Optional[float]) -> List[Dict[str, Any]]:
+        """Aggregate words into lines or blocks with text, box and confidence"""
+        bounds = self._group_bounds(by_line)
+        keep = np.ones(len(self), dtype=bool) if min_conf is None else self.confidence >= min_conf
+        
+        groups = []
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            members = start + np.flatnonzero(keep[start:end])
+            if len(members) == 0:
+                continue
+            left = self.boxes[members, 0]
+            top = self.boxes[members, 1]
+            right = left + self.boxes[members, 2]
+            bottom = top + self.boxes[members, 3]
+            groups.append({
+                'block': int(self.block[members[0]]),
+                'paragraph': int(self.paragraph[members[0]]),
+                'line': int(self.line[members[0]]),
+                'text': " ".join(self.word(i) for i in members),
+                'bbox': (int(left.min()), int(top.min()), int(right.max()), int(bottom.max())),
+                'confidence': float(self.confidence[members].mean())
+            })
+        return groups
+    
+    def lines(self, min_conf: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Get text lines with bounding boxes and mean confidence
+        
+        Args:
+            min_conf: Drop words below this confidence before grouping
+        
+        Returns:
+            List of line dictionaries ('text', 'bbox', 'confidence', ...)
+        """
+        return self._groups(by_line=True, min_conf=min_conf)
+    
+    def blocks(self, min_conf: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Get text blocks with bounding boxes and mean confidence
+        
+        Args:
+            min_conf: Drop words below this confidence before grouping
+        
+        Returns:
+            List of block dictionaries ('text', 'bbox', 'confidence', ...)
+        """
+        return self._groups(by_line=False, min_conf=min_conf)
+    
+    def text(self, min_conf: Optional[float] = None) -> str:
+        """
+        Reconstruct page text, one line per OCR line
+        
+        Args:
+            min_conf: Drop words below this confidence
+        
+        Returns:
+            Page text
+        """
+        return "\n".join(line['text'] for line in self.lines(min_conf=min_conf))
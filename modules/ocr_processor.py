@@ -3,21 +3,58 @@ OCR Processor Module
 Handles OCR extraction, watermark removal, and text preprocessing
 """
 
+import hashlib
+import io
+import math
+import multiprocessing
 import os
 import re
-from typing import Optional, Dict, Any
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack, contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Dict, Any, List, Iterable, Iterator, Tuple, Union
 from pathlib import Path
-import tempfile
 
 try:
     import pytesseract
-    from PIL import Image
-    from pdf2image import convert_from_bytes, convert_from_path
+    from PIL import Image, ImageOps, ImageSequence
+    from pdf2image import convert_from_path, pdfinfo_from_path
     import PyPDF2
 except ImportError as e:
     print(f"Import error: {e}")
     print("Please install required packages: pip install pytesseract pdf2image PyPDF2 Pillow")
 
+from modules import tesseract_backend
+from modules.document_source import DocumentSource
+from modules.image_preprocessor import preprocess_image
+from modules.ocr_layout import OCRLayout
+from modules.text_cleaner import TextCleaner
+from utils.disk_cache import DiskCache
+
+
+def _tesseract_page_worker(
+    image: "Image.Image",
+    backend: str,
+    tesseract_config: str,
+    language: str,
+    preprocess_options: Optional[Dict[str, Any]] = None,
+    output: str = "text"
+) -> Tuple[Union[str, OCRLayout], Dict[str, float]]:
+    """OCR a single page inside a pool worker process ('text' or 'layout' output)"""
+    timings = {}
+    if preprocess_options is not None:
+        image, timings = preprocess_image(image, preprocess_options)
+    
+    try:
+        if output == "layout":
+            tsv = tesseract_backend.image_to_tsv(image, backend, language, tesseract_config)
+            return OCRLayout.from_tsv(tsv), timings
+        return tesseract_backend.image_to_string(image, backend, language, tesseract_config), timings
+    except Exception as e:
+        raise RuntimeError(f"Tesseract OCR failed: {e}")
+
 
 class OCRProcessor:
     """
@@ -31,37 +68,150 @@ class OCRProcessor:
         Args:
             engine: OCR engine to use ('tesseract' or 'nanonets')
             config: Additional configuration parameters
+                (e.g. 'tesseract_config', 'language', 'workers', 'dpi',
+                'start_method', 'render_window', 'min_text_layer_chars', 'cache_enabled',
+                'cache_dir', 'cache_max_size_mb', 'preprocess', 'preprocess_options',
+                'tesseract_backend', 'watermark_patterns', 'strip_repeated_lines',
+                'repeated_line_ratio', 'repeated_line_min_pages', 'repeated_line_zone')
         """
         self.engine = engine.lower()
         self.config = config or {}
         
+        # Page-level parallelism (1 = sequential OCR in the calling process)
+        self.workers = max(1, int(self.config.get('workers', 1)))
+        self.language = self.config.get('language', 'eng')
+        self.tesseract_config = self.config.get('tesseract_config', '--psm 6')
+        
+        # 'tesserocr' keeps one initialized Tesseract per worker instead of a subprocess
+        # per page; 'auto' (the default) uses it whenever it is installed
+        self.tesseract_backend = 'pytesseract'
+        if self.engine == "tesseract":
+            self.tesseract_backend = tesseract_backend.resolve_backend(
+                self.config.get('tesseract_backend', tesseract_backend.AUTO)
+            )
+        # Workers are spawned rather than forked: the processor is created in
+        # multi-threaded servers (Streamlit), where forking can deadlock
+        self.start_method = self.config.get('start_method', 'spawn')
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        
+        # Streaming rasterization: pages converted per window and render resolution
+        self.render_window = max(1, int(self.config.get('render_window', 4)))
+        self.dpi = int(self.config.get('dpi', 200))
+        
+        # Pages whose text layer has fewer alphanumeric characters are OCRed
+        self.min_text_layer_chars = int(self.config.get('min_text_layer_chars', 50))
+        
+        # Cross-page header/footer removal: lines within `repeated_line_zone` lines of
+        # the top/bottom that recur on at least `repeated_line_ratio` of pages
+        self.strip_repeated_lines = self.config.get('strip_repeated_lines', True)
+        self.repeated_line_ratio = float(self.config.get('repeated_line_ratio', 0.6))
+        self.repeated_line_min_pages = int(self.config.get('repeated_line_min_pages', 3))
+        self.repeated_line_zone = int(self.config.get('repeated_line_zone', 4))
+        
+        # Optional image cleanup before OCR (grayscale, downscale, binarize, deskew, crop).
+        # Downscaling only shrinks pages above target_dpi: by default the render
+        # resolution, so scans and photos are OCRed at the same resolution as PDF
+        # pages (lower `dpi` itself to rasterize PDF pages smaller)
+        self.preprocess_options = None
+        if self.config.get('preprocess', False):
+            self.preprocess_options = dict(self.config.get('preprocess_options', {}))
+            self.preprocess_options.setdefault('target_dpi', self.dpi)
+        
+        # Per-thread, so sessions sharing a cached processor see their own run's statistics
+        self._run_state = threading.local()
+        
+        # Persistent OCR result cache keyed by file content
+        self.cache = None
+        if self.config.get('cache_enabled', True):
+            cache_dir = self.config.get(
+                'cache_dir', os.getenv('OCR_CACHE_PATH', './data/ocr_cache')
+            )
+            try:
+                self.cache = DiskCache(cache_dir, self.config.get('cache_max_size_mb', 256))
+            except OSError as e:
+                print(f"Warning: OCR cache disabled: {e}")
+        
         # Set Tesseract path for Windows
         tesseract_path = os.getenv('TESSERACT_PATH')
         if tesseract_path and os.path.exists(tesseract_path):
             pytesseract.pytesseract.tesseract_cmd = tesseract_path
         
-        # Watermark patterns to remove
-        self.watermark_patterns = [
-            r'(?i)copyright\s*©?\s*\d{4}',
-            r'(?i)confidential',
-            r'(?i)draft',
-            r'(?i)watermark',
-            r'(?i)private\s+and\s+confidential',
-            r'(?i)internal\s+use\s+only',
-            r'(?i)do\s+not\s+copy',
-        ]
+        # Watermark patterns to remove, compiled once into a single-pass cleaner
+        self.text_cleaner = TextCleaner(self.config.get('watermark_patterns'))
+        self.watermark_patterns = self.text_cleaner.watermark_patterns
+    
+    @property
+    def last_run_stats(self) -> Dict[str, Any]:
+        """Statistics of the last extraction run made by the calling thread"""
+        stats = getattr(self._run_state, 'stats', None)
+        if stats is None:
+            stats = self._run_state.stats = {}
+        return stats
+    
+    @last_run_stats.setter
+    def last_run_stats(self, stats: Dict[str, Any]):
+        self._run_state.stats = stats
     
     def extract_text(self, file, file_type: Optional[str] = None) -> str:
         """
         Extract text from uploaded file
         
+        Every frame of a multi-page image (e.g. a scanner TIFF) is OCRed. A
+        list of images is treated as one logical document whose pages follow
+        the list order, such as several phone photos of one paper.
+        
         Args:
-            file: Uploaded file object (Streamlit UploadedFile or file path)
+            file: Uploaded file object (Streamlit UploadedFile or file path),
+                or a list of image files
             file_type: Type of file ('pdf', 'image', or None for auto-detect)
         
         Returns:
             Extracted text string
         """
+        with ExitStack() as stack:
+            sources, file_type = self._open_inputs(stack, file, file_type)
+            return self._extract_document(sources, file_type)
+    
+    def extract_layout(self, file, file_type: Optional[str] = None) -> List[OCRLayout]:
+        """
+        Extract structured OCR output (words, lines, blocks, boxes, confidences)
+        
+        Every page is OCRed, including pages with a text layer, and the result
+        is built from Tesseract's TSV output.
+        
+        Args:
+            file: Uploaded file object (Streamlit UploadedFile or file path),
+                or a list of image files
+            file_type: Type of file ('pdf', 'image', or None for auto-detect)
+        
+        Returns:
+            One OCRLayout per page, in page order
+        """
+        if self.engine != "tesseract":
+            raise ValueError(f"Structured OCR output requires the tesseract engine, not {self.engine}")
+        
+        layouts = []
+        with ExitStack() as stack:
+            sources, file_type = self._open_inputs(stack, file, file_type)
+            if file_type == 'pdf':
+                pages = self._iter_pdf_pages(sources[0])
+            else:
+                pages = self._iter_image_frames(sources)
+            
+            for page_number, layout in self._ocr_pages(pages, output="layout"):
+                layout.page_number = page_number
+                layouts.append(layout)
+        return layouts
+    
+    @contextmanager
+    def _open_input(self, file, file_type: Optional[str]) -> Iterator[Tuple[DocumentSource, Optional[str]]]:
+        """
+        Open a path or uploaded file as a shared, zero-copy DocumentSource
+        
+        Yields:
+            Tuple of (document source, resolved file type)
+        """
         if isinstance(file, str) or isinstance(file, Path):
             # File path provided
             file_path = Path(file)
@@ -73,94 +223,565 @@ class OCRProcessor:
                 ext = file_path.suffix.lower()
                 if ext == '.pdf':
                     file_type = 'pdf'
-                elif ext in ['.png', '.jpg', '.jpeg', '.tiff', '.bmp']:
+                elif ext in ['.png', '.jpg', '.jpeg', '.tiff', '.tif', '.bmp']:
                     file_type = 'image'
             
-            if file_type == 'pdf':
-                return self._extract_from_pdf_path(file_path)
-            else:
-                return self._extract_from_image_path(file_path)
+            source = DocumentSource.from_path(file_path)
         else:
             # Streamlit UploadedFile object
             if file_type is None:
                 file_type = 'pdf' if file.type == 'application/pdf' else 'image'
             
-            if file_type == 'pdf':
-                return self._extract_from_pdf_bytes(file.read())
+            source = DocumentSource.from_upload(file)
+        
+        try:
+            yield source, file_type
+        finally:
+            source.close()
+    
+    def _open_inputs(
+        self, stack: ExitStack, file, file_type: Optional[str]
+    ) -> Tuple[List[DocumentSource], Optional[str]]:
+        """
+        Open a single file or a batch of images, registering each with the stack
+        
+        Returns:
+            Tuple of (document sources in page order, resolved file type)
+        """
+        files = list(file) if isinstance(file, (list, tuple)) else [file]
+        if not files:
+            raise ValueError("No files provided")
+        
+        opened = [stack.enter_context(self._open_input(f, file_type)) for f in files]
+        file_types = {resolved for _, resolved in opened}
+        if len(opened) > 1 and file_types != {'image'}:
+            raise ValueError("Only image files can be combined into one document")
+        
+        return [source for source, _ in opened], opened[0][1]
+    
+    def _extract_document(self, sources: List[DocumentSource], file_type: Optional[str]) -> str:
+        """Extract text from a document, consulting the OCR cache first"""
+        if len(sources) == 1:
+            doc_hash = sources[0].sha256()
+        else:
+            doc_hash = DiskCache.make_key(*(source.sha256() for source in sources))
+        
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self._cache_key(
+                'document',
+                doc_hash,
+                file_type,
+                self.min_text_layer_chars,
+                self.strip_repeated_lines and (
+                    self.repeated_line_ratio, self.repeated_line_min_pages, self.repeated_line_zone
+                )
+            )
+            cached_text = self.cache.get(cache_key)
+            if cached_text is not None:
+                self.last_run_stats = {'cache_hit': True, **self.cache.get_statistics()}
+                return cached_text
+        
+        if file_type == 'pdf':
+            text = self._extract_from_pdf(sources[0])
+        else:
+            text = self._extract_from_images(sources)
+        
+        if cache_key is not None and text.strip():
+            self.cache.set(cache_key, text)
+        return text
+    
+    def _cache_key(self, *parts: Any) -> str:
+        """Build a cache key that also covers the OCR engine and its settings"""
+        return DiskCache.make_key(
+            *parts,
+            self.engine,
+            self.tesseract_config,
+            self.language,
+            self.dpi,
+            sorted(self.preprocess_options.items()) if self.preprocess_options is not None else None
+        )
+    
+    def _extract_from_pdf(self, source: DocumentSource) -> str:
+        """
+        Extract text from a PDF document
+        
+        Each page's text layer is used when it contains real text; only pages
+        without one are rasterized and OCRed.
+        """
+        self.last_run_stats = {}
+        
+        try:
+            with source.stream() as stream:
+                pdf_file = PyPDF2.PdfReader(stream)
+                layer_texts = [page.extract_text() or "" for page in pdf_file.pages]
+                
+                # Content fingerprints let a revised PDF reuse OCR for unchanged pages
+                fingerprints = {
+                    page_number: self._page_fingerprint(page)
+                    for page_number, (page, page_text) in enumerate(
+                        zip(pdf_file.pages, layer_texts), start=1
+                    )
+                    if not self._has_text_layer(page_text)
+                }
+        except Exception as e:
+            print(f"Error extracting from PDF: {e}")
+            # Fallback to OCR
+            return self._ocr_from_pdf(source)
+        
+        page_texts = {}
+        pages_to_ocr = []
+        for page_number, page_text in enumerate(layer_texts, start=1):
+            if self._has_text_layer(page_text):
+                page_texts[page_number] = page_text
             else:
-                return self._extract_from_image_bytes(file.read())
+                pages_to_ocr.append(page_number)
+        
+        if pages_to_ocr:
+            try:
+                page_texts.update(self._ocr_pdf_pages(source, pages_to_ocr, fingerprints))
+            except Exception as e:
+                print(f"Error performing OCR on PDF: {e}")
+        
+        self.last_run_stats['text_layer_pages'] = len(layer_texts) - len(pages_to_ocr)
+        return self._join_pages(self.remove_repeated_lines(page_texts))
     
-    def _extract_from_pdf_bytes(self, pdf_bytes: bytes) -> str:
-        """Extract text from PDF bytes"""
-        text = ""
+    @staticmethod
+    def _page_fingerprint(page) -> Optional[str]:
+        """
+        Hash a PDF page's content stream, images and geometry
+        
+        Identical pages hash identically even when they sit at different
+        positions in different files, e.g. in a revised upload.
         
+        Returns:
+            Hex digest, or None if the page cannot be fingerprinted
+        """
         try:
-            # First, try to extract text directly from PDF
-            pdf_file = PyPDF2.PdfReader(tempfile.NamedTemporaryFile(delete=False))
+            digest = hashlib.sha256()
+            digest.update(repr([float(v) for v in page.mediabox]).encode('ascii'))
+            digest.update(str(page.get('/Rotate', 0)).encode('ascii'))
             
-            # Alternative: Use BytesIO
-            import io
-            pdf_file = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+            contents = page.get_contents()
+            if contents is not None:
+                digest.update(contents.get_data())
             
-            # Extract text from all pages
-            for page_num in range(len(pdf_file.pages)):
-                page = pdf_file.pages[page_num]
-                page_text = page.extract_text()
-                if page_text.strip():
-                    text += page_text + "\n"
+            # Scanned pages are mostly a single image XObject; hash its data too
+            resources = page.get('/Resources')
+            xobjects = resources.get_object().get('/XObject') if resources is not None else None
+            if xobjects is not None:
+                xobjects = xobjects.get_object()
+                for name in sorted(xobjects):
+                    xobject = xobjects[name].get_object()
+                    digest.update(name.encode('utf-8'))
+                    digest.update(xobject.get_data())
             
-            # If no text extracted, use OCR on images
-            if len(text.strip()) < 100:
-                text = self._ocr_from_pdf_bytes(pdf_bytes)
+            return digest.hexdigest()
+        except Exception:
+            return None
+    
+    def _has_text_layer(self, page_text: str) -> bool:
+        """Check whether a page's extracted text layer holds real content"""
+        alphanumeric = sum(1 for char in page_text if char.isalnum())
+        return alphanumeric >= self.min_text_layer_chars
+    
+    def remove_repeated_lines(self, page_texts: Dict[int, str]) -> Dict[int, str]:
+        """
+        Strip header/footer lines that recur across most pages
         
-        except Exception as e:
-            print(f"Error extracting from PDF: {e}")
-            # Fallback to OCR
-            text = self._ocr_from_pdf_bytes(pdf_bytes)
+        Lines are normalized (case, digits, whitespace) and hashed into a
+        frequency index counting how many pages contain each line. Lines in
+        the top/bottom zone of a page whose count reaches the threshold are
+        removed, so page furniture like institution names and exam codes is
+        not embedded or sent to the LLM once per page.
         
-        return text
+        Args:
+            page_texts: Mapping of page number to page text
+        
+        Returns:
+            Mapping of page number to page text without repeated lines
+        """
+        if not self.strip_repeated_lines or len(page_texts) < self.repeated_line_min_pages:
+            return page_texts
+        
+        page_lines = {number: text.splitlines() for number, text in page_texts.items()}
+        page_hashes = {
+            number: [self._line_hash(line) for line in lines]
+            for number, lines in page_lines.items()
+        }
+        
+        # Frequency index: number of pages on which each normalized line appears
+        frequency = Counter()
+        for hashes in page_hashes.values():
+            frequency.update({
+                h for i, h in enumerate(hashes)
+                if h is not None and self._in_furniture_zone(i, len(hashes))
+            })
+        
+        threshold = max(
+            self.repeated_line_min_pages,
+            math.ceil(self.repeated_line_ratio * len(page_texts))
+        )
+        repeated = {h for h, count in frequency.items() if count >= threshold}
+        if not repeated:
+            return page_texts
+        
+        removed = 0
+        stripped_pages = {}
+        for number, lines in page_lines.items():
+            hashes = page_hashes[number]
+            kept = []
+            for i, line in enumerate(lines):
+                if hashes[i] in repeated and self._in_furniture_zone(i, len(lines)):
+                    removed += 1
+                    continue
+                kept.append(line)
+            stripped_pages[number] = "\n".join(kept)
+        
+        self.last_run_stats['repeated_lines_removed'] = removed
+        return stripped_pages
     
-    def _extract_from_pdf_path(self, pdf_path: Path) -> str:
-        """Extract text from PDF file path"""
-        with open(pdf_path, 'rb') as f:
-            return self._extract_from_pdf_bytes(f.read())
+    def _in_furniture_zone(self, index: int, line_count: int) -> bool:
+        """Check whether a line lies in the header/footer zone of its page"""
+        zone = self.repeated_line_zone
+        return zone <= 0 or index < zone or index >= line_count - zone
     
-    def _ocr_from_pdf_bytes(self, pdf_bytes: bytes) -> str:
-        """Perform OCR on PDF by converting to images"""
+    @staticmethod
+    def _line_hash(line: str) -> Optional[int]:
+        """Hash a normalized line; page numbers and spacing do not affect the hash"""
+        normalized = re.sub(r'\d+', '#', line.lower())
+        normalized = re.sub(r'[^a-z#]+', ' ', normalized).strip()
+        if len(normalized.replace('#', '').replace(' ', '')) < 3:
+            return None
+        return hash(normalized)
+    
+    def _join_pages(self, page_texts: Dict[int, str]) -> str:
+        """Assemble per-page texts in page order under [Page N] markers"""
         text = ""
+        for page_number in sorted(page_texts):
+            text += f"\n[Page {page_number}]\n{page_texts[page_number]}\n"
+        return text
+    
+    def _ocr_from_pdf(self, source: DocumentSource) -> str:
+        """Perform OCR on PDF by converting to images"""
+        page_texts = {}
         
         try:
-            # Convert PDF to images
-            images = convert_from_bytes(pdf_bytes)
-            
-            # Perform OCR on each page
-            for i, image in enumerate(images):
-                page_text = self._perform_ocr(image)
-                text += f"\n[Page {i+1}]\n{page_text}\n"
-        
+            page_count = pdfinfo_from_path(str(source.path))['Pages']
+            page_texts = self._ocr_pdf_pages(source, list(range(1, page_count + 1)))
         except Exception as e:
             print(f"Error performing OCR on PDF: {e}")
         
-        return text
+        return self._join_pages(self.remove_repeated_lines(page_texts))
     
-    def _extract_from_image_bytes(self, image_bytes: bytes) -> str:
-        """Extract text from image bytes"""
-        try:
-            import io
-            image = Image.open(io.BytesIO(image_bytes))
-            return self._perform_ocr(image)
-        except Exception as e:
-            print(f"Error extracting from image: {e}")
-            return ""
+    def _ocr_pdf_pages(
+        self,
+        source: DocumentSource,
+        page_numbers: List[int],
+        fingerprints: Optional[Dict[int, Optional[str]]] = None
+    ) -> Dict[int, str]:
+        """
+        OCR selected PDF pages, reusing cached page results where available
+        
+        Pages are keyed by their content fingerprint when one is available,
+        so unchanged pages of a revised document hit the cache; otherwise by
+        document hash and page index. Only cache misses are rasterized, and
+        their results are written back.
+        """
+        page_texts = {}
+        page_keys = {}
+        fingerprints = fingerprints or {}
+        
+        if self.cache is not None:
+            for page_number in page_numbers:
+                fingerprint = fingerprints.get(page_number)
+                if fingerprint is not None:
+                    page_keys[page_number] = self._cache_key('page-content', fingerprint)
+                else:
+                    page_keys[page_number] = self._cache_key('page', source.sha256(), page_number)
+                cached_text = self.cache.get(page_keys[page_number])
+                if cached_text is not None:
+                    page_texts[page_number] = cached_text
+        
+        missing_pages = [n for n in page_numbers if n not in page_texts]
+        cached_pages = len(page_texts)
+        
+        if missing_pages:
+            # Rasterize pages in fixed-size windows and OCR them as they arrive
+            for page_number, page_text in self._ocr_pages(
+                self._iter_pdf_pages(source, missing_pages)
+            ):
+                page_texts[page_number] = page_text
+                if page_number in page_keys:
+                    self.cache.set(page_keys[page_number], page_text)
+        
+        self.last_run_stats['cached_pages'] = cached_pages
+        if cached_pages:
+            print(f"OCR reused cached text for {cached_pages} of {len(page_numbers)} page(s)")
+        return page_texts
+    
+    def _iter_pdf_pages(
+        self, source: DocumentSource, page_numbers: Optional[List[int]] = None
+    ) -> Iterator[Tuple[int, Image.Image]]:
+        """
+        Rasterize a PDF lazily, yielding (page_number, image) pairs
+        
+        Only `render_window` pages are converted at a time, so memory use
+        stays bounded regardless of the document's page count. When
+        `page_numbers` is given, only those (1-based) pages are rendered.
+        """
+        if page_numbers is None:
+            page_count = pdfinfo_from_path(str(source.path))['Pages']
+            page_numbers = list(range(1, page_count + 1))
+        
+        for first_page, last_page in self._page_windows(page_numbers):
+            # Rendered from the source's single on-disk copy; no per-window temp files
+            images = convert_from_path(
+                str(source.path), dpi=self.dpi, first_page=first_page, last_page=last_page
+            )
+            for offset, image in enumerate(images):
+                # Record the render resolution so preprocessing can downscale accurately
+                image.info['dpi'] = (self.dpi, self.dpi)
+                yield first_page + offset, image
+            # Drop our references so the window can be collected before the next one
+            del images
+    
+    def _page_windows(self, page_numbers: List[int]) -> Iterator[Tuple[int, int]]:
+        """Group page numbers into contiguous (first, last) runs of at most render_window pages"""
+        run_start = previous = None
+        for page_number in sorted(page_numbers):
+            if run_start is not None and (
+                page_number != previous + 1 or page_number - run_start >= self.render_window
+            ):
+                yield run_start, previous
+                run_start = None
+            if run_start is None:
+                run_start = page_number
+            previous = page_number
+        if run_start is not None:
+            yield run_start, previous
+    
+    def _ocr_pages(
+        self, pages: Iterable[Tuple[int, Image.Image]], output: str = "text"
+    ) -> List[Tuple[int, Any]]:
+        """
+        OCR a stream of (page_number, image) pairs, returning results in page order
+        
+        Pages are fanned out to a process pool when more than one worker
+        is configured; otherwise they are processed sequentially. Each image
+        is closed as soon as its text has been extracted. With output="layout"
+        each result is an OCRLayout instead of a string.
+        """
+        start = time.perf_counter()
+        preprocess_timings: Dict[str, float] = {}
+        
+        if self.workers > 1 and self.engine == "tesseract":
+            workers = self.workers
+            page_texts = self._parallel_tesseract_ocr(pages, workers, preprocess_timings, output)
+        else:
+            workers = 1
+            page_texts = []
+            for page_number, image in pages:
+                try:
+                    page_image = image
+                    if self.preprocess_options is not None:
+                        page_image, timings = preprocess_image(image, self.preprocess_options)
+                        self._add_timings(preprocess_timings, timings)
+                    if output == "layout":
+                        page_texts.append((page_number, self._tesseract_layout(page_image)))
+                    else:
+                        page_texts.append((page_number, self._perform_ocr(page_image)))
+                finally:
+                    image.close()
+        
+        self._record_throughput(len(page_texts), time.perf_counter() - start, workers)
+        if self.preprocess_options is not None:
+            self.last_run_stats['preprocess_seconds'] = round(sum(preprocess_timings.values()), 3)
+            self.last_run_stats['preprocess_timings'] = {
+                step: round(seconds, 3) for step, seconds in preprocess_timings.items()
+            }
+        return page_texts
+    
+    @staticmethod
+    def _add_timings(totals: Dict[str, float], timings: Dict[str, float]):
+        """Accumulate per-step timings into running totals"""
+        for step, seconds in timings.items():
+            totals[step] = totals.get(step, 0.0) + seconds
+    
+    def _parallel_tesseract_ocr(
+        self,
+        pages: Iterable[Tuple[int, Image.Image]],
+        workers: int,
+        preprocess_timings: Dict[str, float],
+        output: str = "text"
+    ) -> List[Tuple[int, Any]]:
+        """Run Tesseract over pages in a bounded process pool"""
+        executor = self._get_executor(workers)
+        # Cap in-flight pages so the rasterizer never runs far ahead of the pool
+        max_in_flight = workers * 2
+        
+        page_texts = []
+        in_flight = deque()
+        
+        def collect_oldest():
+            page_number, image, future = in_flight.popleft()
+            try:
+                page_text, timings = future.result()
+                page_texts.append((page_number, page_text))
+                self._add_timings(preprocess_timings, timings)
+            finally:
+                image.close()
+        
+        for page_number, image in pages:
+            future = executor.submit(
+                _tesseract_page_worker,
+                image,
+                self.tesseract_backend,
+                self.tesseract_config,
+                self.language,
+                self.preprocess_options,
+                output
+            )
+            in_flight.append((page_number, image, future))
+            if len(in_flight) >= max_in_flight:
+                collect_oldest()
+        
+        # Results are collected in submission order, so page order is preserved
+        while in_flight:
+            collect_oldest()
+        
+        return page_texts
+    
+    def _get_executor(self, workers: int) -> ProcessPoolExecutor:
+        """
+        Return the processor's OCR worker pool, starting it on first use
+        
+        Workers stay alive between documents, so Tesseract start-up (and, with
+        the tesserocr backend, language data loading) is paid once per worker.
+        """
+        # The processor may be shared by several sessions (see the upload page)
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=tesseract_backend.warm_up,
+                    initargs=(
+                        self.tesseract_backend,
+                        self.language,
+                        self.tesseract_config,
+                        pytesseract.pytesseract.tesseract_cmd
+                    )
+                )
+            return self._executor
+    
+    def close(self):
+        """Shut down the OCR worker pool"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+    
+    def __enter__(self):
+        return self
     
-    def _extract_from_image_path(self, image_path: Path) -> str:
-        """Extract text from image file path"""
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _record_throughput(self, pages: int, seconds: float, workers: int):
+        """Store and report OCR throughput for the last run"""
+        pages_per_sec = pages / seconds if seconds > 0 else 0.0
+        self.last_run_stats = {
+            'pages': pages,
+            'seconds': round(seconds, 3),
+            'pages_per_sec': round(pages_per_sec, 2),
+            'workers': workers
+        }
+        if pages:
+            print(f"OCR processed {pages} page(s) in {seconds:.2f}s "
+                  f"({pages_per_sec:.2f} pages/sec, {workers} worker(s))")
+    
+    def _extract_from_images(self, sources: List[DocumentSource]) -> str:
+        """
+        Extract text from one or more images as a single document
+        
+        Every frame becomes a page and goes through the same parallel,
+        cached pipeline as scanned PDF pages. A single-frame image returns
+        its text without page markers.
+        """
+        self.last_run_stats = {}
+        
         try:
-            image = Image.open(image_path)
-            return self._perform_ocr(image)
+            page_texts = self._ocr_image_frames(self._iter_image_frames(sources))
         except Exception as e:
             print(f"Error extracting from image: {e}")
             return ""
+        
+        if len(page_texts) == 1:
+            return next(iter(page_texts.values()))
+        return self._join_pages(self.remove_repeated_lines(page_texts))
+    
+    def _iter_image_frames(self, sources: List[DocumentSource]) -> Iterator[Tuple[int, Image.Image]]:
+        """
+        Yield (page_number, image) for every frame of every image, in order
+        
+        Frames are decoded one at a time, so a long multi-page TIFF is never
+        held in memory at once. Camera EXIF orientation is applied.
+        """
+        page_number = 0
+        for source in sources:
+            # PIL leaves a stream it was handed open, so close it ourselves
+            with source.stream() as stream, Image.open(stream) as image:
+                for frame in ImageSequence.Iterator(image):
+                    page_number += 1
+                    # Returns a decoded copy, detached from the shared file handle
+                    page = ImageOps.exif_transpose(frame)
+                    if 'dpi' in frame.info:
+                        page.info['dpi'] = frame.info['dpi']
+                    yield page_number, page
+    
+    def _ocr_image_frames(self, frames: Iterable[Tuple[int, Image.Image]]) -> Dict[int, str]:
+        """
+        OCR image frames, reusing cached results for frames seen before
+        
+        Frames are keyed by a hash of their decoded pixels, so the same photo
+        or scan hits the cache even when uploaded in a different batch.
+        """
+        page_texts = {}
+        page_keys = {}
+        cached_pages = 0
+        
+        def uncached_frames():
+            nonlocal cached_pages
+            for page_number, image in frames:
+                if self.cache is not None:
+                    key = self._cache_key('frame', self._image_fingerprint(image))
+                    cached_text = self.cache.get(key)
+                    if cached_text is not None:
+                        page_texts[page_number] = cached_text
+                        cached_pages += 1
+                        image.close()
+                        continue
+                    page_keys[page_number] = key
+                yield page_number, image
+        
+        for page_number, page_text in self._ocr_pages(uncached_frames()):
+            page_texts[page_number] = page_text
+            if page_number in page_keys:
+                self.cache.set(page_keys[page_number], page_text)
+        
+        self.last_run_stats['cached_pages'] = cached_pages
+        if cached_pages:
+            print(f"OCR reused cached text for {cached_pages} of {len(page_texts)} page(s)")
+        return dict(sorted(page_texts.items()))
+    
+    @staticmethod
+    def _image_fingerprint(image: Image.Image) -> str:
+        """Hash an image's mode, size and decoded pixel data"""
+        digest = hashlib.sha256()
+        digest.update(f"{image.mode}:{image.size}".encode('ascii'))
+        digest.update(image.tobytes())
+        return digest.hexdigest()
     
     def _perform_ocr(self, image: Image.Image) -> str:
         """Perform OCR on an image using selected engine"""
@@ -174,15 +795,24 @@ class OCRProcessor:
     def _tesseract_ocr(self, image: Image.Image) -> str:
         """Perform OCR using Tesseract"""
         try:
-            # Tesseract configuration
-            custom_config = self.config.get('tesseract_config', '--psm 6')
-            
-            # Perform OCR
-            text = pytesseract.image_to_string(image, config=custom_config, lang='eng')
+            # Perform OCR (in-process API or one subprocess per call, per backend)
+            text = tesseract_backend.image_to_string(
+                image, self.tesseract_backend, self.language, self.tesseract_config
+            )
             return text
         except Exception as e:
             raise RuntimeError(f"Tesseract OCR failed: {e}")
     
+    def _tesseract_layout(self, image: Image.Image) -> OCRLayout:
+        """Perform OCR using Tesseract, keeping word boxes and confidences"""
+        try:
+            tsv = tesseract_backend.image_to_tsv(
+                image, self.tesseract_backend, self.language, self.tesseract_config
+            )
+            return OCRLayout.from_tsv(tsv)
+        except Exception as e:
+            raise RuntimeError(f"Tesseract OCR failed: {e}")
+    
     def _nanonets_ocr(self, image: Image.Image) -> str:
         """Perform OCR using Nanonets API (placeholder)"""
         # TODO: Implement Nanonets API integration
@@ -198,17 +828,8 @@ class OCRProcessor:
         Returns:
             Cleaned text
         """
-        cleaned_text = text
-        
-        # Remove watermark patterns
-        for pattern in self.watermark_patterns:
-            cleaned_text = re.sub(pattern, '', cleaned_text, flags=re.IGNORECASE)
-        
-        # Remove extra whitespace
-        cleaned_text = re.sub(r'\n\s*\n', '\n\n', cleaned_text)
-        cleaned_text = re.sub(r' +', ' ', cleaned_text)
-        
-        return cleaned_text.strip()
+        # Single scan per line; also collapses blank lines and repeated spaces
+        return self.text_cleaner.clean(text, remove_page_furniture=False, ascii_only=False)
     
     def preprocess_text(self, text: str) -> str:
         """
@@ -220,25 +841,13 @@ class OCRProcessor:
         Returns:
             Preprocessed text
         """
-        # Remove watermarks
-        text = self.remove_watermarks(text)
-        
-        # Normalize unicode characters
-        text = text.encode('ascii', 'ignore').decode('ascii')
-        
-        # Remove page numbers
-        text = re.sub(r'(?m)^\s*\d+\s*$', '', text)
-        
-        # Remove headers/footers (common patterns)
-        text = re.sub(r'(?i)page\s+\d+\s+of\s+\d+', '', text)
+        # Remove watermarks, page numbers and headers/footers, normalize
+        # unicode and whitespace in a single line-by-line pass
+        text = self.text_cleaner.clean(text)
         
         # Fix common OCR errors
         text = self._fix_ocr_errors(text)
         
-        # Normalize whitespace
-        text = re.sub(r'\n\s*\n\s*\n', '\n\n', text)
-        text = text.strip()
-        
         return text
     
     def _fix_ocr_errors(self, text: str) -> str:
@@ -278,6 +887,70 @@ class OCRProcessor:
 
 
 # Standalone functions for easy import
+def load_ocr_config(config_path: str = "config.yaml") -> Dict[str, Any]:
+    """
+    Build an OCRProcessor config from the `ocr` section of config.yaml
+    
+    Args:
+        config_path: Path to the YAML configuration file
+    
+    Returns:
+        Flat configuration dictionary accepted by OCRProcessor
+    """
+    path = Path(config_path)
+    if not path.exists():
+        return {}
+    
+    import yaml
+    with open(path, 'r') as f:
+        ocr_section = (yaml.safe_load(f) or {}).get('ocr', {}) or {}
+    
+    tesseract_section = ocr_section.get('tesseract', {}) or {}
+    parallel_section = ocr_section.get('parallel', {}) or {}
+    rasterization_section = ocr_section.get('rasterization', {}) or {}
+    cache_section = ocr_section.get('cache', {}) or {}
+    repeated_section = ocr_section.get('repeated_lines', {}) or {}
+    preprocess_section = dict(ocr_section.get('preprocessing', {}) or {})
+    text_layer_section = ocr_section.get('text_layer', {}) or {}
+    
+    config = {}
+    if 'default_engine' in ocr_section:
+        config['engine'] = ocr_section['default_engine']
+    if 'config' in tesseract_section:
+        config['tesseract_config'] = tesseract_section['config']
+    if 'language' in tesseract_section:
+        config['language'] = tesseract_section['language']
+    if 'backend' in tesseract_section:
+        config['tesseract_backend'] = tesseract_section['backend']
+    if 'workers' in parallel_section:
+        config['workers'] = parallel_section['workers']
+    if 'start_method' in parallel_section:
+        config['start_method'] = parallel_section['start_method']
+    for key in ('dpi', 'render_window'):
+        if key in rasterization_section:
+            config[key] = rasterization_section[key]
+    if 'min_chars' in text_layer_section:
+        config['min_text_layer_chars'] = text_layer_section['min_chars']
+    if 'enabled' in cache_section:
+        config['cache_enabled'] = cache_section['enabled']
+    if 'directory' in cache_section:
+        config['cache_dir'] = cache_section['directory']
+    if 'max_size_mb' in cache_section:
+        config['cache_max_size_mb'] = cache_section['max_size_mb']
+    if 'enabled' in repeated_section:
+        config['strip_repeated_lines'] = repeated_section['enabled']
+    for key in ('ratio', 'min_pages', 'zone'):
+        if key in repeated_section:
+            config[f'repeated_line_{key}'] = repeated_section[key]
+    if ocr_section.get('watermark_patterns'):
+        config['watermark_patterns'] = list(ocr_section['watermark_patterns'])
+    if 'enabled' in preprocess_section:
+        config['preprocess'] = preprocess_section.pop('enabled')
+        config['preprocess_options'] = preprocess_section
+    
+    return config
+
+
 def extract_text_from_file(file, engine: str = "tesseract") -> str:
     """
     Convenience function to extract text from file
@@ -0,0 +1,407 @@
+"""
+Rate Limiter Module
+Process-wide token-bucket scheduler that keeps Groq calls within each
+model's requests-per-minute and tokens-per-minute limits
+"""
+
+import asyncio
+import re
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional, Mapping
+
+
+# Groq free-tier limits; override per deployment through configure()
+DEFAULT_MODEL_LIMITS = {
+    'llama-3.1-8b-instant': {'rpm': 30, 'tpm': 6000},
+    'llama-3.3-70b-versatile': {'rpm': 30, 'tpm': 12000},
+}
+FALLBACK_LIMITS = {'rpm': 30, 'tpm': 6000}
+
+DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+
+
+def parse_duration(value: Any) -> Optional[float]:
+    """
+    Parse a rate-limit reset value into seconds
+    
+    Accepts plain seconds ('7', '0.5') and Groq-style durations ('2m59.56s', '120ms').
+    
+    Returns:
+        Seconds, or None if the value cannot be parsed
+    """
+    if value is None:
+        return None
+    text = str(value).strip()
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    
+    parts = DURATION_PART.findall(text)
+    if not parts:
+        return None
+    scale = {'h': 3600.0, 'm': 60.0, 's': 1.0, 'ms': 0.001}
+    return sum(float(amount) * scale[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    """
+    Continuously refilling budget
+    
+    The level may go negative when a request turns out to have used more
+    than was reserved; the debt is repaid by later refills.
+    """
+    
+    def __init__(self, capacity: float, period_seconds: float = 60.0):
+        """
+        Initialize Token Bucket
+        
+        Args:
+            capacity: Budget available per period (and maximum burst)
+            period_seconds: Time to refill from empty to full
+        """
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period_seconds
+        self.level = self.capacity
+        self.updated_at = time.monotonic()
+    
+    def refill(self, now: float):
+        """Add the budget accrued since the last update"""
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+    
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` is available (0 if it already is)"""
+        deficit = min(amount, self.capacity) - self.level
+        return deficit / self.rate if deficit > 0 else 0.0
+    
+    def take(self, amount: float):
+        """Spend budget"""
+        self.level -= amount
+    
+    def resize(self, capacity: float, period_seconds: float = 60.0):
+        """Change the capacity, keeping the current level (clamped to the new capacity)"""
+        self.refill(time.monotonic())
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period_seconds
+        self.level = min(self.level, self.capacity)
+
+
+class _Ticket:
+    """A queued request waiting for budget"""
+    
+    __slots__ = ('session_id', 'tokens', 'enqueued_at')
+    
+    def __init__(self, session_id: str, tokens: int):
+        self.session_id = session_id
+        self.tokens = tokens
+        self.enqueued_at = time.monotonic()
+
+
+class _ModelState:
+    """Buckets, fair queue and metrics for one model"""
+    
+    def __init__(self, rpm: int, tpm: int):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.blocked_until = 0.0
+        # Daily request quota last reported by the server (None until seen)
+        self.requests_remaining_today: Optional[float] = None
+        # Round-robin over sessions, FIFO within a session
+        self.sessions: deque = deque()
+        self.queues: Dict[str, deque] = {}
+        
+        self.granted = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+    
+    def queue_depth(self) -> int:
+        return sum(len(queue) for queue in self.queues.values())
+    
+    def head(self) -> Optional[_Ticket]:
+        """Next ticket in fair order"""
+        if not self.sessions:
+            return None
+        return self.queues[self.sessions[0]][0]
+    
+    def enqueue(self, ticket: _Ticket):
+        if ticket.session_id not in self.queues:
+            self.queues[ticket.session_id] = deque()
+            self.sessions.append(ticket.session_id)
+        self.queues[ticket.session_id].append(ticket)
+    
+    def dequeue_head(self):
+        """Remove the head ticket and move its session to the back of the rotation"""
+        session_id = self.sessions.popleft()
+        queue = self.queues[session_id]
+        queue.popleft()
+        if queue:
+            self.sessions.append(session_id)
+        else:
+            del self.queues[session_id]
+    
+    def remove(self, ticket: _Ticket):
+        """Drop a ticket whose caller gave up (e.g. a cancelled task)"""
+        queue = self.queues.get(ticket.session_id)
+        if queue is None or ticket not in queue:
+            return
+        queue.remove(ticket)
+        if not queue:
+            del self.queues[ticket.session_id]
+            self.sessions.remove(ticket.session_id)
+
+
+class RateLimiter:
+    """
+    Process-wide request scheduler for rate-limited model APIs
+    
+    Each model has a requests-per-minute and a tokens-per-minute bucket.
+    Callers reserve one request plus an estimate of the tokens they will use
+    and are admitted in fair order: sessions take turns, and requests within
+    a session keep their order. Server rate-limit headers and 429 responses
+    tighten the local budgets so the scheduler never outruns the server.
+    """
+    
+    def __init__(self, limits: Optional[Dict[str, Dict[str, int]]] = None):
+        """
+        Initialize Rate Limiter
+        
+        Args:
+            limits: Per-model {'rpm': ..., 'tpm': ...}; merged over DEFAULT_MODEL_LIMITS
+        """
+        self._limits = {**DEFAULT_MODEL_LIMITS, **(limits or {})}
+        self._models: Dict[str, _ModelState] = {}
+        self._condition = threading.Condition()
+    
+    def configure(self, model: str, rpm: Optional[int] = None, tpm: Optional[int] = None):
+        """
+        Set the limits for a model
+        
+        Reconfiguring with the same limits is a no-op, and changed limits keep
+        the budget already spent, so engines created later cannot refill the
+        shared buckets.
+        
+        Args:
+            model: Model name
+            rpm: Requests per minute
+            tpm: Tokens per minute
+        """
+        with self._condition:
+            previous = self._limits.get(model, FALLBACK_LIMITS)
+            current = dict(previous)
+            if rpm:
+                current['rpm'] = int(rpm)
+            if tpm:
+                current['tpm'] = int(tpm)
+            if current == previous and model in self._limits:
+                return
+            self._limits[model] = current
+            
+            state = self._models.get(model)
+            if state is not None:
+                state.requests.resize(current['rpm'])
+                state.tokens.resize(current['tpm'])
+            self._condition.notify_all()
+    
+    def _state(self, model: str) -> _ModelState:
+        """Get or create a model's state; caller holds the lock"""
+        if model not in self._models:
+            limits = self._limits.get(model, FALLBACK_LIMITS)
+            self._models[model] = _ModelState(limits['rpm'], limits['tpm'])
+        return self._models[model]
+    
+    def _try_grant(self, model: str, ticket: _Ticket) -> float:
+        """
+        Admit the ticket if it is next in line and budget is available
+        
+        Returns:
+            0 if granted, otherwise the suggested wait in seconds
+        """
+        state = self._state(model)
+        now = time.monotonic()
+        if state.blocked_until > now:
+            return state.blocked_until - now
+        
+        state.requests.refill(now)
+        state.tokens.refill(now)
+        head = state.head()
+        wait = max(state.requests.wait_time(1), state.tokens.wait_time(head.tokens))
+        if head is not ticket:
+            # Someone else is first; wake up when they could be admitted
+            return max(wait, 0.01)
+        if wait > 0:
+            return wait
+        
+        state.requests.take(1)
+        state.tokens.take(min(ticket.tokens, state.tokens.capacity))
+        state.dequeue_head()
+        
+        waited = now - ticket.enqueued_at
+        state.granted += 1
+        state.total_wait += waited
+        state.max_wait = max(state.max_wait, waited)
+        return 0.0
+    
+    def acquire(self, model: str, tokens: int, session_id: str = "default") -> float:
+        """
+        Block until a request of the given size may be sent
+        
+        Args:
+            model: Model name
+            tokens: Estimated tokens (prompt + completion) for the request
+            session_id: Caller identity used for fair queueing
+        
+        Returns:
+            Seconds spent waiting
+        """
+        ticket = _Ticket(session_id, max(1, int(tokens)))
+        with self._condition:
+            self._state(model).enqueue(ticket)
+            try:
+                while True:
+                    wait = self._try_grant(model, ticket)
+                    if wait == 0:
+                        self._condition.notify_all()
+                        return time.monotonic() - ticket.enqueued_at
+                    self._condition.wait(timeout=wait)
+            except BaseException:
+                self._state(model).remove(ticket)
+                self._condition.notify_all()
+                raise
+    
+    async def aacquire(self, model: str, tokens: int, session_id: str = "default") -> float:
+        """Async variant of acquire() that waits without blocking the event loop"""
+        ticket = _Ticket(session_id, max(1, int(tokens)))
+        with self._condition:
+            self._state(model).enqueue(ticket)
+        try:
+            while True:
+                with self._condition:
+                    wait = self._try_grant(model, ticket)
+                    if wait == 0:
+                        self._condition.notify_all()
+                        return time.monotonic() - ticket.enqueued_at
+                # Re-check periodically: other callers may be admitted in between
+                await asyncio.sleep(min(wait, 0.25))
+        except BaseException:
+            with self._condition:
+                self._state(model).remove(ticket)
+                self._condition.notify_all()
+            raise
+    
+    def record_usage(self, model: str, reserved_tokens: int, used_tokens: Optional[int]):
+        """
+        Reconcile a reservation with the tokens the server reports as used
+        
+        Args:
+            model: Model name
+            reserved_tokens: Tokens passed to acquire()
+            used_tokens: Actual total tokens, if known
+        """
+        if used_tokens is None:
+            return
+        with self._condition:
+            state = self._state(model)
+            state.tokens.refill(time.monotonic())
+            state.tokens.level = min(
+                state.tokens.capacity, state.tokens.level + reserved_tokens - used_tokens
+            )
+            self._condition.notify_all()
+    
+    def observe_headers(self, model: str, headers: Optional[Mapping[str, str]], throttled: bool = False):
+        """
+        Align local budgets with the server's rate-limit headers
+        
+        Handles retry-after and Groq's x-ratelimit-remaining-* and
+        x-ratelimit-reset-* headers. Groq's token headers count tokens per
+        minute and tighten the TPM bucket; its request headers count
+        requests per *day*, so they are tracked separately and only pause
+        the model once the daily quota is spent.
+        
+        Args:
+            model: Model name
+            headers: Response headers (case-insensitive mapping or dict)
+            throttled: The response was a 429
+        """
+        headers = {str(k).lower(): v for k, v in (headers or {}).items()}
+        with self._condition:
+            state = self._state(model)
+            now = time.monotonic()
+            state.requests.refill(now)
+            state.tokens.refill(now)
+            
+            for kind in ('requests', 'tokens'):
+                remaining = headers.get(f'x-ratelimit-remaining-{kind}')
+                try:
+                    remaining = float(remaining) if remaining is not None else None
+                except ValueError:
+                    remaining = None
+                if remaining is None:
+                    continue
+                if kind == 'tokens':
+                    state.tokens.level = min(state.tokens.level, remaining)
+                else:
+                    state.requests_remaining_today = remaining
+                if remaining < 1:
+                    reset = parse_duration(headers.get(f'x-ratelimit-reset-{kind}'))
+                    if reset:
+                        state.blocked_until = max(state.blocked_until, now + reset)
+            
+            if throttled:
+                state.throttled += 1
+                retry_after = parse_duration(headers.get('retry-after'))
+                # Without a hint, pause long enough for one request to refill
+                pause = retry_after if retry_after is not None else 1.0 / state.requests.rate
+                state.blocked_until = max(state.blocked_until, now + pause)
+            self._condition.notify_all()
+    
+    def observe_error(self, model: str, error: Exception):
+        """Feed a failed call's HTTP response (if any) into the limiter"""
+        response = getattr(error, 'response', None)
+        status = getattr(error, 'status_code', None) or getattr(response, 'status_code', None)
+        headers = getattr(response, 'headers', None)
+        if status == 429 or headers is not None:
+            self.observe_headers(model, headers, throttled=status == 429)
+    
+    def get_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get scheduler metrics per model
+        
+        Returns:
+            Dictionary of model name to queue depth, wait times, throttling
+            counts and remaining budgets
+        """
+        with self._condition:
+            now = time.monotonic()
+            stats = {}
+            for model, state in self._models.items():
+                state.requests.refill(now)
+                state.tokens.refill(now)
+                stats[model] = {
+                    'queue_depth': state.queue_depth(),
+                    'granted': state.granted,
+                    'throttled': state.throttled,
+                    'avg_wait_seconds': state.total_wait / state.granted if state.granted else 0.0,
+                    'max_wait_seconds': state.max_wait,
+                    'blocked_for_seconds': max(0.0, state.blocked_until - now),
+                    'requests_available': state.requests.level,
+                    'requests_remaining_today': state.requests_remaining_today,
+                    'tokens_available': state.tokens.level
+                }
+            return stats
+
+
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter shared by all engines and sessions"""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter()
+        return _rate_limiter
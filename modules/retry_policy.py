@@ -0,0 +1,246 @@
+"""
+Retry Policy Module
+One bounded retry and deadline budget per generation job, shared by every
+model call the job makes
+"""
+
+import asyncio
+import json
+import threading
+import time
+from typing import Dict, Any, List, Optional, Callable, Awaitable, TypeVar
+
+
+T = TypeVar('T')
+
+# Error classes
+RATE_LIMITED = 'rate_limited'
+TIMEOUT = 'timeout'
+TRANSIENT = 'transient'
+MALFORMED = 'malformed'
+FATAL = 'fatal'
+
+RETRYABLE = {RATE_LIMITED, TIMEOUT, TRANSIENT, MALFORMED}
+
+
+class RetryBudgetExceeded(Exception):
+    """Raised when a job runs out of retries or time"""
+    
+    def __init__(self, message: str, last_error: Optional[Exception] = None):
+        if last_error is not None:
+            message = f"{message}; last error: {type(last_error).__name__}: {last_error}"
+        super().__init__(message)
+        self.last_error = last_error
+
+
+def classify_error(error: Exception) -> str:
+    """
+    Classify a model-call failure
+    
+    Uses the HTTP status and exception names rather than importing SDK
+    exception types, so it works for groq, openai and httpx errors alike.
+    
+    Args:
+        error: Exception raised by the call or by parsing its response
+    
+    Returns:
+        One of 'rate_limited', 'timeout', 'transient', 'malformed', 'fatal'
+    """
+    if isinstance(error, RetryBudgetExceeded):
+        return FATAL
+    
+    response = getattr(error, 'response', None)
+    status = getattr(error, 'status_code', None) or getattr(response, 'status_code', None)
+    name = type(error).__name__
+    
+    if status == 429 or name == 'RateLimitError':
+        return RATE_LIMITED
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)) or 'Timeout' in name:
+        return TIMEOUT
+    if isinstance(status, int):
+        # 408/409 and server errors are worth another try; other 4xx are not
+        return TRANSIENT if status >= 500 or status in (408, 409) else FATAL
+    if 'Connection' in name or isinstance(error, ConnectionError):
+        return TRANSIENT
+    # A bad sample (invalid JSON, wrong shape) may succeed when re-sampled
+    if isinstance(error, (json.JSONDecodeError, ValueError, KeyError, TypeError)):
+        return MALFORMED
+    return FATAL
+
+
+class RetryPolicy:
+    """
+    Retry settings for a generation job
+    
+    Each job gets a RetryBudget from start(). All calls in the job draw
+    from that budget, so retries add up across the job instead of
+    multiplying through nested layers.
+    """
+    
+    def __init__(
+        self,
+        max_retries: int = 4,
+        deadline_seconds: float = 180.0,
+        call_timeout_seconds: float = 60.0,
+        backoff_base_seconds: float = 1.0,
+        backoff_max_seconds: float = 10.0
+    ):
+        """
+        Initialize Retry Policy
+        
+        Args:
+            max_retries: Retries allowed across the whole job (first attempts are free)
+            deadline_seconds: Wall-clock limit for the whole job
+            call_timeout_seconds: Limit for a single model call
+            backoff_base_seconds: First retry delay; doubles per retry of the same call
+            backoff_max_seconds: Upper bound for a single retry delay
+        """
+        self.max_retries = max(0, int(max_retries))
+        self.deadline_seconds = float(deadline_seconds)
+        self.call_timeout_seconds = float(call_timeout_seconds)
+        self.backoff_base_seconds = float(backoff_base_seconds)
+        self.backoff_max_seconds = float(backoff_max_seconds)
+    
+    @classmethod
+    def from_config(cls, retry_section: Optional[Dict[str, Any]]) -> "RetryPolicy":
+        """Build a policy from the `llm.retry` section of config.yaml"""
+        section = retry_section or {}
+        keys = ('max_retries', 'deadline_seconds', 'call_timeout_seconds',
+                'backoff_base_seconds', 'backoff_max_seconds')
+        return cls(**{key: section[key] for key in keys if key in section})
+    
+    def start(self) -> "RetryBudget":
+        """Begin a job"""
+        return RetryBudget(self)
+
+
+class RetryBudget:
+    """Attempts, deadline and error log for one job"""
+    
+    def __init__(self, policy: RetryPolicy):
+        self.policy = policy
+        self.started_at = time.monotonic()
+        self.deadline = self.started_at + policy.deadline_seconds
+        self.calls = 0
+        self.retries = 0
+        self.errors: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+    
+    def remaining_seconds(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+    
+    def call_timeout(self) -> float:
+        """Timeout for the next call: the per-call limit, capped by the deadline"""
+        return min(self.policy.call_timeout_seconds, self.remaining_seconds())
+    
+    def start_attempt(self, attempt: int, last_error: Optional[Exception]):
+        """
+        Charge an attempt against the budget, raising if none is left
+        
+        run() and arun() call this for every attempt; callers that cannot
+        wrap their work in a function (e.g. consuming a stream) call it and
+        record_failure() directly.
+        """
+        with self._lock:
+            if self.remaining_seconds() <= 0:
+                raise RetryBudgetExceeded(
+                    f"Deadline of {self.policy.deadline_seconds:.0f}s exceeded", last_error
+                )
+            if attempt > 0:
+                if self.retries >= self.policy.max_retries:
+                    raise RetryBudgetExceeded(
+                        f"Retry budget of {self.policy.max_retries} exhausted", last_error
+                    )
+                self.retries += 1
+            self.calls += 1
+    
+    def record_failure(
+        self, error: Exception, attempt: int, label: str, retry_malformed: bool = True
+    ) -> float:
+        """
+        Record a failure and decide what to do next
+        
+        Args:
+            error: The failure
+            attempt: Zero-based attempt number of the call
+            label: Name used in logs and the error record
+            retry_malformed: Re-sample responses that could not be parsed
+        
+        Returns:
+            Delay before the next attempt
+        
+        Raises:
+            The original error if it is not retryable, or RetryBudgetExceeded
+            if no retry or time is left (without waiting out the backoff)
+        """
+        kind = classify_error(error)
+        with self._lock:
+            self.errors.append({
+                'call': label,
+                'attempt': attempt + 1,
+                'kind': kind,
+                'error': f"{type(error).__name__}: {error}"[:300]
+            })
+        print(f"{label} attempt {attempt + 1} failed ({kind}): {error}")
+        if kind not in RETRYABLE or (kind == MALFORMED and not retry_malformed):
+            raise error
+        with self._lock:
+            if self.retries >= self.policy.max_retries:
+                raise RetryBudgetExceeded(f"Retry budget of {self.policy.max_retries} exhausted", error)
+        if self.remaining_seconds() <= 0:
+            raise RetryBudgetExceeded(f"Deadline of {self.policy.deadline_seconds:.0f}s exceeded", error)
+        if kind == RATE_LIMITED:
+            # The rate limiter already holds the next request until the server allows it
+            return 0.0
+        delay = min(self.policy.backoff_max_seconds, self.policy.backoff_base_seconds * (2 ** attempt))
+        return min(delay, self.remaining_seconds())
+    
+    def run(self, func: Callable[[float], T], label: str = "LLM call", retry_malformed: bool = True) -> T:
+        """
+        Run a call with retries drawn from this budget
+        
+        Args:
+            func: Called with the timeout (seconds) for this attempt
+            label: Name used in logs and the error record
+            retry_malformed: Retry when func raises a parse error; when False
+                the parse error is raised to the caller at once
+        
+        Returns:
+            The call's result
+        """
+        attempt = 0
+        last_error = None
+        while True:
+            self.start_attempt(attempt, last_error)
+            try:
+                return func(self.call_timeout())
+            except Exception as e:
+                last_error = e
+                time.sleep(self.record_failure(e, attempt, label, retry_malformed))
+            attempt += 1
+    
+    async def arun(
+        self, func: Callable[[float], Awaitable[T]], label: str = "LLM call", retry_malformed: bool = True
+    ) -> T:
+        """Async variant of run(); each attempt is cancelled at its timeout"""
+        attempt = 0
+        last_error = None
+        while True:
+            self.start_attempt(attempt, last_error)
+            try:
+                timeout = self.call_timeout()
+                return await asyncio.wait_for(func(timeout), timeout=timeout)
+            except Exception as e:
+                last_error = e
+                await asyncio.sleep(self.record_failure(e, attempt, label, retry_malformed))
+            attempt += 1
+    
+    def summary(self) -> Dict[str, Any]:
+        """Calls, retries, elapsed time and recorded errors for the job"""
+        return {
+            'calls': self.calls,
+            'retries': self.retries,
+            'max_retries': self.policy.max_retries,
+            'elapsed_seconds': round(time.monotonic() - self.started_at, 2),
+            'errors': list(self.errors)
+        }
@@ -0,0 +1,225 @@
+"""
+Syllabus Index Module
+Chunked TF-IDF vector index over a syllabus for selecting prompt context
+"""
+
+import math
+import re
+from collections import Counter
+from typing import List, Dict, Any, Tuple
+
+import numpy as np
+
+
+CHARS_PER_TOKEN = 4
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#]*')
+UNIT_HEADING = re.compile(r'^\s*(?:unit|module|chapter|section|part)\s*[-:]?\s*([0-9ivxlc]+)\b', re.IGNORECASE)
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'into', 'is', 'it',
+    'its', 'of', 'on', 'or', 'the', 'to', 'with', 'their', 'this', 'that', 'using', 'use',
+    'introduction', 'unit', 'module', 'chapter', 'hours', 'hrs',
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS and len(token) > 1]
+
+
+class SyllabusIndex:
+    """
+    TF-IDF index over syllabus chunks
+    
+    The syllabus is split into chunks that never cross a unit/module
+    heading, each chunk is embedded as an L2-normalized TF-IDF vector, and
+    topics are matched by cosine similarity. select_context() assembles the
+    best chunks for a set of topics within a token budget.
+    """
+    
+    def __init__(self, syllabus_text: str, chunk_chars: int = 600):
+        """
+        Initialize Syllabus Index
+        
+        Args:
+            syllabus_text: Syllabus text
+            chunk_chars: Target chunk size in characters
+        """
+        self.chunk_chars = max(100, chunk_chars)
+        self.chunks = self._split(syllabus_text)
+        self.vocabulary: Dict[str, int] = {}
+        self.idf = np.zeros(0, dtype=np.float32)
+        self.matrix = self._build_matrix([chunk['text'] for chunk in self.chunks])
+    
+    def _split(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Split text into chunks of about chunk_chars, breaking at unit headings and lines
+        
+        Returns:
+            List of chunk dictionaries ('text', 'unit', 'position')
+        """
+        chunks = []
+        current: List[str] = []
+        current_len = 0
+        unit = None
+        
+        def flush():
+            nonlocal current, current_len
+            if current:
+                chunks.append({'text': "\n".join(current).strip(), 'unit': unit, 'position': len(chunks)})
+            current, current_len = [], 0
+        
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            heading = UNIT_HEADING.match(line)
+            if heading:
+                flush()
+                unit = line.strip()
+            # Very long lines (e.g. OCR output without breaks) are split at sentence boundaries
+            pieces = [line] if len(line) <= self.chunk_chars else re.split(r'(?<=[.;])\s+', line)
+            for piece in pieces:
+                if current and current_len + len(piece) > self.chunk_chars:
+                    flush()
+                current.append(piece)
+                current_len += len(piece) + 1
+        flush()
+        
+        return [chunk for chunk in chunks if chunk['text']]
+    
+    def _build_matrix(self, texts: List[str]) -> "np.ndarray":
+        """Build the (chunks x vocabulary) TF-IDF matrix"""
+        counts = [Counter(tokenize(text)) for text in texts]
+        for chunk_counts in counts:
+            for token in chunk_counts:
+                self.vocabulary.setdefault(token, len(self.vocabulary))
+        
+        matrix = np.zeros((len(texts), len(self.vocabulary)), dtype=np.float32)
+        for row, chunk_counts in enumerate(counts):
+            for token, count in chunk_counts.items():
+                # Sublinear term frequency
+                matrix[row, self.vocabulary[token]] = 1.0 + math.log(count)
+        
+        document_frequency = np.count_nonzero(matrix, axis=0)
+        self.idf = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1.0).astype(np.float32)
+        matrix *= self.idf
+        return self._normalize(matrix)
+    
+    @staticmethod
+    def _normalize(matrix: "np.ndarray") -> "np.ndarray":
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+    
+    def _embed(self, query: str) -> "np.ndarray":
+        """TF-IDF vector of a query in the index vocabulary"""
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for token, count in Counter(tokenize(query)).items():
+            index = self.vocabulary.get(token)
+            if index is not None:
+                vector[index] = (1.0 + math.log(count)) * self.idf[index]
+        return self._normalize(vector)
+    
+    def search(self, query: str, top_k: int = 3) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Find the chunks most similar to a query
+        
+        Args:
+            query: Topic name or free text
+            top_k: Number of chunks to return
+        
+        Returns:
+            List of (cosine similarity, chunk) pairs, best first
+        """
+        if not self.chunks:
+            return []
+        scores = self.matrix @ self._embed(query)
+        best = np.argsort(-scores)[:top_k]
+        return [(float(scores[i]), self.chunks[i]) for i in best if scores[i] > 0]
+    
+    def select_context(self, topics: List[str], token_budget: int = 600) -> str:
+        """
+        Assemble syllabus context for a set of topics within a token budget
+        
+        Each topic's best chunk is taken first (round robin over topics) so
+        every topic is represented; remaining budget goes to the chunks with
+        the highest similarity to any topic. Selected chunks are returned in
+        syllabus order, labelled with their unit heading.
+        
+        Args:
+            topics: Topic names
+            token_budget: Approximate maximum tokens of context
+        
+        Returns:
+            Context text
+        """
+        if not self.chunks:
+            return ""
+        
+        char_budget = token_budget * CHARS_PER_TOKEN
+        total_chars = sum(len(chunk['text']) for chunk in self.chunks)
+        queries = [topic for topic in topics if topic and topic.strip()]
+        if total_chars <= char_budget or not queries:
+            selected = self._fill(list(range(len(self.chunks))), char_budget)
+            return self._render(selected)
+        
+        # (topics x chunks) similarity
+        scores = np.stack([self.matrix @ self._embed(query) for query in queries])
+        best_score = scores.max(axis=0)
+        
+        # Each topic's best chunk first, then everything else by its best similarity
+        order: List[int] = []
+        for row in scores:
+            best = int(np.argmax(row))
+            if row[best] > 0 and best not in order:
+                order.append(best)
+        order.extend(int(i) for i in np.argsort(-best_score) if best_score[i] > 0 and int(i) not in order)
+        
+        if not order:
+            order = list(range(len(self.chunks)))
+        return self._render(self._fill(order, char_budget))
+    
+    def _fill(self, order: List[int], char_budget: int) -> List[Tuple[int, str]]:
+        """
+        Take chunks in priority order while they fit the budget
+        
+        Returns:
+            (chunk index, text) pairs in syllabus order
+        """
+        selected = []
+        used = 0
+        for index in order:
+            text = self.chunks[index]['text']
+            if used + len(text) > char_budget:
+                if not selected:
+                    # Always return at least the best chunk, cut to the budget
+                    selected.append((index, self._truncate(text, char_budget)))
+                    used = char_budget
+                continue
+            selected.append((index, text))
+            used += len(text)
+        return sorted(selected)
+    
+    @staticmethod
+    def _truncate(text: str, char_budget: int) -> str:
+        """Cut text to the budget, at the last line or word break when there is one"""
+        if len(text) <= char_budget:
+            return text
+        cut = text[:char_budget]
+        boundary = max(cut.rfind('\n'), cut.rfind(' '))
+        if boundary > char_budget // 2:
+            cut = cut[:boundary]
+        return cut.rstrip()
+    
+    def _render(self, selected: List[Tuple[int, str]]) -> str:
+        """Join chunks in syllabus order, repeating the unit heading where it changes"""
+        parts = []
+        previous_unit = None
+        for index, text in selected:
+            chunk = self.chunks[index]
+            if chunk['unit'] and chunk['unit'] != previous_unit and not text.startswith(chunk['unit']):
+                text = f"{chunk['unit']}\n{text}"
+            previous_unit = chunk['unit']
+            parts.append(text)
+        return "\n...\n".join(parts)
@@ -0,0 +1,195 @@
+"""
+Tesseract Backend Module
+Runs Tesseract either through pytesseract (one subprocess per page) or
+through a long-lived in-process tesserocr API with language data preloaded
+"""
+
+import shlex
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    import pytesseract
+except ImportError as e:
+    print(f"Import error: {e}")
+    print("Please install: pip install pytesseract")
+
+try:
+    import tesserocr
+except ImportError:
+    # Optional: only needed for the persistent 'tesserocr' backend
+    tesserocr = None
+
+
+BACKENDS = ('pytesseract', 'tesserocr')
+AUTO = 'auto'
+
+# One initialized API per (language, config) in each process; tesserocr
+# handles are not thread-safe, so each is guarded by its own lock
+_apis: Dict[Tuple[str, str], Any] = {}
+_api_locks: Dict[Tuple[str, str], threading.Lock] = {}
+_registry_lock = threading.Lock()
+# 'auto' falling back to pytesseract is reported once per process
+_fallback_reported = False
+
+
+def default_backend() -> str:
+    """The persistent tesserocr backend when it is installed, else pytesseract"""
+    return 'tesserocr' if tesserocr is not None else 'pytesseract'
+
+
+def resolve_backend(backend: Optional[str] = AUTO) -> str:
+    """
+    Validate a backend name, falling back to pytesseract if tesserocr is missing
+    
+    Args:
+        backend: Requested backend ('auto', 'pytesseract' or 'tesserocr');
+            'auto' picks tesserocr whenever it can be imported
+    
+    Returns:
+        Backend name that can actually be used in this environment
+    """
+    global _fallback_reported
+    backend = (backend or AUTO).lower()
+    if backend == AUTO:
+        resolved = default_backend()
+        if resolved == 'pytesseract' and not _fallback_reported:
+            _fallback_reported = True
+            print("Note: tesserocr not installed, OCR runs one tesseract subprocess per page. "
+                  "See 'Faster OCR with tesserocr' in the README.")
+        return resolved
+    if backend not in BACKENDS:
+        raise ValueError(f"Unsupported Tesseract backend: {backend}")
+    
+    if backend == 'tesserocr' and tesserocr is None:
+        print("Warning: tesserocr not installed, falling back to pytesseract. "
+              "Install with: pip install tesserocr")
+        return 'pytesseract'
+    return backend
+
+
+def parse_tesseract_config(tesseract_config: str) -> Dict[str, Any]:
+    """
+    Translate a pytesseract-style config string for the tesserocr API
+    
+    Supports --psm, --oem, --tessdata-dir and -c name=value options.
+    
+    Args:
+        tesseract_config: Config string such as '--psm 6 -c preserve_interword_spaces=1'
+    
+    Returns:
+        Dictionary with 'psm', 'oem', 'path' and 'variables' keys
+    """
+    options = {'psm': None, 'oem': None, 'path': None, 'variables': {}}
+    tokens = shlex.split(tesseract_config or '')
+    
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        value = tokens[i + 1] if i + 1 < len(tokens) else None
+        if token == '--psm' and value is not None:
+            options['psm'] = int(value)
+            i += 1
+        elif token == '--oem' and value is not None:
+            options['oem'] = int(value)
+            i += 1
+        elif token == '--tessdata-dir' and value is not None:
+            options['path'] = value
+            i += 1
+        elif token == '-c' and value is not None and '=' in value:
+            name, var_value = value.split('=', 1)
+            options['variables'][name] = var_value
+            i += 1
+        i += 1
+    
+    return options
+
+
+def _get_api(language: str, tesseract_config: str):
+    """Return this process's tesserocr API for the settings, creating it once"""
+    key = (language, tesseract_config)
+    with _registry_lock:
+        if key not in _apis:
+            options = parse_tesseract_config(tesseract_config)
+            kwargs = {'lang': language}
+            if options['path']:
+                kwargs['path'] = options['path']
+            if options['oem'] is not None:
+                kwargs['oem'] = tesserocr.OEM(options['oem'])
+            if options['psm'] is not None:
+                kwargs['psm'] = tesserocr.PSM(options['psm'])
+            
+            api = tesserocr.PyTessBaseAPI(**kwargs)
+            for name, value in options['variables'].items():
+                api.SetVariable(name, value)
+            
+            _apis[key] = api
+            _api_locks[key] = threading.Lock()
+        return _apis[key], _api_locks[key]
+
+
+def warm_up(backend: str, language: str, tesseract_config: str, tesseract_cmd: Optional[str] = None):
+    """
+    Prepare a process for OCR; used as the process pool initializer
+    
+    For tesserocr this loads the language data once so every later page
+    in the worker reuses it.
+    """
+    if tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    if backend == 'tesserocr':
+        _get_api(language, tesseract_config)
+
+
+def image_to_string(image, backend: str, language: str, tesseract_config: str) -> str:
+    """
+    OCR an in-memory image with the selected backend
+    
+    Args:
+        image: PIL image
+        backend: 'pytesseract' or 'tesserocr'
+        language: Tesseract language code
+        tesseract_config: pytesseract-style config string
+    
+    Returns:
+        Recognized text
+    """
+    if backend == 'tesserocr':
+        api, lock = _get_api(language, tesseract_config)
+        with lock:
+            api.SetImage(image)
+            return api.GetUTF8Text()
+    
+    return pytesseract.image_to_string(image, config=tesseract_config, lang=language)
+
+
+def image_to_tsv(image, backend: str, language: str, tesseract_config: str) -> str:
+    """
+    OCR an in-memory image and return Tesseract's TSV layout output
+    
+    Args:
+        image: PIL image
+        backend: 'pytesseract' or 'tesserocr'
+        language: Tesseract language code
+        tesseract_config: pytesseract-style config string
+    
+    Returns:
+        TSV text with one row per page/block/paragraph/line/word
+    """
+    if backend == 'tesserocr':
+        api, lock = _get_api(language, tesseract_config)
+        with lock:
+            api.SetImage(image)
+            api.Recognize()
+            return api.GetTSVText(0)
+    
+    return pytesseract.image_to_data(image, config=tesseract_config, lang=language)
+
+
+def shutdown():
+    """Release all tesserocr APIs held by this process"""
+    with _registry_lock:
+        for api in _apis.values():
+            api.End()
+        _apis.clear()
+        _api_locks.clear()
@@ -0,0 +1,124 @@
+"""
+Text Cleaner Module
+Single-pass, line-streaming cleanup of OCR text (watermarks, page furniture, whitespace)
+"""
+
+import re
+from typing import List, Iterable, Iterator, Optional
+
+
+DEFAULT_WATERMARK_PATTERNS = [
+    r'copyright\s*©?\s*\d{4}',
+    r'confidential',
+    r'draft',
+    r'watermark',
+    r'private\s+and\s+confidential',
+    r'internal\s+use\s+only',
+    r'do\s+not\s+copy',
+]
+
+# Header/footer furniture removed inline, wherever it appears on a line
+PAGE_FURNITURE_PATTERNS = [
+    r'page\s+\d+\s+of\s+\d+',
+]
+
+# Lines consisting only of a page number are dropped entirely
+PAGE_NUMBER_LINE = re.compile(r'^\s*\d+\s*$')
+MULTIPLE_SPACES = re.compile(r' +')
+LEADING_INLINE_FLAGS = re.compile(r'^\(\?[aiLmsux]+\)')
+
+
+class TextCleaner:
+    """
+    Compiled text-cleaning engine
+    
+    All removal rules are combined into one case-insensitive alternation
+    compiled once, and text is processed line by line, so each line is
+    scanned a single time regardless of how many rules are configured.
+    """
+    
+    def __init__(self, watermark_patterns: Optional[List[str]] = None):
+        """
+        Initialize Text Cleaner
+        
+        Args:
+            watermark_patterns: Regex patterns to remove; added to the defaults
+                (e.g. the `ocr.watermark_patterns` list from config.yaml)
+        """
+        patterns = list(DEFAULT_WATERMARK_PATTERNS)
+        for pattern in watermark_patterns or []:
+            pattern = LEADING_INLINE_FLAGS.sub('', pattern)
+            if pattern not in patterns:
+                patterns.append(pattern)
+        self.watermark_patterns = patterns
+        
+        self._watermark_scanner = self._compile(self.watermark_patterns)
+        self._full_scanner = self._compile(self.watermark_patterns + PAGE_FURNITURE_PATTERNS)
+    
+    @staticmethod
+    def _compile(patterns: List[str]) -> "re.Pattern":
+        """Combine patterns into one alternation; longer patterns are tried first"""
+        ordered = sorted(patterns, key=len, reverse=True)
+        return re.compile("|".join(f"(?:{pattern})" for pattern in ordered), re.IGNORECASE)
+    
+    def clean_lines(
+        self,
+        lines: Iterable[str],
+        remove_page_furniture: bool = True,
+        ascii_only: bool = True
+    ) -> Iterator[str]:
+        """
+        Clean a stream of lines
+        
+        Blank runs are collapsed to a single empty line, and leading and
+        trailing blank lines are dropped.
+        
+        Args:
+            lines: Input lines (with or without trailing newlines)
+            remove_page_furniture: Also drop page numbers and "page X of Y" markers
+            ascii_only: Strip non-ASCII characters
+        
+        Yields:
+            Cleaned lines without trailing newlines
+        """
+        scanner = self._full_scanner if remove_page_furniture else self._watermark_scanner
+        pending_blank = False
+        emitted = False
+        
+        for line in lines:
+            line = scanner.sub('', line.rstrip('\r\n'))
+            if ascii_only:
+                line = line.encode('ascii', 'ignore').decode('ascii')
+            line = MULTIPLE_SPACES.sub(' ', line)
+            
+            if not line.strip() or (remove_page_furniture and PAGE_NUMBER_LINE.match(line)):
+                pending_blank = emitted
+                continue
+            
+            if pending_blank:
+                yield ''
+                pending_blank = False
+            emitted = True
+            yield line
+    
+    def clean(
+        self,
+        text: str,
+        remove_page_furniture: bool = True,
+        ascii_only: bool = True
+    ) -> str:
+        """
+        Clean a full document
+        
+        Args:
+            text: Input text
+            remove_page_furniture: Also drop page numbers and "page X of Y" markers
+            ascii_only: Strip non-ASCII characters
+        
+        Returns:
+            Cleaned text
+        """
+        cleaned = "\n".join(self.clean_lines(
+            text.splitlines(), remove_page_furniture=remove_page_furniture, ascii_only=ascii_only
+        ))
+        return cleaned.strip()
@@ -5,20 +5,34 @@ Handles syllabus upload, OCR processing, and storage
 
 import streamlit as st
 from pathlib import Path
+import json
 import time
+import os
 import sys
 from datetime import datetime
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from modules.ocr_processor import OCRProcessor
+from modules.ocr_processor import OCRProcessor, load_ocr_config
 from modules.pattern_discovery import PatternDiscovery
 from modules.priority_calculator import PriorityCalculator
 from utils.chromadb_handler import ChromaDBHandler
 
 st.set_page_config(page_title="Upload Syllabus", page_icon="📤", layout="wide")
 
+
+@st.cache_resource(show_spinner=False)
+def get_ocr_processor(engine: str, config_json: str) -> OCRProcessor:
+    """
+    Shared OCR processor per engine and settings
+    
+    Cached across reruns and sessions so its worker pool (and the
+    Tesseract instances loaded in it) outlives a single upload.
+    """
+    return OCRProcessor(engine=engine, config=json.loads(config_json))
+
+
 st.title("📤 Upload & Process Syllabus")
 st.markdown("Upload your syllabus to begin the question paper generation process.")
 
@@ -33,16 +47,30 @@ with col1:
     st.subheader("📄 Upload Syllabus Document")
     
     # File uploader
-    uploaded_file = st.file_uploader(
+    uploaded_files = st.file_uploader(
         "Choose a PDF or Image file",
-        type=["pdf", "png", "jpg", "jpeg"],
-        help="Supported formats: PDF, PNG, JPG, JPEG (Max size: 50MB)"
+        type=["pdf", "png", "jpg", "jpeg", "tif", "tiff"],
+        accept_multiple_files=True,
+        help="Supported formats: PDF, PNG, JPG, JPEG, TIFF (Max size: 50MB). "
+             "Select several images to process photos of one paper as a single document."
     )
     
-    if uploaded_file:
+    if uploaded_files:
+        uploaded_file = uploaded_files[0]
+        if len(uploaded_files) > 1 and any(f.type == 'application/pdf' for f in uploaded_files):
+            st.error("❌ Upload a single PDF, or one or more images of the same document.")
+            st.stop()
+        
+        # Several images are OCRed as the pages of one document, in upload order
+        ocr_input = uploaded_files if len(uploaded_files) > 1 else uploaded_file
+        upload_name = uploaded_file.name
+        if len(uploaded_files) > 1:
+            upload_name = f"{uploaded_file.name} (+{len(uploaded_files) - 1} images)"
+        upload_size = sum(f.size for f in uploaded_files)
+        
         # Display file info
-        file_size_mb = uploaded_file.size / (1024 * 1024)
-        st.success(f"✅ File uploaded: **{uploaded_file.name}** ({file_size_mb:.2f} MB)")
+        file_size_mb = upload_size / (1024 * 1024)
+        st.success(f"✅ File uploaded: **{upload_name}** ({file_size_mb:.2f} MB)")
         
         # Processing options
         st.markdown("### ⚙️ Processing Options")
@@ -62,6 +90,15 @@ with col1:
                 value=True,
                 help="Apply regex-based watermark removal"
             )
+            
+            ocr_config = load_ocr_config()
+            ocr_workers = st.number_input(
+                "OCR Workers",
+                min_value=1,
+                max_value=max(1, os.cpu_count() or 1),
+                value=min(int(ocr_config.get('workers', 1)), max(1, os.cpu_count() or 1)),
+                help="Number of pages OCRed in parallel (scanned PDFs and multi-page images)"
+            )
         
         with col_b:
             analyze_patterns = st.checkbox(
@@ -75,6 +112,12 @@ with col1:
                 value=True,
                 help="Compute priority scores for topics"
             )
+            
+            preprocess_images = st.checkbox(
+                "Preprocess Scans",
+                value=bool(ocr_config.get('preprocess', False)),
+                help="Grayscale, downscale, binarize, deskew and crop pages before OCR"
+            )
         
         st.markdown("---")
         
@@ -93,8 +136,17 @@ with col1:
                     progress_bar.progress(10)
                     time.sleep(0.5)
                     
-                    ocr_processor = OCRProcessor(engine=ocr_engine)
-                    extracted_text = ocr_processor.extract_text(uploaded_file)
+                    ocr_processor = get_ocr_processor(
+                        ocr_engine,
+                        json.dumps({
+                            **ocr_config,
+                            'workers': int(ocr_workers),
+                            'preprocess': preprocess_images
+                        }, sort_keys=True)
+                    )
+                    extracted_text = ocr_processor.extract_text(ocr_input)
+                    # The processor is shared; keep this run's stats before another session runs
+                    ocr_stats = dict(ocr_processor.last_run_stats)
                     
                     if not extracted_text or len(extracted_text) < 50:
                         st.error("❌ Failed to extract text. Please check if the file is readable.")
@@ -145,9 +197,9 @@ with col1:
                         doc_id = db_handler.store_syllabus(
                             cleaned_text,
                             metadata={
-                                "filename": uploaded_file.name,
+                                "filename": upload_name,
                                 "upload_date": datetime.now().isoformat(),
-                                "file_size": uploaded_file.size,
+                                "file_size": upload_size,
                                 "file_type": uploaded_file.type
                             }
                         )
@@ -181,6 +233,15 @@ with col1:
                         with col_iii:
                             st.metric("Patterns Found", len(patterns))
                         
+                        if ocr_stats.get('cache_hit'):
+                            st.caption("OCR: served from cache")
+                        elif ocr_stats.get('pages'):
+                            st.caption(
+                                f"OCR: {ocr_stats['pages']} page(s) in {ocr_stats['seconds']:.1f}s "
+                                f"({ocr_stats['pages_per_sec']:.2f} pages/sec, "
+                                f"{ocr_stats['workers']} worker(s))"
+                            )
+                        
                         # Tabs for detailed view
                         tab1, tab2, tab3 = st.tabs(["📝 Text Preview", "📊 Topics", "🔍 Patterns"])
                         
@@ -0,0 +1,50 @@
+"""
+Shared pytest fixtures
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+# Generous limits so the process-wide scheduler never delays a test
+TEST_RATE_LIMITS = {
+    'llama-3.1-8b-instant': {'rpm': 100000, 'tpm': 100000000},
+    'llama-3.3-70b-versatile': {'rpm': 100000, 'tpm': 100000000},
+}
+
+
+@pytest.fixture
+def mock_server():
+    """A local Groq-compatible server (utils.mock_groq_server)"""
+    from utils.mock_groq_server import MockGroqServer
+    
+    with MockGroqServer() as server:
+        yield server
+
+
+@pytest.fixture
+def make_engine(mock_server):
+    """Build a DualLLMEngine talking to the mock server, without response caching"""
+    pytest.importorskip("langchain_groq")
+    from modules.llm_engine import DualLLMEngine
+    from modules.retry_policy import RetryPolicy
+    
+    engines = []
+    
+    def factory(**kwargs):
+        kwargs.setdefault('cache_enabled', False)
+        kwargs.setdefault('rate_limits', TEST_RATE_LIMITS)
+        kwargs.setdefault('retry_policy', RetryPolicy(backoff_base_seconds=0.01, backoff_max_seconds=0.05))
+        kwargs.setdefault('base_url', mock_server.url)
+        engines.append(DualLLMEngine(**kwargs))
+        return engines[-1]
+    
+    yield factory
+    for engine in engines:
+        engine.close()
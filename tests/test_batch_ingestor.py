@@ -0,0 +1,108 @@
+"""
+Tests for modules.batch_ingestor
+"""
+
+import multiprocessing
+
+import pytest
+from reportlab.pdfgen import canvas
+
+from modules.batch_ingestor import BatchIngestor
+
+
+class RecordingStore:
+    """Stands in for ChromaDBHandler"""
+    
+    def __init__(self):
+        self.stored = []
+    
+    def store_syllabus(self, text, metadata=None):
+        self.stored.append(('syllabus', text, metadata))
+        return f"syllabus_{metadata['file_hash']}"
+    
+    def store_past_paper(self, text, metadata=None):
+        self.stored.append(('past_paper', text, metadata))
+        return f"past_paper_{metadata['file_hash']}"
+
+
+def write_pdf(path, lines):
+    pdf = canvas.Canvas(str(path))
+    for i, line in enumerate(lines):
+        pdf.drawString(50, 780 - 15 * i, line)
+    pdf.save()
+
+
+def make_corpus(root):
+    syllabi = root / 'syllabi'
+    papers = root / 'past_papers'
+    syllabi.mkdir()
+    papers.mkdir()
+    write_pdf(syllabi / 'ds.pdf', [
+        "Unit 1: Stacks, queues and their applications in expression evaluation",
+        "Unit 2: Binary search trees, AVL trees and tree traversals"
+    ])
+    write_pdf(papers / '2023.pdf', ["Q1. Explain stack operations with an example.", "Q2. Compare BST and AVL trees."])
+    (papers / 'notes.txt').write_text("not a supported file")
+    return syllabi, papers
+
+
+def test_ingest_stores_and_resumes(tmp_path):
+    syllabi, papers = make_corpus(tmp_path)
+    progress_file = tmp_path / 'progress.json'
+    ocr_config = {'cache_enabled': False}
+    store = RecordingStore()
+    ingestor = BatchIngestor(workers=2, progress_file=str(progress_file), ocr_config=ocr_config, db_handler=store)
+    
+    files = ingestor.discover(str(syllabi), 'syllabus') + ingestor.discover(str(papers), 'past_paper')
+    summary = ingestor.ingest(files)
+    
+    assert [path.name for path, _, _ in files] == ['ds.pdf', '2023.pdf']
+    assert (summary['files'], summary['failed'], summary['pages']) == (2, 0, 2)
+    assert sorted(kind for kind, _, _ in store.stored) == ['past_paper', 'syllabus']
+    for file_hash, entry in ingestor.progress.items():
+        assert entry['doc_id'] == f"{entry['kind']}_{file_hash}"
+    
+    # A new run with the same progress file has nothing left to do
+    resumed = BatchIngestor(progress_file=str(progress_file), ocr_config=ocr_config, db_handler=store)
+    assert resumed.discover(str(syllabi), 'syllabus') == []
+    assert resumed.discover(str(papers), 'past_paper') == []
+
+
+def test_dry_run_does_not_record_progress(tmp_path):
+    syllabi, _ = make_corpus(tmp_path)
+    progress_file = tmp_path / 'progress.json'
+    ingestor = BatchIngestor(workers=1, progress_file=str(progress_file), ocr_config={'cache_enabled': False})
+    
+    summary = ingestor.ingest(ingestor.discover(str(syllabi), 'syllabus'))
+    
+    assert summary['files'] == 1
+    assert not progress_file.exists()
+    assert len(ingestor.discover(str(syllabi), 'syllabus')) == 1
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                    reason="workers only see the failing rasterizer when forked")
+def test_failed_ocr_is_not_recorded(tmp_path, monkeypatch):
+    from modules import ocr_processor
+    
+    def broken_rasterizer(*args, **kwargs):
+        raise RuntimeError("pdftoppm crashed")
+    
+    monkeypatch.setattr(ocr_processor, 'convert_from_path', broken_rasterizer)
+    syllabi, _ = make_corpus(tmp_path)
+    # No text layer, so the page has to be rasterized
+    scanned = canvas.Canvas(str(syllabi / 'scanned.pdf'))
+    scanned.showPage()
+    scanned.save()
+    progress_file = tmp_path / 'progress.json'
+    store = RecordingStore()
+    ingestor = BatchIngestor(workers=2, progress_file=str(progress_file),
+                             ocr_config={'cache_enabled': False}, db_handler=store)
+    
+    summary = ingestor.ingest(ingestor.discover(str(syllabi), 'syllabus'))
+    
+    assert (summary['files'], summary['failed']) == (1, 1)
+    assert summary['errors'] == [f"{syllabi / 'scanned.pdf'}: no text extracted"]
+    assert [metadata['filename'] for _, _, metadata in store.stored] == ['ds.pdf']
+    # The scanned file is retried by the next run
+    assert [path.name for path, _, _ in ingestor.discover(str(syllabi), 'syllabus')] == ['scanned.pdf']
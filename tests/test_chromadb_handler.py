@@ -0,0 +1,20 @@
+"""
+Tests for utils.chromadb_handler
+"""
+
+import hashlib
+
+from utils.chromadb_handler import ChromaDBHandler
+
+
+def test_document_id_uses_file_hash():
+    file_hash = hashlib.sha256(b"scan bytes").hexdigest()
+    doc_id = ChromaDBHandler._document_id('past_paper', "Q1. Define a stack.", {'file_hash': file_hash})
+    assert doc_id == f"past_paper_{file_hash}"
+
+
+def test_document_id_hashes_text_without_file_hash():
+    text = "Unit 1: Stacks"
+    expected = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    assert ChromaDBHandler._document_id('syllabus', text, {}) == f"syllabus_{expected}"
+    assert ChromaDBHandler._document_id('syllabus', text + ".", {}) != f"syllabus_{expected}"
@@ -0,0 +1,74 @@
+"""
+Tests for utils.disk_cache
+"""
+
+import os
+import time
+
+from utils.disk_cache import DiskCache
+
+
+def age(cache, key, seconds):
+    """Pretend an entry was written and last read `seconds` ago"""
+    then = time.time() - seconds
+    os.utime(cache._path_for(key), (then, then))
+
+
+def test_round_trip_and_statistics(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    key = DiskCache.make_key('page', 'abc', 1)
+    
+    assert cache.get(key) is None
+    cache.set(key, "Unit 1: Stacks")
+    assert cache.get(key) == "Unit 1: Stacks"
+    
+    stats = cache.get_statistics()
+    assert (stats['hits'], stats['misses']) == (1, 1)
+    # The size is recovered from disk by a new instance
+    assert DiskCache(str(tmp_path)).get_statistics()['size_mb'] == stats['size_mb'] > 0
+
+
+def test_make_key_separates_parts():
+    assert DiskCache.make_key('ab', 'c') != DiskCache.make_key('a', 'bc')
+    assert DiskCache.make_key('a', 1) == DiskCache.make_key('a', '1')
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(str(tmp_path), max_size_mb=1000 / (1024 * 1024))
+    for offset, key in ((300, 'a'), (200, 'b'), (100, 'c')):
+        cache.set(key * 64, "x" * 300)
+        age(cache, key * 64, offset)
+    
+    # Reading the oldest entry makes it the most recently used
+    assert cache.get('a' * 64) is not None
+    cache.set('d' * 64, "x" * 300)
+    
+    assert cache.get('b' * 64) is None
+    assert cache.get('a' * 64) is not None
+    assert cache.get('c' * 64) is not None
+    assert cache.get('d' * 64) is not None
+    assert cache.evictions == 1
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = DiskCache(str(tmp_path), ttl_seconds=60)
+    cache.set('a' * 64, "old")
+    cache.set('b' * 64, "new")
+    age(cache, 'a' * 64, 120)
+    
+    assert cache.get('a' * 64) is None
+    assert cache.get('b' * 64) == "new"
+    assert cache.expirations == 1
+    assert not cache._path_for('a' * 64).exists()
+
+
+def test_reading_does_not_extend_ttl(tmp_path):
+    cache = DiskCache(str(tmp_path), ttl_seconds=60)
+    cache.set('a' * 64, "value")
+    age(cache, 'a' * 64, 50)
+    assert cache.get('a' * 64) == "value"
+    
+    # Written 70 seconds ago, read 20 seconds ago
+    path = cache._path_for('a' * 64)
+    os.utime(path, (time.time() - 20, time.time() - 70))
+    assert cache.get('a' * 64) is None
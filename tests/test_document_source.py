@@ -0,0 +1,79 @@
+"""
+Tests for modules.document_source
+"""
+
+import hashlib
+import io
+
+import pytest
+
+from modules.document_source import DocumentSource
+
+
+CONTENT = b"%PDF-1.4\n" + bytes(range(256)) * 40
+
+
+class Upload(io.BytesIO):
+    """Minimal stand-in for Streamlit's UploadedFile"""
+    name = "syllabus.pdf"
+
+
+def test_upload_shares_buffer():
+    upload = Upload(CONTENT)
+    source = DocumentSource.from_upload(upload)
+    
+    assert len(source) == len(CONTENT)
+    assert source.suffix == ".pdf"
+    # The upload's memory is exported, not copied, so it cannot be resized meanwhile
+    with pytest.raises(BufferError):
+        upload.write(b"more")
+    
+    source.close()
+    upload.write(b"more")
+
+
+def test_stream_reads_and_seeks():
+    with DocumentSource(CONTENT) as source:
+        with source.stream() as stream:
+            assert stream.read(9) == b"%PDF-1.4\n"
+            stream.seek(-3, io.SEEK_END)
+            assert stream.read() == bytes([253, 254, 255])
+            stream.seek(9)
+            target = bytearray(4)
+            assert stream.readinto(target) == 4
+            assert bytes(target) == bytes([0, 1, 2, 3])
+        with io.BufferedReader(source.stream()) as buffered:
+            assert buffered.read() == CONTENT
+
+
+def test_sha256():
+    with DocumentSource(CONTENT) as source:
+        assert source.sha256() == hashlib.sha256(CONTENT).hexdigest()
+
+
+def test_path_sources_are_memory_mapped(tmp_path):
+    path = tmp_path / "scan.pdf"
+    path.write_bytes(CONTENT)
+    
+    with DocumentSource.from_path(path) as source:
+        assert source.path == path
+        assert source.buffer.tobytes() == CONTENT
+        with source.stream() as stream:
+            assert stream.read() == CONTENT
+    
+    empty = tmp_path / "empty.pdf"
+    empty.write_bytes(b"")
+    with DocumentSource.from_path(empty) as source:
+        assert len(source) == 0
+
+
+def test_upload_spooled_once_for_path_tools():
+    source = DocumentSource.from_upload(Upload(CONTENT))
+    path = source.path
+    
+    assert path.suffix == ".pdf"
+    assert path.read_bytes() == CONTENT
+    assert source.path == path
+    
+    source.close()
+    assert not path.exists()
@@ -0,0 +1,60 @@
+"""
+Tests for modules.image_preprocessor
+"""
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from modules.image_preprocessor import (
+    preprocess_image, binarize, crop_margins, deskew, downscale_to_dpi
+)
+
+
+def text_page(size=(600, 400), skew=0.0):
+    """White page with dark bars standing in for lines of text"""
+    page = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(page)
+    for top in range(100, 300, 30):
+        draw.rectangle((150, top, 450, top + 10), fill=(40, 40, 40))
+    if skew:
+        page = page.rotate(skew, expand=True, fillcolor='white')
+    return page
+
+
+def row_profile_variance(image):
+    ink = np.asarray(image.convert('L')) < 128
+    return float(np.var(ink.sum(axis=1)))
+
+
+def test_binarize_outputs_black_and_white():
+    gray = text_page().convert('L')
+    assert set(np.unique(np.asarray(binarize(gray)))) == {0, 255}
+
+
+def test_crop_margins_keeps_content_and_padding():
+    cropped = crop_margins(text_page(), padding=10)
+    assert cropped.size == (301 + 20, 191 + 20)
+
+
+def test_downscale_never_upscales():
+    page = text_page()
+    assert downscale_to_dpi(page, 600, 300).size == (300, 200)
+    assert downscale_to_dpi(page, 200, 300) is page
+
+
+def test_deskew_straightens_lines():
+    skewed = binarize(text_page(skew=3.0).convert('L'))
+    straightened = deskew(skewed, max_angle=5.0)
+    assert row_profile_variance(straightened) > 2 * row_profile_variance(skewed)
+
+
+def test_pipeline_uses_image_dpi():
+    page = text_page()
+    page.info['dpi'] = (600, 600)
+    
+    processed, timings = preprocess_image(page, {'deskew': False})
+    
+    assert processed.mode == 'L'
+    # Downscaled to 300 dpi, then cropped to the content plus padding
+    assert processed.width < 300 and processed.height < 200
+    assert set(timings) == {'grayscale', 'downscale', 'binarize', 'crop_margins'}
@@ -0,0 +1,61 @@
+"""
+Tests for modules.json_stream
+"""
+
+import json
+
+from modules.json_stream import JsonArrayStream, extract_json
+
+
+def test_stream_yields_elements_as_they_close():
+    text = 'Here you go:\n```json\n[{"q": "a [b]"}, {"q": "c\\"}"}, [1, 2]]\n```'
+    stream = JsonArrayStream()
+    elements = []
+    for i in range(0, len(text), 3):
+        elements.extend(stream.feed(text[i:i + 3]))
+    
+    assert elements == [{'q': 'a [b]'}, {'q': 'c"}'}, [1, 2]]
+    assert stream.done
+    assert stream.errors == 0
+
+
+def test_stream_skips_invalid_element():
+    stream = JsonArrayStream()
+    assert stream.feed('[{"q": 1,}, {"q": 2}]') == [{'q': 2}]
+    assert stream.errors == 1
+
+
+def test_extract_json_skips_prose_and_fences():
+    text = 'Sure! {not json} ```json\n{"topics": [{"name": "Stacks"}]}\n``` Done.'
+    json_text, repaired = extract_json(text)
+    assert json.loads(json_text) == {'topics': [{'name': 'Stacks'}]}
+    assert not repaired
+
+
+def test_extract_json_does_not_return_part_of_a_broken_value():
+    # Missing comma between the questions: the array is balanced but invalid
+    broken = '[{"question": "Define a stack."} {"question": "Define a queue."}]'
+    assert extract_json(f"Here are the questions: {broken} Good luck!") == (None, False)
+    
+    # A valid value after the broken one is still found
+    json_text, repaired = extract_json(f'{broken} Corrected: [{{"question": "Define a heap."}}]')
+    assert json.loads(json_text) == [{'question': "Define a heap."}]
+    assert not repaired
+
+
+def test_extract_json_repairs_truncated_array():
+    json_text, repaired = extract_json('[{"q": "one", "marks": 2}, {"q": "tw')
+    assert repaired
+    # The half-written element is dropped rather than returned with missing fields
+    assert json.loads(json_text) == [{'q': 'one', 'marks': 2}]
+
+
+def test_extract_json_repairs_truncated_object():
+    json_text, repaired = extract_json('{"course": "Data Structures", "topics": ["Stacks", "Que')
+    assert repaired
+    assert json.loads(json_text) == {'course': 'Data Structures', 'topics': ['Stacks', 'Que']}
+
+
+def test_extract_json_without_repair():
+    assert extract_json('[{"q": "one"}, {"q": "tw', repair=False) == (None, False)
+    assert extract_json('no json here') == (None, False)
@@ -0,0 +1,353 @@
+"""
+Tests for modules.llm_engine against the local mock server
+"""
+
+import asyncio
+import json
+import re
+import time
+
+import pytest
+
+
+def test_unparseable_score_is_not_retried(mock_server, make_engine):
+    mock_server.responder = lambda prompt: "N/A" if 'scale of 0-10' in prompt else None
+    engine = make_engine()
+    
+    started = time.monotonic()
+    score = engine.evaluate_question_quality({'question': "Define a stack.", 'marks': 2})
+    
+    assert score == 7.0
+    assert mock_server.stats['requests'] == 1
+    assert time.monotonic() - started < 5
+
+
+def test_failed_batch_falls_back_once_per_question(mock_server, make_engine):
+    mock_server.responder = lambda prompt: "not json"
+    engine = make_engine()
+    questions = [{'question': f"Define term {i}.", 'marks': 2} for i in range(10)]
+    
+    scores = engine.evaluate_questions(questions)
+    
+    assert scores == [7.0] * 10
+    # One batch request plus one request per question
+    assert mock_server.stats['requests'] == 11
+
+
+DISTRIBUTION = {'remember': 50, 'apply': 50}
+TOPICS = [{'name': "Stacks", 'priority': 5}]
+
+
+def is_scoring_prompt(prompt):
+    return 'scale of 0-10' in prompt or 'one entry per question' in prompt
+
+
+def test_cascade_keeps_reviewed_drafts(make_engine):
+    engine = make_engine(cascade=True)
+    
+    questions = engine.generate_questions("Unit 1: Stacks", TOPICS, DISTRIBUTION, 20)
+    
+    stats = engine.cascade_stats['remember']
+    assert stats['drafted'] == stats['accepted'] > 0
+    assert stats['escalated'] == 0
+    assert 'apply' not in engine.cascade_stats
+    assert [q['number'] for q in questions] == list(range(1, len(questions) + 1))
+    # Drafts, their review and the generator share the job's budget
+    assert engine.last_generation_stats['calls'] == 3
+
+
+def test_cascade_escalates_unscored_drafts(mock_server, make_engine):
+    mock_server.responder = lambda prompt: "unavailable" if is_scoring_prompt(prompt) else None
+    engine = make_engine(cascade=True)
+    
+    questions = engine.generate_questions("Unit 1: Stacks", TOPICS, DISTRIBUTION, 20)
+    
+    stats = engine.cascade_stats['remember']
+    assert stats['accepted'] == 0
+    assert stats['escalated'] == stats['drafted']
+    remember = [q for q in questions if q['bloom_level'] == 'remember']
+    assert len(remember) == stats['drafted']
+
+
+def test_cascade_levels_are_case_insensitive(make_engine):
+    engine = make_engine(cascade=True, cascade_levels=['Remember'])
+    assert engine._cascades('remember')
+    assert engine._cascades('Remember')
+    assert not engine._cascades('apply')
+
+
+def test_success_headers_reach_rate_limiter(make_engine):
+    from utils.mock_groq_server import MockGroqServer
+    
+    with MockGroqServer(tpm=20000) as limited_server:
+        engine = make_engine(base_url=limited_server.url, parser_model="header-test-model",
+                             rate_limits={'header-test-model': {'rpm': 1000, 'tpm': 100000}})
+        engine.parse_syllabus("Course\nUnit 1: Stacks")
+    
+    # The server reported well under the local 100k-token budget
+    stats = engine.rate_limiter.get_statistics()['header-test-model']
+    assert stats['tokens_available'] < 50000
+
+
+def test_close_releases_http_clients(make_engine):
+    with make_engine() as engine:
+        engine.parse_syllabus("Course\nUnit 1: Stacks")
+        clients = [engine.parser_llm.http_client, engine.generator_llm.http_client]
+        assert not any(client.is_closed for client in clients)
+    
+    assert all(client.is_closed for client in clients)
+
+
+def test_load_llm_config(tmp_path, mock_server):
+    from modules.llm_engine import DualLLMEngine, load_llm_config
+    
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(f"""
+llm:
+  base_url: "{mock_server.url}"
+  parser:
+    temperature: 0.1
+  generator:
+    model: "llama-3.3-70b-versatile"
+    context_token_budget: 300
+  retry:
+    max_attempts: 3
+    delay_seconds: 2
+  cache:
+    enabled: false
+  cascade:
+    enabled: true
+    levels: ["Remember"]
+""")
+    config = load_llm_config(str(config_path))
+    
+    assert config['retry_policy'].max_retries == 2
+    assert config['retry_policy'].backoff_base_seconds == 2
+    engine = DualLLMEngine(**config)
+    assert engine.parser_llm.temperature == 0.1
+    assert engine.context_token_budget == 300
+    assert engine.response_cache is None
+    assert engine._cascades('remember')
+    assert load_llm_config(str(tmp_path / "missing.yaml")) == {}
+
+
+@pytest.mark.parametrize('fresh', [False, True])
+def test_stream_replaces_unusable_cache_entry(mock_server, make_engine, tmp_path, fresh):
+    engine = make_engine(cache_enabled=True, cache_dir=str(tmp_path), temperature=0)
+    plan = engine._calculate_questions_per_level({'remember': 100}, 10)['remember']
+    messages = engine._level_messages('remember', plan['count'], plan['marks_per_question'],
+                                      TOPICS, "Unit 1: Stacks")
+    cache_key = engine._response_cache_key(engine.generator_llm, messages)
+    engine.response_cache.set(cache_key, "not json")
+    
+    questions = list(engine.stream_questions("Unit 1: Stacks", TOPICS, {'remember': 100}, 10, fresh=fresh))
+    
+    assert len(questions) == plan['count']
+    assert mock_server.stats['requests'] == 1
+    assert engine.response_cache.get(cache_key) != "not json"
+
+
+def test_level_questions_drop_non_objects(make_engine):
+    engine = make_engine()
+    
+    questions = engine._parse_level_questions('["intro", {"question": "Define a stack."}, 3]', 5)
+    assert questions == [{'question': "Define a stack.", 'number': 5}]
+    
+    with pytest.raises(ValueError):
+        engine._parse_level_questions('["only", "strings"]', 1)
+
+
+FULL_DISTRIBUTION = {
+    'remember': 15, 'understand': 20, 'apply': 25, 'analyze': 20, 'evaluate': 10, 'create': 10
+}
+
+
+def test_async_generation_matches_sync(make_engine):
+    from utils.mock_groq_server import MockGroqServer
+    
+    # Random latency lets later levels finish before earlier ones
+    with MockGroqServer(jitter_ms=80, seed=3) as server:
+        engine = make_engine(base_url=server.url)
+        expected = engine.generate_questions("Unit 1: Stacks", TOPICS, FULL_DISTRIBUTION, 100)
+        concurrent = asyncio.run(engine.agenerate_questions(
+            "Unit 1: Stacks", TOPICS, FULL_DISTRIBUTION, 100, max_concurrency=6
+        ))
+        streamed = list(engine.stream_questions("Unit 1: Stacks", TOPICS, FULL_DISTRIBUTION, 100))
+    
+    assert concurrent == expected
+    assert streamed == expected
+    assert [q['number'] for q in expected] == list(range(1, len(expected) + 1))
+    assert {q['bloom_level'] for q in expected} == set(FULL_DISTRIBUTION)
+
+
+def test_async_generation_runs_on_fresh_event_loops(mock_server, make_engine):
+    engine = make_engine()
+    
+    # Each asyncio.run() closes its loop; connections of the first must not be reused
+    for _ in range(2):
+        questions = asyncio.run(engine.agenerate_questions(
+            "Unit 1: Stacks", TOPICS, FULL_DISTRIBUTION, 100, max_concurrency=6
+        ))
+        assert len(questions) == 22
+        assert engine.last_generation_stats['retries'] == 0
+
+
+def test_response_cache_reuses_answers(mock_server, make_engine, tmp_path):
+    engine = make_engine(cache_enabled=True, cache_dir=str(tmp_path))
+    
+    first = engine.generate_questions("Unit 1: Stacks", TOPICS, DISTRIBUTION, 20, fresh=False)
+    requests = mock_server.stats['requests']
+    again = engine.generate_questions("Unit 1: Stacks", TOPICS, DISTRIBUTION, 20, fresh=False)
+    
+    assert again == first
+    assert mock_server.stats['requests'] == requests
+    
+    # Fresh samples at a non-zero temperature go to the model
+    engine.generate_questions("Unit 1: Stacks", TOPICS, DISTRIBUTION, 20, fresh=True)
+    assert mock_server.stats['requests'] == 2 * requests
+    
+    # Another model setting is a different cache entry
+    other = make_engine(cache_enabled=True, cache_dir=str(tmp_path), max_tokens=1000)
+    other.generate_questions("Unit 1: Stacks", TOPICS, DISTRIBUTION, 20, fresh=False)
+    assert mock_server.stats['requests'] == 3 * requests
+
+
+def test_batched_scores_map_by_id(mock_server, make_engine):
+    def responder(prompt):
+        ids = [int(i) for i in re.findall(r'^ID (\d+)$', prompt, re.MULTILINE)]
+        if ids:
+            # Out of order, and the score for ID 2 is missing
+            return json.dumps([{'id': i, 'score': 5 + i / 10} for i in reversed(ids) if i != 2])
+        return "4.5"
+    
+    mock_server.responder = responder
+    engine = make_engine()
+    questions = [{'question': f"Define term {i}.", 'marks': 2} for i in range(10)]
+    
+    scores = engine.evaluate_questions(questions)
+    
+    assert scores == [5.1, 4.5, 5.3, 5.4, 5.5, 5.6, 5.7, 5.8, 5.9, 6.0]
+    # One batch request plus one for the missing score
+    assert mock_server.stats['requests'] == 2
+
+
+def test_batches_split_by_size(mock_server, make_engine):
+    engine = make_engine()
+    questions = [{'question': f"Define term {i}.", 'marks': 2} for i in range(30)]
+    
+    scores = engine.evaluate_questions(questions, max_batch_size=12)
+    
+    assert len(scores) == 30
+    assert all(6 <= score <= 9.5 for score in scores)
+    assert mock_server.stats['requests'] == 3
+
+
+def long_syllabus():
+    units = ["Stacks", "Queues", "Hashing", "Graphs", "Sorting", "Heaps", "Tries", "Matrices"]
+    lines = []
+    for number, unit in enumerate(units, start=1):
+        lines.append(f"Unit {number}: {unit}")
+        lines.extend(f"{unit} concept {i}: definitions, operations and {unit.lower()} examples." for i in range(12))
+    return "\n".join(lines)
+
+
+def test_prompt_context_follows_topics(mock_server, make_engine):
+    prompts = []
+    # Records the prompt; returning None keeps the canned completion
+    mock_server.responder = lambda prompt: prompts.append(prompt)
+    engine = make_engine(context_token_budget=300)
+    syllabus = long_syllabus()
+    topics = [{'name': "Hashing", 'priority': 9}, {'name': "Graphs", 'priority': 7}]
+    
+    engine.generate_questions(syllabus, topics, {'apply': 100}, 10)
+    
+    context = prompts[0].split("Syllabus context:\n", 1)[1].split("\n\nRequirements:", 1)[0]
+    assert "Hashing concept" in context
+    assert "Graphs concept" in context
+    assert "Matrices concept" not in context
+    assert len(context) < 300 * 4 + 100
+    assert len(context) < len(syllabus) / 4
+
+
+CHUNKED_SYLLABUS = "\n".join([
+    "B.Tech Computer Science - Data Structures (CS201)",
+    "Credits: 4",
+    "Unit 1: Stacks",
+    "Array and linked stacks; expression evaluation.",
+    "Unit 2: Queues",
+    "Circular queues; deques; priority queues.",
+    "Unit 3: Trees",
+    *[f"Tree topic {i}: traversal, insertion and deletion in search trees." for i in range(8)],
+    "Unit 4: Graphs",
+    "Breadth first search; depth first search; shortest paths.",
+])
+
+
+def test_split_syllabus_keeps_units_whole():
+    from modules.llm_engine import DualLLMEngine
+    
+    header, chunks = DualLLMEngine._split_syllabus(CHUNKED_SYLLABUS, chunk_chars=200)
+    
+    assert header == "B.Tech Computer Science - Data Structures (CS201)\nCredits: 4"
+    assert chunks[0].startswith("Unit 1: Stacks") and "Unit 2: Queues" in chunks[0]
+    # The oversized unit is split at lines and each piece names its unit
+    tree_chunks = [chunk for chunk in chunks if "Tree topic" in chunk]
+    assert len(tree_chunks) > 1
+    assert all(chunk.startswith("Unit 3: Trees") for chunk in tree_chunks)
+    assert all(len(chunk) <= 200 for chunk in tree_chunks)
+    assert chunks[-1].startswith("Unit 4: Graphs")
+    
+    joined = "\n".join(chunks)
+    for line in CHUNKED_SYLLABUS.splitlines()[2:]:
+        assert line in joined
+
+
+def test_merge_syllabus_parts():
+    from modules.llm_engine import DualLLMEngine
+    
+    merged = DualLLMEngine._merge_syllabus_parts([
+        {'course_name': "Data Structures", 'units': [
+            {'unit_number': "1", 'unit_name': "Stacks", 'topics': ["Push", "Pop"]}
+        ], 'objectives': ["Use stacks"]},
+        None,
+        {'course_name': "Unknown", 'units': [
+            {'unit_number': "1", 'unit_name': "", 'topics': ["pop", "Peek"], 'weightage': 20},
+            {'unit_number': "2", 'unit_name': "Queues", 'topics': ["Enqueue"]}
+        ], 'objectives': ["Use stacks", "Use queues"]},
+    ])
+    
+    assert merged == {
+        'course_name': "Data Structures",
+        'units': [
+            {'unit_number': "1", 'unit_name': "Stacks", 'topics': ["Push", "Pop", "Peek"], 'weightage': 20},
+            {'unit_number': "2", 'unit_name': "Queues", 'topics': ["Enqueue"]},
+        ],
+        'objectives': ["Use stacks", "Use queues"],
+    }
+
+
+def echo_units(prompt):
+    """Parser reply listing the units found in the prompt's syllabus text"""
+    text = prompt.split("Syllabus:\n", 1)[-1]
+    units = {}
+    for number, name in re.findall(r'^Unit (\d+): (\w+)', text, re.MULTILINE):
+        units.setdefault(number, {'unit_number': number, 'unit_name': name, 'topics': []})
+    for line in text.splitlines():
+        if line.startswith("Tree topic"):
+            units['3']['topics'].append(line.split(":")[0])
+    return json.dumps({'course_name': "Data Structures", 'units': list(units.values())})
+
+
+def test_chunked_parse_merges_units(mock_server, make_engine):
+    from modules.llm_engine import DualLLMEngine
+    
+    mock_server.responder = lambda prompt: echo_units(prompt) if 'syllabus parser' in prompt else None
+    engine = make_engine()
+    _, chunks = DualLLMEngine._split_syllabus(CHUNKED_SYLLABUS, chunk_chars=200)
+    
+    parsed = engine.parse_syllabus(CHUNKED_SYLLABUS, chunk_chars=200)
+    
+    assert mock_server.stats['requests'] == len(chunks) > 2
+    assert [unit['unit_name'] for unit in parsed['units']] == ["Stacks", "Queues", "Trees", "Graphs"]
+    assert parsed['units'][2]['topics'] == [f"Tree topic {i}" for i in range(8)]
+    assert parsed == asyncio.run(engine.aparse_syllabus(CHUNKED_SYLLABUS, chunk_chars=200))
@@ -0,0 +1,68 @@
+"""
+Tests for utils.mock_groq_server
+"""
+
+import json
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from utils.mock_groq_server import MockGroqServer
+
+
+def chat(server, content, **extra):
+    return httpx.post(
+        f"{server.url}/openai/v1/chat/completions",
+        json={'model': 'llama-3.1-8b-instant', 'messages': [{'role': 'user', 'content': content}],
+              'max_tokens': 100, **extra},
+        timeout=10
+    )
+
+
+def test_canned_question_generation(mock_server):
+    response = chat(mock_server, 'Generate 3 examination questions at the "Apply" level.\n'
+                                 "Each question is worth 5 marks.\nTopics to cover: Stacks, Queues")
+    
+    assert response.status_code == 200
+    content = response.json()['choices'][0]['message']['content']
+    questions = json.loads(content.strip().strip('`').removeprefix('json'))
+    assert [q['topic'] for q in questions] == ["Stacks", "Queues", "Stacks"]
+    assert {(q['marks'], q['bloom_level']) for q in questions} == {(5, 'apply')}
+    assert response.json()['usage']['total_tokens'] > 0
+
+
+def test_rpm_limit_returns_429_with_headers():
+    with MockGroqServer(rpm=2) as server:
+        statuses = [chat(server, "hello").status_code for _ in range(3)]
+        limited = chat(server, "hello")
+    
+    assert statuses == [200, 200, 429]
+    assert limited.headers['retry-after']
+    assert limited.headers['x-ratelimit-limit-requests'] == '2'
+    assert server.stats['rate_limited'] == 2
+
+
+def test_streaming_reassembles_completion(mock_server):
+    mock_server.responder = lambda prompt: "one two three " * 10
+    
+    with httpx.stream('POST', f"{mock_server.url}/openai/v1/chat/completions", timeout=10, json={
+        'model': 'llama-3.1-8b-instant', 'messages': [{'role': 'user', 'content': "hi"}], 'stream': True
+    }) as response:
+        events = [line[len("data: "):] for line in response.iter_lines() if line.startswith("data: ")]
+    
+    assert events[-1] == "[DONE]"
+    chunks = [json.loads(event) for event in events[:-1]]
+    text = "".join(chunk['choices'][0]['delta'].get('content', '') for chunk in chunks)
+    assert text == "one two three " * 10
+    assert chunks[-1]['choices'][0]['finish_reason'] == 'stop'
+
+
+def test_injected_errors_are_reproducible():
+    def run():
+        with MockGroqServer(error_rate=0.5, seed=42) as server:
+            return [chat(server, "hello").status_code for _ in range(10)]
+    
+    first = run()
+    assert first == run()
+    assert set(first) == {200, 500}
@@ -0,0 +1,29 @@
+"""
+Smoke tests for benchmarks/ocr_benchmark.py
+"""
+
+from PyPDF2 import PdfReader
+
+from benchmarks.ocr_benchmark import generate_corpus, run_case
+
+
+def test_corpus_variants(tmp_path):
+    corpus = generate_corpus(tmp_path, page_count=2, variants=['typed', 'noisy'])
+    
+    for document in corpus.values():
+        assert len(PdfReader(str(document['path'])).pages) == 2
+        assert document['words']
+    # Only the typed variant has a text layer
+    assert PdfReader(str(corpus['typed']['path'])).pages[0].extract_text().strip()
+    assert not PdfReader(str(corpus['noisy']['path'])).pages[0].extract_text().strip()
+
+
+def test_run_case_reports_recall_and_stats(tmp_path):
+    document = generate_corpus(tmp_path, page_count=2, variants=['typed'])['typed']
+    
+    result = run_case(document, 'cached', workers=1, repeat=2)
+    
+    assert result['runs'] == 2
+    assert result['word_recall'] > 0.9
+    assert result['ocr_stats']['cache_hit']
+    assert result['pages_per_sec'] > 0
@@ -0,0 +1,62 @@
+"""
+Tests for modules.ocr_layout
+"""
+
+import pytest
+
+from modules.ocr_layout import OCRLayout
+
+
+HEADER = "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext"
+
+
+def tsv(*rows):
+    return "\n".join([HEADER, *("\t".join(str(field) for field in row) for row in rows)])
+
+
+# level, page, block, paragraph, line, word, left, top, width, height, conf, text
+SAMPLE = tsv(
+    (1, 1, 0, 0, 0, 0, 0, 0, 800, 600, -1, ""),
+    (2, 1, 1, 0, 0, 0, 50, 40, 300, 60, -1, ""),
+    (4, 1, 1, 1, 1, 0, 50, 40, 300, 20, -1, ""),
+    (5, 1, 1, 1, 1, 1, 50, 40, 60, 20, 96.5, "Unit"),
+    (5, 1, 1, 1, 1, 2, 120, 40, 20, 20, 91.0, "1:"),
+    (5, 1, 1, 1, 1, 3, 150, 42, 90, 18, 88.0, "Stacks"),
+    (5, 1, 1, 1, 2, 1, 50, 80, 70, 20, 35.0, "Qu3ues"),
+    (5, 1, 1, 1, 2, 2, 130, 80, 20, 20, -1, " "),
+    (2, 1, 2, 0, 0, 0, 50, 300, 300, 20, -1, ""),
+    (5, 1, 2, 1, 1, 1, 50, 300, 80, 20, 90.0, "Q1."),
+    (5, 1, 2, 1, 1, 2, 140, 300, 120, 24, 80.0, "Define"),
+)
+
+
+def test_only_word_rows_are_kept():
+    layout = OCRLayout.from_tsv(SAMPLE, page_number=3)
+    
+    assert layout.page_number == 3
+    assert layout.words() == ["Unit", "1:", "Stacks", "Qu3ues", "Q1.", "Define"]
+    assert layout.words(min_conf=60) == ["Unit", "1:", "Stacks", "Q1.", "Define"]
+    assert list(layout.low_confidence_mask()) == [False, False, False, True, False, False]
+
+
+def test_lines_and_blocks():
+    layout = OCRLayout.from_tsv(SAMPLE)
+    
+    lines = layout.lines()
+    assert [line['text'] for line in lines] == ["Unit 1: Stacks", "Qu3ues", "Q1. Define"]
+    assert lines[0]['bbox'] == (50, 40, 240, 60)
+    assert lines[0]['confidence'] == pytest.approx((96.5 + 91.0 + 88.0) / 3)
+    
+    blocks = layout.blocks(min_conf=60)
+    assert [block['text'] for block in blocks] == ["Unit 1: Stacks", "Q1. Define"]
+    assert blocks[1]['bbox'] == (50, 300, 260, 324)
+    
+    assert layout.text(min_conf=60) == "Unit 1: Stacks\nQ1. Define"
+
+
+def test_empty_page():
+    layout = OCRLayout.from_tsv(HEADER)
+    assert len(layout) == 0
+    assert layout.mean_confidence() == 0.0
+    assert layout.lines() == []
+    assert layout.text() == ""
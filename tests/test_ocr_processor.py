@@ -0,0 +1,348 @@
+"""
+Tests for modules.ocr_processor
+"""
+
+import gc
+import multiprocessing
+import re
+import threading
+import time
+import warnings
+
+import pytest
+from PIL import Image
+
+from modules import tesseract_backend
+from modules.document_source import DocumentSource
+from modules.ocr_processor import OCRProcessor
+
+
+def page_image(page_number):
+    """Blank page whose pixel value encodes its page number"""
+    return Image.new('L', (40, 30), page_number)
+
+
+def fake_image_to_string(image, backend, language, config):
+    page_number = image.getpixel((0, 0))
+    # Earlier pages finish last, so completion order differs from page order
+    time.sleep(max(0, 10 - page_number) * 0.01)
+    return f"text of page {page_number}"
+
+
+@pytest.fixture
+def fake_tesseract(monkeypatch):
+    """Replace Tesseract in this process and in forked pool workers"""
+    monkeypatch.setattr(tesseract_backend, 'image_to_string', fake_image_to_string)
+    monkeypatch.setattr(tesseract_backend, 'warm_up', lambda *args: None)
+
+
+@pytest.fixture
+def processor():
+    processor = OCRProcessor('tesseract', {'cache_enabled': False})
+    yield processor
+    processor.close()
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(),
+                    reason="workers only see the fake Tesseract when forked")
+def test_parallel_ocr_keeps_page_order(fake_tesseract):
+    config = {'cache_enabled': False, 'workers': 3, 'start_method': 'fork'}
+    with OCRProcessor('tesseract', config) as processor:
+        pages = ((number, page_image(number)) for number in range(1, 9))
+        results = processor._ocr_pages(pages)
+        
+        assert results == [(number, f"text of page {number}") for number in range(1, 9)]
+        assert processor.last_run_stats['workers'] == 3
+        assert processor.last_run_stats['pages'] == 8
+
+
+def test_sequential_ocr_closes_images(fake_tesseract, processor):
+    images = [page_image(number) for number in range(1, 4)]
+    results = processor._ocr_pages(enumerate(images, start=1))
+    
+    assert [text for _, text in results] == ["text of page 1", "text of page 2", "text of page 3"]
+    assert processor.last_run_stats['workers'] == 1
+    for image in images:
+        with pytest.raises(ValueError):
+            image.getpixel((0, 0))
+
+
+def test_preprocessing_downscales_to_render_dpi():
+    from modules.image_preprocessor import preprocess_image
+    
+    processor = OCRProcessor('tesseract', {'cache_enabled': False, 'dpi': 150, 'preprocess': True})
+    assert processor.preprocess_options['target_dpi'] == 150
+    
+    # A 600 dpi scan is brought down to the resolution PDF pages are rendered at
+    scan = Image.new('L', (1200, 1600), 255)
+    scan.info['dpi'] = (600, 600)
+    processed, timings = preprocess_image(scan, {**processor.preprocess_options, 'crop_margins': False})
+    assert processed.size == (300, 400)
+    assert 'downscale' in timings
+
+
+def test_run_stats_are_per_thread(fake_tesseract, processor):
+    processor._ocr_pages(enumerate([page_image(1), page_image(2)], start=1))
+    
+    # Another session sharing the processor runs in its own thread
+    other = threading.Thread(target=processor._ocr_pages, args=(enumerate([page_image(3)], start=1),))
+    other.start()
+    other.join()
+    
+    assert processor.last_run_stats['pages'] == 2
+
+
+@pytest.fixture
+def tiff_path(tmp_path):
+    path = tmp_path / 'scan.tiff'
+    frames = [Image.new('L', (40, 30), color) for color in (0, 128, 255)]
+    frames[0].save(path, save_all=True, append_images=frames[1:])
+    return path
+
+
+def test_image_frames_close_file(processor, tiff_path):
+    source = DocumentSource.from_path(tiff_path)
+    gc.collect()
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always', ResourceWarning)
+        frames = list(processor._iter_image_frames([source]))
+        # Stop part way through a second pass as well
+        partial = processor._iter_image_frames([source])
+        next(partial)
+        partial.close()
+        del partial
+        gc.collect()
+    source.close()
+    
+    assert [number for number, _ in frames] == [1, 2, 3]
+    assert [frame.getpixel((0, 0)) for _, frame in frames] == [0, 128, 255]
+    assert not [
+        w for w in caught
+        if issubclass(w.category, ResourceWarning) and tiff_path.name in str(w.message)
+    ]
+
+
+@pytest.fixture
+def fake_rasterizer(monkeypatch):
+    """Replace pdftoppm; returns the list of (first_page, last_page) windows rendered"""
+    from modules import ocr_processor
+    
+    windows = []
+    
+    def convert_from_path(path, dpi, first_page, last_page):
+        windows.append((first_page, last_page))
+        return [page_image(number) for number in range(first_page, last_page + 1)]
+    
+    monkeypatch.setattr(ocr_processor, 'convert_from_path', convert_from_path)
+    return windows
+
+
+def test_page_windows():
+    processor = OCRProcessor('tesseract', {'cache_enabled': False, 'render_window': 3})
+    windows = list(processor._page_windows([9, 1, 2, 3, 4, 6, 7]))
+    assert windows == [(1, 3), (4, 4), (6, 7), (9, 9)]
+
+
+def test_pdf_pages_rendered_lazily_per_window(fake_rasterizer, tmp_path):
+    processor = OCRProcessor('tesseract', {'cache_enabled': False, 'render_window': 2, 'dpi': 150})
+    path = tmp_path / 'scan.pdf'
+    path.write_bytes(b"%PDF-1.4")
+    source = DocumentSource.from_path(path)
+    
+    pages = processor._iter_pdf_pages(source, [1, 2, 3, 5])
+    first_number, first_image = next(pages)
+    # Only the first window has been rendered
+    assert fake_rasterizer == [(1, 2)]
+    assert first_number == 1
+    assert first_image.info['dpi'] == (150, 150)
+    
+    assert [number for number, _ in pages] == [2, 3, 5]
+    assert fake_rasterizer == [(1, 2), (3, 3), (5, 5)]
+    source.close()
+
+
+def make_pdf(path, pages):
+    """Write a PDF; each page is a list of text lines or a PIL image (a scanned page)"""
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+    
+    pdf = canvas.Canvas(str(path), pagesize=(400, 400))
+    for page in pages:
+        if isinstance(page, Image.Image):
+            pdf.drawImage(ImageReader(page), 0, 0, width=400, height=400)
+        else:
+            for i, line in enumerate(page):
+                pdf.drawString(20, 370 - 15 * i, line)
+        pdf.showPage()
+    pdf.save()
+    return path
+
+
+def test_text_layer_used_per_page(fake_tesseract, fake_rasterizer, tmp_path):
+    path = make_pdf(tmp_path / 'mixed.pdf', [
+        ["Unit 1: Stacks and queues with their applications in expression evaluation"],
+        [],
+        ["Unit 2: Binary search trees, AVL trees and traversal algorithms"],
+    ])
+    processor = OCRProcessor('tesseract', {'cache_enabled': False, 'strip_repeated_lines': False})
+    
+    text = processor.extract_text(str(path))
+    
+    # Only the page without a text layer was rasterized and OCRed
+    assert fake_rasterizer == [(2, 2)]
+    assert processor.last_run_stats['text_layer_pages'] == 2
+    assert text.index("[Page 1]") < text.index("Unit 1: Stacks") < text.index("[Page 2]")
+    assert text.index("[Page 2]") < text.index("text of page 2") < text.index("[Page 3]")
+    assert text.index("[Page 3]") < text.index("Unit 2: Binary")
+
+
+def test_sparse_text_layer_is_ocred(fake_tesseract, fake_rasterizer, tmp_path):
+    # A scanned page with only a stamped page number has no usable text layer
+    path = make_pdf(tmp_path / 'stamped.pdf', [["12"], ["Unit 1: Stacks and queues"]])
+    processor = OCRProcessor('tesseract', {'cache_enabled': False, 'min_text_layer_chars': 10})
+    
+    text = processor.extract_text(str(path))
+    
+    assert fake_rasterizer == [(1, 1)]
+    assert "text of page 1" in text
+    assert "Unit 1: Stacks and queues" in text
+
+
+def test_document_cache_skips_ocr(fake_tesseract, fake_rasterizer, tmp_path):
+    path = make_pdf(tmp_path / 'scan.pdf', [page_image(1), page_image(2)])
+    config = {'cache_dir': str(tmp_path / 'cache'), 'strip_repeated_lines': False}
+    
+    first = OCRProcessor('tesseract', config).extract_text(str(path))
+    rendered = list(fake_rasterizer)
+    # A new processor (e.g. after a restart) reads the same cache directory
+    processor = OCRProcessor('tesseract', config)
+    second = processor.extract_text(str(path))
+    
+    assert second == first
+    assert fake_rasterizer == rendered
+    assert processor.last_run_stats['cache_hit']
+    
+    # Different OCR settings do not share entries
+    OCRProcessor('tesseract', {**config, 'dpi': 300}).extract_text(str(path))
+    assert len(fake_rasterizer) > len(rendered)
+
+
+TOPICS = ["stacks", "queues", "linked lists", "binary trees", "graphs", "hashing"]
+
+
+def exam_pages(count=4):
+    pages = {}
+    for number in range(1, count + 1):
+        topic = TOPICS[number - 1]
+        pages[number] = "\n".join([
+            "XYZ Institute of Technology",
+            f"B.Tech Semester {number % 2 + 3} Examination 2023",
+            f"Explain {topic} with an example.",
+            "Answer any five questions.",
+            f"Describe the applications of {topic}.",
+            f"Compare {topic} with arrays.",
+            "Answer any five questions.",
+            f"Derive the complexity of {topic} operations.",
+            f"Write short notes on {topic}.",
+            "Turn over",
+            f"Page {number} of {count}",
+        ])
+    return pages
+
+
+def test_repeated_header_and_footer_lines_removed():
+    processor = OCRProcessor('tesseract', {'cache_enabled': False, 'repeated_line_zone': 3})
+    stripped = processor.remove_repeated_lines(exam_pages())
+    
+    for number, text in stripped.items():
+        lines = text.splitlines()
+        assert lines[0] == f"Explain {TOPICS[number - 1]} with an example."
+        assert lines[-1] == f"Write short notes on {TOPICS[number - 1]}."
+        # Repeated lines in the body of the page are content, not furniture
+        assert lines.count("Answer any five questions.") == 2
+    assert processor.last_run_stats['repeated_lines_removed'] == 4 * 4
+
+
+def test_repeated_lines_kept_below_thresholds():
+    processor = OCRProcessor('tesseract', {'cache_enabled': False})
+    # Too few pages to tell furniture from content
+    pages = exam_pages(count=2)
+    assert processor.remove_repeated_lines(pages) == pages
+    
+    # A line on two of five pages is below the 60% ratio
+    pages = {number: f"Overview of {topic}\nDetails of {topic}" for number, topic in enumerate(TOPICS[:5], 1)}
+    pages[1] = "Department of Computer Science\n" + pages[1]
+    pages[2] = "Department of Computer Science\n" + pages[2]
+    assert processor.remove_repeated_lines(pages) == pages
+    
+    disabled = OCRProcessor('tesseract', {'cache_enabled': False, 'strip_repeated_lines': False})
+    assert disabled.remove_repeated_lines(exam_pages()) == exam_pages()
+
+
+def split_pages(text):
+    """Map page number to text in extract_text() output"""
+    parts = re.split(r'\n\[Page (\d+)\]\n', text)
+    return {int(number): body.strip() for number, body in zip(parts[1::2], parts[2::2])}
+
+
+def scanned_page(shade):
+    return Image.new('L', (60, 80), shade)
+
+
+def test_page_fingerprints_follow_content(tmp_path):
+    from PyPDF2 import PdfReader
+    
+    first = make_pdf(tmp_path / 'v1.pdf', [scanned_page(10), scanned_page(20)])
+    second = make_pdf(tmp_path / 'v2.pdf', [scanned_page(30), scanned_page(10), scanned_page(20)])
+    
+    v1 = [OCRProcessor._page_fingerprint(page) for page in PdfReader(str(first)).pages]
+    v2 = [OCRProcessor._page_fingerprint(page) for page in PdfReader(str(second)).pages]
+    
+    assert None not in v1 + v2
+    assert v2[1:] == v1
+    assert v2[0] not in v1
+
+
+def test_revised_pdf_reuses_unchanged_pages(fake_tesseract, fake_rasterizer, tmp_path):
+    config = {'cache_dir': str(tmp_path / 'cache'), 'strip_repeated_lines': False}
+    first = make_pdf(tmp_path / 'v1.pdf', [scanned_page(10), scanned_page(20)])
+    # Revision with a new cover page in front of the unchanged pages
+    second = make_pdf(tmp_path / 'v2.pdf', [scanned_page(30), scanned_page(10), scanned_page(20)])
+    
+    OCRProcessor('tesseract', config).extract_text(str(first))
+    fake_rasterizer.clear()
+    processor = OCRProcessor('tesseract', config)
+    text = processor.extract_text(str(second))
+    
+    assert fake_rasterizer == [(1, 1)]
+    assert processor.last_run_stats['cached_pages'] == 2
+    # Pages 2 and 3 keep the text OCRed from pages 1 and 2 of the first version
+    assert split_pages(text) == {1: "text of page 1", 2: "text of page 1", 3: "text of page 2"}
+
+
+def test_tiff_frames_and_image_batches(fake_tesseract, tmp_path):
+    processor = OCRProcessor('tesseract', {'cache_enabled': False, 'strip_repeated_lines': False})
+    tiff = tmp_path / 'scan.tiff'
+    page_image(1).save(tiff, save_all=True, append_images=[page_image(2), page_image(3)])
+    photo = tmp_path / 'photo.png'
+    page_image(4).save(photo)
+    
+    assert split_pages(processor.extract_text(str(tiff))) == {
+        1: "text of page 1", 2: "text of page 2", 3: "text of page 3"
+    }
+    # A single-frame image has no page markers
+    assert processor.extract_text(str(photo)) == "text of page 4"
+    # A batch of images is one document in list order
+    assert split_pages(processor.extract_text([str(photo), str(tiff)])) == {
+        1: "text of page 4", 2: "text of page 1", 3: "text of page 2", 4: "text of page 3"
+    }
+
+
+def test_batch_rejects_pdfs(tmp_path):
+    processor = OCRProcessor('tesseract', {'cache_enabled': False})
+    pdf = make_pdf(tmp_path / 'paper.pdf', [["Unit 1"]])
+    photo = tmp_path / 'photo.png'
+    page_image(1).save(photo)
+    
+    with pytest.raises(ValueError):
+        processor.extract_text([str(photo), str(pdf)])
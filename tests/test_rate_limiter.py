@@ -0,0 +1,102 @@
+"""
+Tests for modules.rate_limiter
+"""
+
+import threading
+
+import pytest
+
+from modules.rate_limiter import RateLimiter, TokenBucket, parse_duration
+
+
+def test_parse_duration():
+    assert parse_duration('7') == 7.0
+    assert parse_duration('2m59.5s') == pytest.approx(179.5)
+    assert parse_duration('120ms') == pytest.approx(0.12)
+    assert parse_duration('soon') is None
+
+
+def test_token_bucket_refills_over_time():
+    bucket = TokenBucket(60, period_seconds=60)
+    bucket.take(60)
+    assert bucket.wait_time(30) == pytest.approx(30, rel=0.01)
+    bucket.refill(bucket.updated_at + 10)
+    assert bucket.level == pytest.approx(10)
+
+
+def test_reconfigure_keeps_spent_budget():
+    limiter = RateLimiter()
+    limiter.configure('model', rpm=100, tpm=12000)
+    limiter.acquire('model', 10000)
+    
+    # Same limits again, as every new engine does: nothing is refilled
+    limiter.configure('model', rpm=100, tpm=12000)
+    assert limiter.get_statistics()['model']['tokens_available'] < 2100
+    
+    # Lower limits clamp the level; higher limits keep it
+    limiter.configure('model', tpm=1000)
+    assert limiter.get_statistics()['model']['tokens_available'] <= 1000
+    limiter.configure('model', tpm=50000)
+    assert limiter.get_statistics()['model']['tokens_available'] < 2100
+
+
+def test_sessions_take_turns():
+    limiter = RateLimiter()
+    limiter.configure('model', rpm=600, tpm=1000000)
+    # Drain the request bucket so waiting tickets queue up
+    for _ in range(600):
+        limiter.acquire('model', 1, 'warmup')
+    
+    order = []
+    
+    def worker(session, count):
+        for _ in range(count):
+            limiter.acquire('model', 1, session)
+            order.append(session)
+    
+    threads = [threading.Thread(target=worker, args=('a', 4))]
+    threads[0].start()
+    while limiter.get_statistics()['model']['queue_depth'] == 0:
+        pass
+    threads.append(threading.Thread(target=worker, args=('b', 2)))
+    threads[1].start()
+    for thread in threads:
+        thread.join(timeout=10)
+    
+    # Session b is not starved behind all of session a's requests
+    assert order.index('b') < 3
+
+
+def test_headers_tighten_budget():
+    limiter = RateLimiter()
+    limiter.configure('model', rpm=30, tpm=6000)
+    limiter.observe_headers('model', {
+        'x-ratelimit-remaining-tokens': '500',
+        'x-ratelimit-remaining-requests': '0',
+        'x-ratelimit-reset-requests': '2s'
+    })
+    stats = limiter.get_statistics()['model']
+    assert stats['tokens_available'] <= 501
+    assert stats['blocked_for_seconds'] > 1
+
+
+def test_daily_request_headers_leave_rpm_budget():
+    limiter = RateLimiter()
+    limiter.configure('model', rpm=30, tpm=6000)
+    # x-ratelimit-*-requests count requests per day, not per minute
+    limiter.observe_headers('model', {
+        'x-ratelimit-limit-requests': '14400',
+        'x-ratelimit-remaining-requests': '12'
+    })
+    stats = limiter.get_statistics()['model']
+    assert stats['requests_available'] == 30
+    assert stats['requests_remaining_today'] == 12
+    assert stats['blocked_for_seconds'] == 0
+
+
+def test_retry_after_blocks_model():
+    limiter = RateLimiter()
+    limiter.observe_headers('model', {'retry-after': '3'}, throttled=True)
+    stats = limiter.get_statistics()['model']
+    assert stats['throttled'] == 1
+    assert stats['blocked_for_seconds'] > 2
@@ -0,0 +1,90 @@
+"""
+Tests for modules.retry_policy
+"""
+
+import json
+
+import pytest
+
+from modules.retry_policy import RetryPolicy, RetryBudgetExceeded, classify_error
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def failing(error, calls):
+    def func(timeout):
+        calls.append(timeout)
+        raise error
+    return func
+
+
+def test_classify_error():
+    assert classify_error(HTTPError(429)) == 'rate_limited'
+    assert classify_error(HTTPError(503)) == 'transient'
+    assert classify_error(HTTPError(401)) == 'fatal'
+    assert classify_error(TimeoutError()) == 'timeout'
+    assert classify_error(ConnectionError()) == 'transient'
+    assert classify_error(json.JSONDecodeError("bad", "x", 0)) == 'malformed'
+
+
+def test_retries_are_shared_across_calls():
+    budget = RetryPolicy(max_retries=3, backoff_base_seconds=0).start()
+    calls = []
+    with pytest.raises(RetryBudgetExceeded):
+        budget.run(failing(ConnectionError("down"), calls))
+    # The first call used the whole budget; the next call gets no retries
+    with pytest.raises(RetryBudgetExceeded):
+        budget.run(failing(ConnectionError("down"), calls))
+    assert len(calls) == 5
+    assert budget.summary()['retries'] == 3
+
+
+def test_no_backoff_after_last_attempt(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr('modules.retry_policy.time.sleep', sleeps.append)
+    budget = RetryPolicy(max_retries=2, backoff_base_seconds=1, backoff_max_seconds=10).start()
+    
+    with pytest.raises(RetryBudgetExceeded):
+        budget.run(failing(ConnectionError("down"), []))
+    assert sleeps == [1, 2]
+
+
+def test_fatal_errors_are_not_retried():
+    budget = RetryPolicy(max_retries=4, backoff_base_seconds=0).start()
+    calls = []
+    with pytest.raises(HTTPError):
+        budget.run(failing(HTTPError(401), calls))
+    assert len(calls) == 1
+
+
+def test_malformed_can_opt_out_of_retries():
+    budget = RetryPolicy(max_retries=4, backoff_base_seconds=0).start()
+    calls = []
+    with pytest.raises(ValueError):
+        budget.run(failing(ValueError("no score"), calls), retry_malformed=False)
+    assert len(calls) == 1
+    
+    calls = []
+    with pytest.raises(RetryBudgetExceeded):
+        budget.run(failing(ValueError("no score"), calls))
+    assert len(calls) == 5
+
+
+def test_arun_retries_until_success():
+    import asyncio
+    
+    budget = RetryPolicy(max_retries=2, backoff_base_seconds=0).start()
+    attempts = []
+    
+    async def flaky(timeout):
+        attempts.append(timeout)
+        if len(attempts) < 2:
+            raise ConnectionError("blip")
+        return "ok"
+    
+    assert asyncio.run(budget.arun(flaky)) == "ok"
+    assert budget.summary()['calls'] == 2
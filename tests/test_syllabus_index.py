@@ -0,0 +1,64 @@
+"""
+Tests for modules.syllabus_index
+"""
+
+from modules.syllabus_index import SyllabusIndex, CHARS_PER_TOKEN
+
+
+SYLLABUS = "\n".join([
+    "Unit 1: Linear Structures",
+    "Stacks: push, pop, applications in expression evaluation and recursion.",
+    "Queues: circular queues, deques and priority queues.",
+    "Unit 2: Trees",
+    "Binary search trees: insertion, deletion and traversal.",
+    "AVL trees and rotations; B-trees for disk storage.",
+    "Unit 3: Graphs",
+    "Graph traversal with breadth first and depth first search.",
+    "Shortest paths: Dijkstra and Bellman-Ford algorithms.",
+])
+
+
+def test_chunks_do_not_cross_units():
+    index = SyllabusIndex(SYLLABUS, chunk_chars=100)
+    assert {chunk['unit'] for chunk in index.chunks} == {
+        "Unit 1: Linear Structures", "Unit 2: Trees", "Unit 3: Graphs"
+    }
+    for chunk in index.chunks:
+        assert "Unit" not in chunk['text'] or chunk['text'].startswith(chunk['unit'])
+
+
+def test_search_finds_topic():
+    index = SyllabusIndex(SYLLABUS, chunk_chars=100)
+    score, chunk = index.search("Dijkstra shortest paths")[0]
+    assert score > 0
+    assert chunk['unit'] == "Unit 3: Graphs"
+
+
+def test_select_context_covers_every_topic():
+    index = SyllabusIndex(SYLLABUS * 3, chunk_chars=100)
+    context = index.select_context(["Stacks", "AVL trees", "Graph traversal"], token_budget=80)
+    
+    assert "Stacks" in context
+    assert "AVL" in context
+    assert "Graph traversal" in context
+    assert len(context) < len(SYLLABUS * 3)
+
+
+def test_oversized_chunk_is_truncated_to_budget():
+    # One long line without sentence breaks becomes a single chunk
+    text = "Unit 1: Sorting\n" + " ".join(f"algorithm{i}" for i in range(400))
+    index = SyllabusIndex(text, chunk_chars=100)
+    
+    context = index.select_context(["algorithm5"], token_budget=50)
+    body = context.split("\n", 1)[1]
+    assert len(body) <= 50 * CHARS_PER_TOKEN
+    assert body.startswith("algorithm0 algorithm1")
+    # Cut at a word break
+    assert set(body.split()) <= {f"algorithm{i}" for i in range(400)}
+
+
+def test_small_syllabus_returned_whole():
+    index = SyllabusIndex(SYLLABUS, chunk_chars=100)
+    context = index.select_context(["Stacks"], token_budget=1000)
+    for line in SYLLABUS.splitlines():
+        assert line in context
@@ -0,0 +1,33 @@
+"""
+Tests for modules.tesseract_backend
+"""
+
+import pytest
+
+from modules import tesseract_backend
+
+
+def test_auto_prefers_tesserocr(monkeypatch):
+    monkeypatch.setattr(tesseract_backend, 'tesserocr', object())
+    assert tesseract_backend.resolve_backend() == 'tesserocr'
+    assert tesseract_backend.resolve_backend('auto') == 'tesserocr'
+    assert tesseract_backend.resolve_backend('pytesseract') == 'pytesseract'
+
+
+def test_auto_falls_back_without_tesserocr(monkeypatch, capsys):
+    monkeypatch.setattr(tesseract_backend, 'tesserocr', None)
+    monkeypatch.setattr(tesseract_backend, '_fallback_reported', False)
+    assert tesseract_backend.resolve_backend('auto') == 'pytesseract'
+    assert tesseract_backend.resolve_backend() == 'pytesseract'
+    # The fallback is reported, but only once per process
+    assert capsys.readouterr().out.count("tesserocr not installed") == 1
+    assert tesseract_backend.resolve_backend('tesserocr') == 'pytesseract'
+    with pytest.raises(ValueError):
+        tesseract_backend.resolve_backend('easyocr')
+
+
+def test_parse_tesseract_config():
+    options = tesseract_backend.parse_tesseract_config('--psm 6 --oem 1 -c preserve_interword_spaces=1')
+    assert options['psm'] == 6
+    assert options['oem'] == 1
+    assert options['variables'] == {'preserve_interword_spaces': '1'}
@@ -0,0 +1,113 @@
+"""
+Tests for modules.text_cleaner
+"""
+
+import random
+import re
+
+from modules.text_cleaner import TextCleaner, DEFAULT_WATERMARK_PATTERNS
+
+
+# The multi-pass cleanup TextCleaner replaced, kept as a reference
+LEGACY_PATTERNS = [f"(?i){pattern}" for pattern in DEFAULT_WATERMARK_PATTERNS]
+
+
+def legacy_remove_watermarks(text):
+    for pattern in LEGACY_PATTERNS:
+        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+    text = re.sub(r'\n\s*\n', '\n\n', text)
+    text = re.sub(r' +', ' ', text)
+    return text.strip()
+
+
+def legacy_preprocess_text(text):
+    text = legacy_remove_watermarks(text)
+    text = text.encode('ascii', 'ignore').decode('ascii')
+    text = re.sub(r'(?m)^\s*\d+\s*$', '', text)
+    text = re.sub(r'(?i)page\s+\d+\s+of\s+\d+', '', text)
+    text = re.sub(r'\n\s*\n\s*\n', '\n\n', text)
+    return text.strip()
+
+
+SAMPLE = """DRAFT - Internal Use Only
+  
+  Unit 1:   Linear  Data Structures
+Stacks and queues; applications.
+
+
+Copyright © 2023 University Press
+   12
+Unit 2: Trees
+Binary  search trees — insertion, deletion.
+Page 3 of 9
+\t
+Do not copy. Watermark
+"""
+
+# Pieces for generated inputs. Pieces whose output deliberately changed
+# (see the tests below) are left out.
+PIECES = [
+    "Unit 1:", "Stacks", "queues", "DRAFT", "Confidential", "Watermark", "do not copy",
+    "Internal use only", "Copyright © 2023", "Q1.", "(5 marks)", "12", "x",
+    " ", "  ", "\t", "\n", "\n", " \n", "\n\n\n",
+]
+
+
+def generated_inputs(count=2000, seed=7):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "".join(rng.choice(PIECES) + rng.choice(["", " ", "  "]) for _ in range(rng.randint(1, 15)))
+
+
+def test_remove_watermarks_matches_legacy():
+    cleaner = TextCleaner()
+    for text in [SAMPLE, *generated_inputs()]:
+        assert cleaner.clean(text, remove_page_furniture=False, ascii_only=False) == \
+            legacy_remove_watermarks(text), repr(text)
+
+
+def test_preprocess_matches_legacy():
+    cleaner = TextCleaner()
+    for text in generated_inputs(seed=11):
+        assert cleaner.clean(text) == legacy_preprocess_text(text), repr(text)
+
+
+def test_sample_document():
+    assert TextCleaner().clean(SAMPLE) == (
+        "- \n"
+        "\n"
+        " Unit 1: Linear Data Structures\n"
+        "Stacks and queues; applications.\n"
+        "\n"
+        " University Press\n"
+        "\n"
+        "Unit 2: Trees\n"
+        "Binary search trees insertion, deletion.\n"
+        "\n"
+        "."
+    )
+
+
+def test_overlapping_patterns_remove_whole_phrase():
+    # The legacy passes removed "Confidential" first and left "Private and"
+    assert legacy_remove_watermarks("Private and Confidential") == "Private and"
+    assert TextCleaner().clean("Private and Confidential") == ""
+
+
+def test_spaces_collapsed_after_removals():
+    # Removed characters and markers no longer leave double spaces behind
+    cleaner = TextCleaner()
+    assert cleaner.clean("Stacks © queues") == "Stacks queues"
+    assert cleaner.clean("Unit 1 Page 3 of 9 Stacks") == "Unit 1 Stacks"
+    assert legacy_preprocess_text("Stacks © queues") == "Stacks  queues"
+
+
+def test_page_number_left_by_footer_is_dropped():
+    assert TextCleaner().clean("Stacks\n12 Page 3 of 9") == "Stacks"
+    assert legacy_preprocess_text("Stacks\n12 Page 3 of 9") == "Stacks\n12"
+
+
+def test_configured_patterns_with_inline_flags():
+    cleaner = TextCleaner([r'(?i)sample\s+paper', 'draft'])
+    assert cleaner.watermark_patterns.count('draft') == 1
+    assert cleaner.clean("SAMPLE  PAPER\nUnit 1") == "Unit 1"
@@ -3,6 +3,7 @@ ChromaDB Handler Module
 Handles vector database operations for storing and retrieving syllabus and question data
 """
 
+import hashlib
 import os
 from typing import List, Dict, Any, Optional
 from pathlib import Path
@@ -75,14 +76,14 @@ class ChromaDBHandler:
         # Generate embedding
         embedding = self.embedding_model.encode([syllabus_text])[0].tolist()
         
-        # Create unique ID
-        doc_id = f"syllabus_{metadata.get('filename', 'unknown')}_{hash(syllabus_text) % 10000}"
-        
         # Prepare metadata
         meta = metadata or {}
         meta['type'] = 'syllabus'
         meta['content_length'] = len(syllabus_text)
         
+        # Create unique ID
+        doc_id = self._document_id('syllabus', syllabus_text, meta)
+        
         # Store in ChromaDB
         self.collection.add(
             embeddings=[embedding],
@@ -93,6 +94,54 @@ class ChromaDBHandler:
         
         return doc_id
     
+    def store_past_paper(
+        self,
+        paper_text: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Store a past question paper in vector database
+        
+        Args:
+            paper_text: Past paper text content
+            metadata: Additional metadata
+        
+        Returns:
+            Document ID
+        """
+        # Generate embedding
+        embedding = self.embedding_model.encode([paper_text])[0].tolist()
+        
+        # Prepare metadata
+        meta = metadata or {}
+        meta['type'] = 'past_paper'
+        meta['content_length'] = len(paper_text)
+        
+        # Create unique ID
+        doc_id = self._document_id('past_paper', paper_text, meta)
+        
+        # Store in ChromaDB
+        self.collection.add(
+            embeddings=[embedding],
+            documents=[paper_text],
+            metadatas=[meta],
+            ids=[doc_id]
+        )
+        
+        return doc_id
+    
+    @staticmethod
+    def _document_id(kind: str, text: str, meta: Dict[str, Any]) -> str:
+        """
+        Stable document ID from the file's SHA-256
+        
+        Uses the 'file_hash' the batch ingestor records, or hashes the text
+        when there is none, so IDs are the same in every process and only
+        identical content collides.
+        """
+        digest = meta.get('file_hash') or hashlib.sha256(text.encode('utf-8')).hexdigest()
+        return f"{kind}_{digest}"
+    
     def store_question(
         self,
         question: Dict[str, Any],
@@ -354,18 +403,22 @@ class ChromaDBHandler:
         
         # Count by type
         syllabi_count = 0
+        past_papers_count = 0
         questions_count = 0
         
         for meta in all_docs.get('metadatas', []):
             doc_type = meta.get('type', '')
             if doc_type == 'syllabus':
                 syllabi_count += 1
+            elif doc_type == 'past_paper':
+                past_papers_count += 1
             elif doc_type == 'question':
                 questions_count += 1
         
         return {
             'total_documents': total_count,
             'syllabi_count': syllabi_count,
+            'past_papers_count': past_papers_count,
             'questions_count': questions_count,
             'collection_name': self.collection_name
         }
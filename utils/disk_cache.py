@@ -0,0 +1,192 @@
+"""
+Disk Cache Module
+Content-addressed, size-bounded LRU cache persisted as files on disk
+"""
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+class DiskCache:
+    """
+    Persistent key/value cache for text results
+    
+    Entries are stored one file per key. A file's modification time is
+    when it was written and its access time is when it was last read, so
+    entries older than the TTL expire and eviction can drop the least
+    recently used entries once the cache grows beyond its size budget.
+    """
+    
+    def __init__(self, cache_dir: str, max_size_mb: float = 256, ttl_seconds: Optional[float] = None):
+        """
+        Initialize Disk Cache
+        
+        Args:
+            cache_dir: Directory holding the cache entries
+            max_size_mb: Maximum total size of cached entries in MB
+            ttl_seconds: Entries older than this are treated as misses (None = never expire)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.ttl_seconds = ttl_seconds
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        
+        self._lock = threading.Lock()
+        self._size_bytes = sum(path.stat().st_size for path in self._entry_paths())
+    
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Build a cache key by hashing the given parts"""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(str(part).encode('utf-8'))
+            digest.update(b'\x1f')
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached value
+        
+        Args:
+            key: Cache key from make_key()
+        
+        Returns:
+            Cached text, or None on a miss
+        """
+        path = self._path_for(key)
+        try:
+            written_at = path.stat().st_mtime
+            if self._is_expired(written_at):
+                self._remove_expired(path)
+                with self._lock:
+                    self.misses += 1
+                return None
+            
+            value = path.read_text(encoding='utf-8')
+            # Record the read in the access time so LRU eviction keeps this entry;
+            # the modification time keeps the write time for TTL checks
+            os.utime(path, (time.time(), written_at))
+        except (FileNotFoundError, OSError):
+            with self._lock:
+                self.misses += 1
+            return None
+        
+        with self._lock:
+            self.hits += 1
+        return value
+    
+    def set(self, key: str, value: str):
+        """
+        Store a value, evicting least recently used entries if over budget
+        
+        Args:
+            key: Cache key from make_key()
+            value: Text to cache
+        """
+        path = self._path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        previous_size = path.stat().st_size if path.exists() else 0
+        
+        # Write to a temp file first so readers never see a partial entry
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(value, encoding='utf-8')
+        os.replace(tmp_path, path)
+        
+        with self._lock:
+            self._size_bytes += path.stat().st_size - previous_size
+            over_budget = self._size_bytes > self.max_bytes
+        
+        if over_budget:
+            self._evict()
+    
+    def _is_expired(self, written_at: float) -> bool:
+        """Check an entry's write time against the TTL"""
+        return self.ttl_seconds is not None and time.time() - written_at > self.ttl_seconds
+    
+    def _remove_expired(self, path: Path):
+        """Delete an expired entry"""
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            return
+        with self._lock:
+            self._size_bytes -= size
+            self.expirations += 1
+    
+    def _evict(self):
+        """Remove expired entries, then least recently used ones until under the size budget"""
+        with self._lock:
+            entries = []
+            for path in self._entry_paths():
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                if self._is_expired(stat.st_mtime):
+                    try:
+                        path.unlink()
+                        self.expirations += 1
+                    except FileNotFoundError:
+                        pass
+                    continue
+                entries.append((max(stat.st_atime, stat.st_mtime), stat.st_size, path))
+            
+            # Re-sync with disk, other processes may share the directory
+            self._size_bytes = sum(size for _, size, _ in entries)
+            
+            for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+                if self._size_bytes <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                self._size_bytes -= size
+                self.evictions += 1
+    
+    def _path_for(self, key: str) -> Path:
+        """Map a key to its file, sharded by prefix to keep directories small"""
+        return self.cache_dir / key[:2] / f"{key}.txt"
+    
+    def _entry_paths(self):
+        """Iterate over all cache entry files"""
+        return self.cache_dir.glob("*/*.txt")
+    
+    def clear(self):
+        """Remove all cached entries"""
+        with self._lock:
+            for path in self._entry_paths():
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            self._size_bytes = 0
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+        
+        Returns:
+            Dictionary with hit/miss counters and size information
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'size_mb': self._size_bytes / (1024 * 1024),
+            'max_size_mb': self.max_bytes / (1024 * 1024)
+        }
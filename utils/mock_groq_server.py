@@ -0,0 +1,429 @@
+"""
+Mock Groq Server Module
+Local OpenAI/Groq-compatible chat completions endpoint with configurable
+latency, failures and rate limits, for offline testing and load benchmarks
+
+Usage:
+    python -m utils.mock_groq_server --port 8765 --latency-ms 800 --rpm 30
+    GROQ_BASE_URL=http://127.0.0.1:8765 streamlit run app.py
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+# Allow running as a script from the project root
+sys.path.append(str(Path(__file__).parent.parent))
+
+from modules.rate_limiter import TokenBucket
+
+
+CHAT_PATHS = ('/openai/v1/chat/completions', '/v1/chat/completions', '/chat/completions')
+MODELS_PATHS = ('/openai/v1/models', '/v1/models', '/models')
+
+CHARS_PER_TOKEN = 4
+
+GENERATE_PROMPT = re.compile(r'Generate (\d+) examination questions at the "(\w+)" level')
+MARKS_PROMPT = re.compile(r'worth (\d+) marks')
+TOPICS_PROMPT = re.compile(r'Topics to cover: (.*)')
+BATCH_IDS_PROMPT = re.compile(r'^ID (\d+)$', re.MULTILINE)
+
+CANNED_TOPICS = [
+    "Data Structures", "Algorithms", "Operating Systems", "Database Systems",
+    "Computer Networks", "Software Engineering", "Compiler Design", "Machine Learning",
+]
+QUESTION_STEMS = {
+    'remember': "Define {topic} and list its key characteristics.",
+    'understand': "Explain the working of {topic} with a suitable example.",
+    'apply': "Apply the concepts of {topic} to solve a practical problem of your choice.",
+    'analyze': "Analyze the trade-offs involved in {topic} and compare alternative approaches.",
+    'evaluate': "Evaluate the effectiveness of {topic} in a real-world system and justify your view.",
+    'create': "Design a new solution based on {topic} and describe its components.",
+}
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+class MockGroqServer:
+    """
+    Threaded HTTP server imitating Groq's OpenAI-compatible chat API
+    
+    Responses are canned but shaped like the application's prompts: question
+    generation prompts get a JSON array with the requested number of
+    questions, syllabus parsing gets a syllabus object and quality prompts
+    get scores. Latency, 5xx errors, 429 rate limiting (with retry-after and
+    x-ratelimit-* headers) and streaming are configurable. A fixed seed makes
+    runs reproducible.
+    """
+    
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        tokens_per_second: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        rpm: Optional[int] = None,
+        tpm: Optional[int] = None,
+        malformed_rate: float = 0.0,
+        seed: int = 0,
+        responder: Optional[Callable[[str], Optional[str]]] = None
+    ):
+        """
+        Initialize Mock Groq Server
+        
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 = pick a free port)
+            latency_ms: Base latency added to every request
+            jitter_ms: Uniform random extra latency (0..jitter_ms)
+            tokens_per_second: Completion speed (0 = instant); also paces streaming
+            error_rate: Fraction of requests answered with HTTP 500
+            rate_limit_rate: Fraction of requests answered with HTTP 429 regardless of budget
+            rpm: Requests per minute enforced per model (None = unlimited)
+            tpm: Tokens per minute enforced per model (None = unlimited)
+            malformed_rate: Fraction of completions returned as invalid JSON
+            seed: Random seed for latency, failures and canned content
+            responder: Called with the prompt text; a returned string replaces
+                the canned completion (None keeps it)
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.rpm = rpm
+        self.tpm = tpm
+        self.malformed_rate = malformed_rate
+        self.responder = responder
+        
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[Optional[TokenBucket], Optional[TokenBucket]]] = {}
+        self.stats = {'requests': 0, 'completed': 0, 'errors': 0, 'rate_limited': 0, 'streamed': 0}
+        
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        """Base URL to pass as the engine's base_url / GROQ_BASE_URL"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> "MockGroqServer":
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def serve_forever(self):
+        """Serve in the calling thread until interrupted"""
+        self._httpd.serve_forever()
+    
+    def stop(self):
+        """Stop serving and release the port"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+    
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+    
+    def _chance(self, rate: float) -> bool:
+        with self._lock:
+            return rate > 0 and self._random.random() < rate
+    
+    def _delay(self) -> float:
+        with self._lock:
+            jitter = self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0
+        return (self.latency_ms + jitter) / 1000.0
+    
+    def _admit(self, model: str, tokens: int) -> Tuple[bool, Dict[str, str]]:
+        """
+        Charge a request against the model's budgets
+        
+        Returns:
+            (admitted, rate-limit headers)
+        """
+        with self._lock:
+            if model not in self._buckets:
+                self._buckets[model] = (
+                    TokenBucket(self.rpm) if self.rpm else None,
+                    TokenBucket(self.tpm) if self.tpm else None
+                )
+            requests, token_budget = self._buckets[model]
+            now = time.monotonic()
+            headers = {}
+            wait = 0.0
+            
+            for kind, bucket, amount in (('requests', requests, 1), ('tokens', token_budget, tokens)):
+                if bucket is None:
+                    continue
+                bucket.refill(now)
+                wait = max(wait, bucket.wait_time(amount))
+                headers[f'x-ratelimit-limit-{kind}'] = str(int(bucket.capacity))
+            
+            admitted = wait == 0
+            for kind, bucket, amount in (('requests', requests, 1), ('tokens', token_budget, tokens)):
+                if bucket is None:
+                    continue
+                if admitted:
+                    bucket.take(amount)
+                headers[f'x-ratelimit-remaining-{kind}'] = str(max(0, int(bucket.level)))
+                deficit = bucket.capacity - bucket.level
+                headers[f'x-ratelimit-reset-{kind}'] = f"{deficit / bucket.rate:.2f}s"
+            
+            if not admitted:
+                headers['retry-after'] = f"{max(wait, 0.01):.2f}"
+            return admitted, headers
+    
+    def _completion_text(self, messages: List[Dict[str, Any]]) -> str:
+        """Canned completion matching the kind of prompt"""
+        prompt = "\n".join(str(message.get('content', '')) for message in messages)
+        if self.responder is not None:
+            text = self.responder(prompt)
+            if text is not None:
+                return text
+        
+        generate = GENERATE_PROMPT.search(prompt)
+        if generate:
+            count, level = int(generate.group(1)), generate.group(2).lower()
+            marks_match = MARKS_PROMPT.search(prompt)
+            marks = int(marks_match.group(1)) if marks_match else 5
+            topics_match = TOPICS_PROMPT.search(prompt)
+            topics = [t.strip() for t in topics_match.group(1).split(',') if t.strip()] if topics_match else []
+            topics = topics or CANNED_TOPICS
+            stem = QUESTION_STEMS.get(level, "Discuss {topic} in detail.")
+            questions = [
+                {
+                    'question': stem.format(topic=topics[i % len(topics)]) + f" (Variant {i + 1})",
+                    'marks': marks,
+                    'bloom_level': level,
+                    'topic': topics[i % len(topics)],
+                    'difficulty': 'easy' if level in ('remember', 'understand') else 'medium'
+                }
+                for i in range(count)
+            ]
+            return "```json\n" + json.dumps(questions, indent=2) + "\n```"
+        
+        batch_ids = BATCH_IDS_PROMPT.findall(prompt)
+        if batch_ids:
+            with self._lock:
+                scores = [{'id': int(i), 'score': round(self._random.uniform(6, 9.5), 1)} for i in batch_ids]
+            return json.dumps(scores)
+        
+        if 'syllabus' in prompt.lower() and 'course_name' in prompt:
+            units = [
+                {
+                    'unit_number': str(n),
+                    'unit_name': topic,
+                    'topics': [f"{topic} fundamentals", f"{topic} applications"],
+                    'weightage': 25
+                }
+                for n, topic in enumerate(CANNED_TOPICS[:4], start=1)
+            ]
+            return json.dumps({'course_name': "Mock Course", 'units': units})
+        
+        if 'scale of 0-10' in prompt:
+            with self._lock:
+                return f"{self._random.uniform(6, 9.5):.1f}"
+        
+        return "This is a mock completion."
+    
+    def _handler_class(self):
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def log_message(self, format, *args):
+                # Keep benchmark output clean
+                pass
+            
+            def _send_json(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            def _send_error(self, status: int, message: str, error_type: str, headers=None):
+                self._send_json(status, {'error': {'message': message, 'type': error_type}}, headers)
+            
+            def do_GET(self):
+                if self.path.rstrip('/') in MODELS_PATHS:
+                    models = ['llama-3.1-8b-instant', 'llama-3.3-70b-versatile']
+                    self._send_json(200, {'object': 'list', 'data': [
+                        {'id': model, 'object': 'model', 'owned_by': 'mock'} for model in models
+                    ]})
+                else:
+                    self._send_error(404, f"Unknown path {self.path}", 'not_found')
+            
+            def do_POST(self):
+                if self.path.rstrip('/') not in CHAT_PATHS:
+                    self._send_error(404, f"Unknown path {self.path}", 'not_found')
+                    return
+                
+                length = int(self.headers.get('Content-Length', 0))
+                try:
+                    request = json.loads(self.rfile.read(length) or b'{}')
+                except json.JSONDecodeError:
+                    self._send_error(400, "Invalid JSON body", 'invalid_request_error')
+                    return
+                
+                server._count('requests')
+                model = request.get('model', 'unknown')
+                messages = request.get('messages', [])
+                prompt_tokens = sum(_estimate_tokens(str(m.get('content', ''))) for m in messages)
+                max_tokens = int(request.get('max_tokens') or 1024)
+                
+                time.sleep(server._delay())
+                
+                admitted, limit_headers = server._admit(model, prompt_tokens + max_tokens)
+                if not admitted or server._chance(server.rate_limit_rate):
+                    limit_headers.setdefault('retry-after', '1')
+                    server._count('rate_limited')
+                    self._send_error(429, f"Rate limit reached for model {model}",
+                                     'rate_limit_exceeded', limit_headers)
+                    return
+                if server._chance(server.error_rate):
+                    server._count('errors')
+                    self._send_error(500, "Mock internal server error", 'internal_server_error')
+                    return
+                
+                text = server._completion_text(messages)
+                if server._chance(server.malformed_rate):
+                    text = text[:len(text) // 2]
+                completion_tokens = _estimate_tokens(text)
+                usage = {
+                    'prompt_tokens': prompt_tokens,
+                    'completion_tokens': completion_tokens,
+                    'total_tokens': prompt_tokens + completion_tokens
+                }
+                completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+                
+                if request.get('stream'):
+                    self._stream(completion_id, model, text, usage, limit_headers)
+                else:
+                    if server.tokens_per_second:
+                        time.sleep(completion_tokens / server.tokens_per_second)
+                    self._send_json(200, {
+                        'id': completion_id,
+                        'object': 'chat.completion',
+                        'created': int(time.time()),
+                        'model': model,
+                        'choices': [{
+                            'index': 0,
+                            'message': {'role': 'assistant', 'content': text},
+                            'finish_reason': 'stop'
+                        }],
+                        'usage': usage
+                    }, limit_headers)
+                server._count('completed')
+            
+            def _stream(self, completion_id: str, model: str, text: str, usage: Dict[str, int], headers):
+                """Send the completion as server-sent events, a few characters per chunk"""
+                server._count('streamed')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Connection', 'close')
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.close_connection = True
+                
+                def event(delta: Dict[str, Any], finish_reason=None, extra=None):
+                    chunk = {
+                        'id': completion_id,
+                        'object': 'chat.completion.chunk',
+                        'created': int(time.time()),
+                        'model': model,
+                        'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}]
+                    }
+                    chunk.update(extra or {})
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+                    self.wfile.flush()
+                
+                chunk_chars = CHARS_PER_TOKEN * 4
+                pause = (4 / server.tokens_per_second) if server.tokens_per_second else 0.0
+                event({'role': 'assistant', 'content': ''})
+                for start in range(0, len(text), chunk_chars):
+                    if pause:
+                        time.sleep(pause)
+                    event({'content': text[start:start + chunk_chars]})
+                event({}, finish_reason='stop', extra={'x_groq': {'usage': usage}})
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+        
+        return Handler
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Run a local Groq-compatible mock server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--tokens-per-second', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of HTTP 500 responses")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="Fraction of forced HTTP 429 responses")
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help="Fraction of truncated completions")
+    parser.add_argument('--rpm', type=int, default=None, help="Requests per minute per model")
+    parser.add_argument('--tpm', type=int, default=None, help="Tokens per minute per model")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    
+    server = MockGroqServer(
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        rpm=args.rpm,
+        tpm=args.tpm,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed
+    )
+    print(f"Mock Groq server listening on {server.url} (set GROQ_BASE_URL={server.url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+        print(f"Stats: {server.stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())